@@ -0,0 +1,244 @@
+# Reproduzierbare Benchmarks für Laden, Filtern, Auslosen, Import und Speichern.
+#   python benchmarks/run.py --sizes 100 1000 10000 100000 --output bench_output.json
+#   python benchmarks/run.py --compare alt.json
+# Läuft komplett headless: statt VirtualList wird ein No-Op-Stand-in befüllt.
+
+#region IMPORTS
+import argparse
+from collections.abc import Callable
+from datetime import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import make_history, make_import_rows, make_roster
+from werwolf import APP_VERSION
+from werwolf.columns import PlayerColumns, draw_rows
+from werwolf.draw import WeightedSampler, perform_draw
+from werwolf.history import DrawHistory, HistoryEntry
+from werwolf.importer import MemorySink, StreamingImporter
+from werwolf.listing import ListRow, build_list_rows
+from werwolf.registry import PlayerRegistry
+from werwolf.search import SearchIndex
+from werwolf.snapshot import db_stamp, read_snapshot, write_snapshot
+from werwolf.storage import SqliteStorage, load_state, read_json_data, write_json_data
+#endregion IMPORTS
+
+#region GLOBALS
+DEFAULT_SIZES: tuple[int, ...] = (100, 1_000, 10_000, 100_000)
+NOW: datetime = datetime(2026, 1, 1, 20, 0)
+TABLE_SIZE: int = 12
+HISTORY_ROUNDS: int = 30
+HISTORY_ROUNDS_LONG: int = 10_000
+HISTORY_PAGE: int = 25
+#endregion GLOBALS
+
+#region HARNESS
+class NoOpList:
+    # Stand-in für VirtualList: gleiche Schnittstelle, aber ohne Widgets
+    def __init__(self):
+        self.rows: list[ListRow] = []
+
+    def set_rows(self, rows: list[ListRow]) -> None:
+        self.rows = rows
+
+def measure(fn: Callable[..., object], setup: Callable[[], tuple], repeats: int) -> dict:
+    # setup() liefert die Argumente und wird nicht mitgemessen; Spitzen-Speicher in einem eigenen Lauf
+    timings = []
+    for _ in range(repeats):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "repeats": repeats,
+        "seconds_median": statistics.median(timings),
+        "seconds_min": min(timings),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def has_numpy() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+#endregion HARNESS
+
+#region BENCHMARKS
+def bench_size(n: int, seed: int, repeats: int, workdir: str) -> list[dict]:
+    users = make_roster(n, seed, NOW)
+    history = make_history(users, HISTORY_ROUNDS, TABLE_SIZE, seed, NOW)
+    registry = PlayerRegistry(users)
+    active = [u for u in registry if not u.is_blacklisted]
+    present = {u.id for u in active[:max(TABLE_SIZE, n // 10)]}
+    paused = set(list(present)[:len(present) // 20])
+
+    json_path = os.path.join(workdir, f"data-{n}.json")
+    db_path = os.path.join(workdir, f"data-{n}.db")
+    write_json_data(json_path, users, history)
+    storage = SqliteStorage(db_path)
+    storage.save_users(users)
+    storage.close()
+    missing_json = os.path.join(workdir, "nicht-vorhanden.json")
+    snapshot_path = os.path.join(workdir, f"roster-{n}.bin")
+    write_snapshot(snapshot_path, users, db_stamp(db_path))
+
+    def load_sqlite():
+        storage, loaded, _ = load_state(db_path, missing_json)
+        PlayerRegistry(loaded)
+        storage.close()
+
+    def load_json():
+        PlayerRegistry(read_json_data(json_path)[0])
+
+    def load_snapshot():
+        PlayerRegistry(read_snapshot(snapshot_path, db_path))
+
+    def load_columns():
+        st = SqliteStorage(db_path)
+        PlayerColumns.from_storage(st)
+        st.close()
+
+    search = SearchIndex(registry)
+
+    def refresh(search_term: str):
+        def run():
+            rows = build_list_rows(registry, present, paused, search.query(search_term))
+            NoOpList().set_rows(rows.present)
+            NoOpList().set_rows(rows.others)
+        return run
+
+    def search_keystrokes():
+        # "m", "mu", "mue", ... wie beim Tippen, jede Abfrage grenzt die vorige ein
+        for i in range(1, len("mueller") + 1):
+            search.query("mueller"[:i])
+        search.query("")
+
+    def draw(method: str):
+        def run(reg: PlayerRegistry, pool: list):
+            perform_draw(reg, pool, TABLE_SIZE, WeightedSampler(seed=seed, method=method), DrawHistory(), None, NOW)
+        return run
+
+    # Eine ganze Saison Historie: erste Seite und Einzelspieler-Abfrage sollen davon unabhängig sein
+    season = DrawHistory(HistoryEntry.from_dict(e) for e in make_history(users, HISTORY_ROUNDS_LONG, TABLE_SIZE, seed, NOW))
+
+    def history_page_and_player():
+        season.newest(0, HISTORY_PAGE)
+        season.for_player(users[0].id)
+
+    def draw_columns(store: PlayerColumns, rows: list[int]):
+        draw_rows(store, rows, TABLE_SIZE, WeightedSampler(seed=seed), NOW)
+
+    def fresh_columns_args():
+        st = SqliteStorage(db_path)
+        store = PlayerColumns.from_storage(st)
+        st.close()
+        return store, store.active_rows()
+
+    def fresh_draw_args():
+        reg = PlayerRegistry(users)
+        return reg, [u for u in reg if not u.is_blacklisted]
+
+    import_rows = make_import_rows(users, n, 0.2, seed)
+
+    def import_dedup(sink: MemorySink):
+        StreamingImporter(import_rows, sink.existing_keys()).run(sink)
+
+    def save_sqlite_draw(st: SqliteStorage):
+        winners = users[:TABLE_SIZE]
+        st.record_draw(winners, HistoryEntry(NOW, tuple(u.id for u in winners), tuple(u.first_name for u in winners)))
+        st.close()
+
+    cases: list[tuple[str, Callable, Callable[[], tuple]]] = [
+        ("load_sqlite", load_sqlite, tuple),
+        ("load_json", load_json, tuple),
+        ("load_snapshot", load_snapshot, tuple),
+        ("load_columns", load_columns, tuple),
+        ("refresh_filter_empty", refresh(""), tuple),
+        ("refresh_filter_search", refresh("an"), tuple),
+        ("search_keystrokes", search_keystrokes, tuple),
+        ("draw_fenwick", draw("fenwick"), fresh_draw_args),
+        ("draw_keys", draw("keys"), fresh_draw_args),
+        ("draw_columns", draw_columns, fresh_columns_args),
+        ("history_page_player", history_page_and_player, tuple),
+        ("import_dedup", import_dedup, lambda: (MemorySink(PlayerRegistry(users)),)),
+        ("save_json_full", lambda: write_json_data(json_path, registry, history), tuple),
+        ("save_sqlite_draw", save_sqlite_draw, lambda: (SqliteStorage(db_path),)),
+    ]
+    if has_numpy():
+        cases.insert(8, ("draw_numpy", draw("numpy"), fresh_draw_args))
+
+    results = []
+    for name, fn, setup in cases:
+        result = {"op": name, "n": n, **measure(fn, setup, repeats)}
+        results.append(result)
+        print(f"{name:24} n={n:>9,} | median {result['seconds_median'] * 1000:10.2f} ms | peak {result['peak_kib']:>11,.1f} KiB", flush=True)
+    return results
+#endregion BENCHMARKS
+
+#region MAIN
+def compare(current: list[dict], baseline_path: str) -> None:
+    with open(baseline_path, "r") as f:
+        baseline = {(r["op"], r["n"]): r for r in json.load(f)["results"]}
+    print(f"\nVergleich mit {baseline_path} (Faktor > 1 = langsamer):")
+    for r in current:
+        old = baseline.get((r["op"], r["n"]))
+        if old is None or not old["seconds_median"]: continue
+        factor = r["seconds_median"] / old["seconds_median"]
+        print(f"{r['op']:24} n={r['n']:>9,} | x{factor:6.2f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Werwolf Benchmarks (headless)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Rostergrößen, bis 1000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5, help="Wiederholungen (ab 100000 Spielern nur eine)")
+    parser.add_argument("--output", default="bench_output.json", help="Ergebnisse als JSON")
+    parser.add_argument("--compare", metavar="JSON", help="Vorherige Ergebnisdatei zum Vergleich")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="werwolf-bench-")
+    results: list[dict] = []
+    try:
+        for n in args.sizes:
+            results.extend(bench_size(n, args.seed, args.repeats if n < 100_000 else 1, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "app_version": APP_VERSION,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": has_numpy(),
+            "seed": args.seed,
+            "sizes": args.sizes,
+            "created": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nErgebnisse gespeichert in {args.output}")
+    if args.compare: compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
+#endregion MAIN
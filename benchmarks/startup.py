@@ -0,0 +1,63 @@
+# Misst die Kaltstartzeit des Headless-Kerns gegen den Start der Oberfläche.
+#   python benchmarks/startup.py [--runs 10]
+# Jeder Lauf ist ein frischer Interpreter. Ohne Display wird statt MainApp()
+# nur der Import von werwolf.gui (inkl. customtkinter und rich) gemessen.
+
+#region IMPORTS
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+#endregion IMPORTS
+
+#region GLOBALS
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES: dict[str, str] = {
+    "python (leer)": "pass",
+    "core (import werwolf)": "import werwolf",
+    "cli (werwolf stats)": "from werwolf.cli import main; main(['stats'])",
+    "gui (import werwolf.gui)": "import werwolf.gui; import rich.logging",
+    "gui (MainApp bis erstes update)": "from werwolf.gui import MainApp; app = MainApp(); app.update(); app.destroy()",
+}
+#endregion GLOBALS
+
+#region MAIN
+def has_display() -> bool:
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+def measure(code: str, runs: int, cwd: str) -> list[float]:
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1")
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Kaltstart: Kern vs. Oberfläche")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    # Arbeitskopie, damit die echte data.db nicht angelegt oder verändert wird
+    workdir = tempfile.mkdtemp(prefix="werwolf-startup-")
+    shutil.copy(os.path.join(ROOT, "data.json"), workdir)
+    try:
+        for name, code in CASES.items():
+            if "MainApp" in code and not has_display():
+                print(f"{name:34} übersprungen (kein Display)")
+                continue
+            t = measure(code, args.runs, workdir)
+            print(f"{name:34} median {statistics.median(t):7.1f} ms | min {min(t):7.1f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
+#endregion MAIN
@@ -0,0 +1,70 @@
+# Synthetische Spielerlisten und Historien für Benchmarks, immer über einen Seed reproduzierbar.
+
+#region IMPORTS
+from datetime import datetime, timedelta
+import random
+from uuid import UUID
+
+from werwolf.models import User
+#endregion IMPORTS
+
+#region GLOBALS
+FIRST_NAMES: tuple[str, ...] = (
+    "Alexander", "Anna", "Charlotte", "Christian", "David", "Emma", "Felix", "Hannah", "Jan", "Jonas",
+    "Julia", "Katharina", "Lara", "Lea", "Lukas", "Maria", "Max", "Michael", "Nicole", "Paul",
+    "Peter", "Robert", "Sandra", "Sarah", "Sophie", "Stefan", "Thomas", "Tim", "Özlem", "Jürgen",
+)
+LAST_NAMES: tuple[str, ...] = (
+    "Becker", "Fischer", "Frey", "Grube", "Hartmann", "Hoffmann", "Keller", "Koch", "Krüger", "Lange",
+    "Meyer", "Müller", "Richter", "Schmidt", "Schneider", "Schulz", "Schwarz", "Wagner", "Weber", "Zimmermann",
+)
+#endregion GLOBALS
+
+#region GENERATORS
+def make_roster(n: int, seed: int = 42, now: datetime | None = None) -> list[User]:
+    # Eindeutige Namen: Vor-/Nachname-Kombination plus laufende Nummer ab der ersten Wiederholung
+    rng = random.Random(seed)
+    now = now or datetime(2026, 1, 1, 20, 0)
+    combos = len(FIRST_NAMES) * len(LAST_NAMES)
+    users = []
+    for i in range(n):
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        if i >= combos: last = f"{last}-{i // combos}"
+        played = None if rng.random() < 0.1 else now - timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+        users.append(User(
+            id=UUID(int=rng.getrandbits(128), version=4),
+            first_name=first,
+            last_name=last,
+            last_played=played,
+            total_games=0 if played is None else rng.randrange(1, 200),
+            is_blacklisted=rng.random() < 0.02,
+        ))
+    return users
+
+def make_history(users: list[User], rounds: int, table_size: int = 12, seed: int = 42,
+                 now: datetime | None = None) -> list[dict]:
+    rng = random.Random(seed)
+    now = now or datetime(2026, 1, 1, 20, 0)
+    history = []
+    for r in range(rounds):
+        players = rng.sample(users, min(table_size, len(users)))
+        history.append({
+            "timestamp": (now - timedelta(hours=rounds - r)).isoformat(),
+            "players": [f"{u.first_name} {u.last_name}" for u in players],
+            "player_ids": [str(u.id) for u in players],
+        })
+    return history
+
+def make_import_rows(users: list[User], n: int, duplicate_ratio: float = 0.2, seed: int = 42) -> list[tuple[str, str]]:
+    # n Zeilen, davon ein Anteil Duplikate bereits vorhandener Spieler
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        if users and rng.random() < duplicate_ratio:
+            u = rng.choice(users)
+            rows.append((u.first_name, u.last_name))
+        else:
+            rows.append((FIRST_NAMES[i % len(FIRST_NAMES)], f"Import-{i}"))
+    return rows
+#endregion GENERATORS
@@ -0,0 +1,85 @@
+#region IMPORTS
+from datetime import datetime, timedelta
+import json
+import os
+import tempfile
+import time
+import unittest
+from uuid import uuid4
+
+from werwolf.autosave import Autosaver, SessionState, read_session
+from werwolf.models import User
+#endregion IMPORTS
+
+#region TESTS
+TIMEOUT: float = 5.0
+
+class AutosaveTests(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.path = os.path.join(workdir.name, "autosave.json")
+        self.users = [User(uuid4(), f"V{i}", "N", None) for i in range(4)]
+        self.now = datetime(2026, 3, 1, 22, 0)
+
+    def state(self, minutes: int, games: dict | None = None) -> SessionState:
+        return SessionState(self.now - timedelta(minutes=minutes), tuple(self.users), (),
+                            frozenset({self.users[0].id}), frozenset(), tuple((games or {}).items()))
+
+    def saver(self) -> Autosaver:
+        saver = Autosaver(self.path, interval=0)
+        saver.start()
+        self.addCleanup(saver.stop)
+        return saver
+
+    def wait_for(self, saver: Autosaver, writes: int) -> None:
+        deadline = time.monotonic() + TIMEOUT
+        while saver.writes < writes:
+            if time.monotonic() > deadline: raise AssertionError("Autosave wurde nicht geschrieben")
+            time.sleep(0.01)
+
+    def saved(self, path: str) -> str:
+        with open(path, "rb") as f: return json.load(f)["saved"]
+
+    def test_rotation_keeps_three_generations(self):
+        saver = self.saver()
+        for i in range(5):
+            saver.submit(self.state(10 - i))
+            self.wait_for(saver, i + 1)
+        expected = [self.state(10 - i).taken.isoformat() for i in range(4, 0, -1)]
+        self.assertEqual([self.saved(p) for p in (self.path, self.path + ".1", self.path + ".2", self.path + ".3")], expected)
+        self.assertFalse(os.path.exists(self.path + ".4"))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_writer_survives_unexpected_errors(self):
+        saver = self.saver()
+        with self.assertLogs("WERWOLF_APP.storage", "ERROR"):
+            saver.submit(self.state(5, {self.users[0].id: object()}))
+            deadline = time.monotonic() + TIMEOUT
+            while saver._last_write == float("-inf") and time.monotonic() < deadline: time.sleep(0.01)
+        self.assertEqual(saver.writes, 0)
+        saver.submit(self.state(1))
+        self.wait_for(saver, 1)
+        self.assertEqual(read_session(self.path, now=self.now), ({self.users[0].id}, set(), {}))
+
+    def test_read_session_falls_back_to_older_generation(self):
+        saver = self.saver()
+        saver.submit(self.state(3, {self.users[1].id: 2}))
+        self.wait_for(saver, 1)
+        saver.submit(self.state(1))
+        self.wait_for(saver, 2)
+        with open(self.path, "wb") as f: f.write(b'{"users": [')
+        with self.assertLogs("WERWOLF_APP.storage", "WARNING"):
+            session = read_session(self.path, now=self.now)
+        self.assertEqual(session, ({self.users[0].id}, set(), {self.users[1].id: 2}))
+
+    def test_session_too_old_or_missing(self):
+        self.assertIsNone(read_session(self.path, now=self.now))
+        saver = self.saver()
+        saver.submit(self.state(1))
+        self.wait_for(saver, 1)
+        self.assertIsNone(read_session(self.path, now=self.now + timedelta(days=1)))
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
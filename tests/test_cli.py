@@ -0,0 +1,70 @@
+#region IMPORTS
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from uuid import uuid4
+
+from werwolf.cli import build_parser, main
+from werwolf.models import User
+from werwolf.storage import SqliteStorage
+#endregion IMPORTS
+
+#region TESTS
+class ArgumentTests(unittest.TestCase):
+    def parse_error(self, argv: list[str]) -> str:
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit):
+            build_parser().parse_args(argv)
+        return stderr.getvalue()
+
+    def test_log_levels(self):
+        args = build_parser().parse_args(["--log-levels", "draw=INFO,app=warning", "stats"])
+        self.assertEqual(args.log_levels, {"draw": 20, "app": 30})
+
+    def test_unknown_subsystem_message_reaches_user(self):
+        self.assertIn("Unbekanntes Subsystem: darw", self.parse_error(["--log-levels", "darw=INFO", "stats"]))
+        self.assertIn("Unbekanntes Log-Level: draw=LOUD", self.parse_error(["--log-levels", "draw=LOUD", "stats"]))
+
+    def test_batch_size_must_be_positive(self):
+        self.assertIn("muss mindestens 1 sein", self.parse_error(["import", "spieler.csv", "--batch-size", "0"]))
+
+class CommandTests(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.dir = workdir.name
+
+    def test_missing_present_file_is_a_usage_error(self):
+        db, missing = os.path.join(self.dir, "data.db"), os.path.join(self.dir, "fehlt.txt")
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as raised:
+            main(["--db", db, "--json", os.path.join(self.dir, "data.json"), "draw", "3", "--present", missing])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn(f"--present: {missing} kann nicht gelesen werden", stderr.getvalue())
+
+    @unittest.skipIf(importlib.util.find_spec("numpy"), "NumPy installiert")
+    def test_numpy_method_without_numpy(self):
+        db = os.path.join(self.dir, "data.db")
+        storage = SqliteStorage(db)
+        storage.save_users([User(uuid4(), f"V{i}", "N", None) for i in range(5)])
+        storage.close()
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            code = main(["--db", db, "--json", os.path.join(self.dir, "data.json"), "draw", "3", "--method", "numpy"])
+        self.assertEqual(code, 1)
+        self.assertIn("benötigt das Paket numpy", stderr.getvalue())
+
+    def test_cli_does_not_load_asyncio(self):
+        code = "import sys; from werwolf.cli import build_parser; build_parser(); print('asyncio' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(result.stdout.strip(), "False")
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
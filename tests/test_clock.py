@@ -0,0 +1,55 @@
+#region IMPORTS
+from dataclasses import replace
+from datetime import datetime, timedelta
+import unittest
+from uuid import uuid4
+
+from werwolf.clock import DisplayClock
+from werwolf.models import User
+#endregion IMPORTS
+
+#region TESTS
+class DisplayClockTests(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2026, 3, 1, 21, 30)
+        self.clock = DisplayClock(self.now)
+        self.minutes = User(uuid4(), "Anna", "Schmidt", self.now - timedelta(minutes=5, seconds=30))
+        self.hours = User(uuid4(), "Paul", "Weber", self.now - timedelta(hours=3, minutes=10))
+        self.days = User(uuid4(), "Lena", "Koch", self.now - timedelta(days=4, hours=2))
+        self.never = User(uuid4(), "Max", "Neu", None)
+        for user in (self.minutes, self.hours, self.days, self.never): self.clock.label(user)
+
+    def test_tick_returns_only_changed_bucket(self):
+        self.assertEqual(self.clock.label(self.minutes), "vor 5 Min.")
+        changed = self.clock.tick(self.now + timedelta(seconds=31))
+        self.assertEqual(changed, {self.minutes.id})
+        self.assertEqual(self.clock.label(self.minutes), "vor 6 Min.")
+        self.assertEqual(self.clock.label(self.hours), "vor 3 Std.")
+
+    def test_tick_without_bucket_change(self):
+        self.assertEqual(self.clock.tick(self.now + timedelta(seconds=29)), set())
+        self.assertEqual(self.clock.tick(self.now + timedelta(seconds=29)), set())
+        self.assertEqual(self.clock.label(self.minutes), "vor 5 Min.")
+
+    def test_next_change(self):
+        self.assertEqual(self.clock.next_change(), self.minutes.last_played + timedelta(minutes=6))
+
+    def test_stale_heap_entries_are_dropped(self):
+        # Anna spielt wieder: der alte Heap-Eintrag (Wechsel auf "vor 6 Min.") darf nichts mehr melden
+        played = replace(self.minutes, last_played=self.now)
+        self.assertEqual(self.clock.label(played), "gerade eben")
+        stale = len(self.clock._changes)
+        changed = self.clock.tick(self.now + timedelta(seconds=31))
+        self.assertEqual(changed, set())
+        self.assertLess(len(self.clock._changes), stale)
+        self.assertFalse(any(uid == played.id and last == self.minutes.last_played for _, uid, last in self.clock._changes))
+        self.assertEqual(self.clock.tick(self.now + timedelta(seconds=61)), {played.id})
+        self.assertEqual(self.clock.label(played), "vor 1 Min.")
+
+    def test_forgotten_players_are_not_reported(self):
+        self.clock.forget(self.minutes.id)
+        self.assertEqual(self.clock.tick(self.now + timedelta(seconds=31)), set())
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#region IMPORTS
+from datetime import datetime, timedelta
+import importlib.util
+import random
+import unittest
+from uuid import uuid4
+
+from werwolf.columns import PlayerColumns, draw_rows
+from werwolf.draw import WeightedSampler, perform_draw
+from werwolf.history import DrawHistory
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+from werwolf.storage import SqliteStorage
+#endregion IMPORTS
+
+#region TESTS
+class ColumnarDrawTests(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2026, 3, 1, 21, 30)
+        rng = random.Random(4)
+        self.users = [User(uuid4(), f"V{i}", f"N{i}", self.now - timedelta(hours=rng.uniform(0, 24 * 90)) if i % 9 else None,
+                           rng.randrange(50), i % 13 == 0) for i in range(300)]
+        self.storage = SqliteStorage(":memory:")
+        self.storage.save_users(self.users)
+        self.addCleanup(self.storage.close)
+
+    def check(self, method: str) -> None:
+        # Spalten und User-Weg: gleiche Gewichte, gleicher Seed -> gleiche Gezogene und gleiche Spielstände
+        for seed in range(20):
+            registry = PlayerRegistry(self.users)
+            candidates = [u for u in self.users if not u.is_blacklisted]
+            winners = perform_draw(registry, candidates, 12, WeightedSampler(seed=seed, method=method), DrawHistory(),
+                                   now=self.now)
+
+            store = PlayerColumns.from_storage(self.storage)
+            rows = draw_rows(store, store.active_rows(), 12, WeightedSampler(seed=seed, method=method), self.now)
+            views = [store.view(row) for row in rows]
+            self.assertEqual([v.id for v in views], [u.id for u in winners], f"seed {seed}")
+            self.assertEqual([(v.total_games, v.last_played) for v in views], [(u.total_games, u.last_played) for u in winners])
+            self.assertEqual(list(store.games), [registry.get(u.id).total_games for u in self.users])
+
+    def test_view_matches_user(self):
+        store = PlayerColumns.from_storage(self.storage)
+        self.assertFalse(hasattr(store.view(0), "__dict__"))
+        for user, row in zip(self.users, range(len(store))):
+            view = store.view(row)
+            self.assertEqual(view.id, user.id)
+            self.assertEqual(view.days_since_last_play(self.now), user.days_since_last_play(self.now))
+            self.assertEqual(view.get_display_text(self.now), user.get_display_text(self.now))
+
+    def test_fenwick(self):
+        self.check("fenwick")
+
+    def test_keys(self):
+        self.check("keys")
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy nicht installiert")
+    def test_numpy(self):
+        self.check("numpy")
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
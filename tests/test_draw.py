@@ -0,0 +1,62 @@
+#region IMPORTS
+from datetime import datetime, timedelta
+import random
+import unittest
+from uuid import uuid4
+
+from werwolf.clock import DisplayClock
+from werwolf.draw import WeightedSampler, default_weight, perform_draw
+from werwolf.history import DrawHistory
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+#endregion IMPORTS
+
+#region TESTS
+class FenwickSamplerTests(unittest.TestCase):
+    def check(self, weights: list[float], trials: int = 2000) -> None:
+        pool = list(range(len(weights)))
+        positive = {i for i, w in enumerate(weights) if w > 0}
+        for seed in range(trials):
+            picks = WeightedSampler(seed=seed).sample(pool, len(pool), weights=weights)
+            self.assertEqual(len(picks), len(set(picks)), f"Doppelt gezogen (seed {seed})")
+            self.assertEqual(set(picks), positive, f"Gewicht 0 gezogen oder Spieler fehlt (seed {seed})")
+
+    def test_fractional_weights_with_zero(self):
+        rng = random.Random(1)
+        self.check([rng.random() * 0.1 for _ in range(20)] + [0.0])
+
+    def test_mixed_magnitudes(self):
+        rng = random.Random(2)
+        self.check([10 ** rng.uniform(-9, 9) for _ in range(30)] + [0.0, -1.0])
+
+    def test_integer_weights_follow_distribution(self):
+        # Gewicht 3 gegen 1: der schwere Kandidat sollte etwa 3/4 der Erstplätze haben
+        first = [WeightedSampler(seed=s).sample([0, 1], 1, weights=[3.0, 1.0])[0] for s in range(4000)]
+        self.assertAlmostEqual(first.count(0) / len(first), 0.75, delta=0.03)
+
+class ClockWeightTests(unittest.TestCase):
+    def test_clock_days_give_default_weights(self):
+        now = datetime(2026, 3, 1, 21, 30)
+        rng = random.Random(3)
+        users = [User(uuid4(), f"V{i}", "N", now - timedelta(hours=rng.uniform(0, 24 * 60)) if i % 7 else None)
+                 for i in range(200)]
+        clock = DisplayClock(now)
+        sampler = WeightedSampler()
+        self.assertEqual(sampler.weigh(users, now, clock.days), [default_weight(u, now) for u in users])
+        # Nach einem Tick müssen gecachte Tage und frisch berechnete Gewichte weiter übereinstimmen
+        later = now + timedelta(hours=30)
+        clock.tick(later)
+        self.assertEqual(sampler.weigh(users, later, clock.days), [default_weight(u, later) for u in users])
+
+class PerformDrawTests(unittest.TestCase):
+    def test_count_below_one_is_rejected(self):
+        users = [User(uuid4(), f"V{i}", "N", None) for i in range(5)]
+        history = DrawHistory()
+        for count in (0, -3):
+            with self.assertRaises(ValueError):
+                perform_draw(PlayerRegistry(users), users, count, WeightedSampler(seed=1), history)
+        self.assertEqual(len(history), 0)
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
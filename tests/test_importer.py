@@ -0,0 +1,76 @@
+#region IMPORTS
+import io
+import os
+import tempfile
+import unittest
+from uuid import uuid4
+
+from werwolf.importer import MemorySink, StreamingImporter, iter_csv_rows, iter_import_file
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+#endregion IMPORTS
+
+#region TESTS
+def csv_rows(text: str) -> list[tuple[str, str]]:
+    return list(iter_csv_rows(io.StringIO(text, newline="")))
+
+class CsvHeaderTests(unittest.TestCase):
+    def test_semicolon_header_with_ragged_row(self):
+        # Die unregelmäßige letzte Zeile darf die Kopfzeile nicht zum Spieler machen
+        text = "Vorname;Nachname;Email\nJürgen;Müller;a@b\nAnna;Schmidt;c@d\nSolo\n"
+        self.assertEqual(csv_rows(text), [("Jürgen", "Müller"), ("Anna", "Schmidt"), ("Solo", "")])
+
+    def test_header_columns_in_any_order(self):
+        for delimiter in (",", ";", "\t"):
+            text = delimiter.join(("Email", "Last Name", "First Name")) + "\n" + delimiter.join(("x@y", "Weber", "Joel")) + "\n"
+            self.assertEqual(csv_rows(text), [("Joel", "Weber")], repr(delimiter))
+
+    def test_without_header_uses_first_two_columns(self):
+        self.assertEqual(csv_rows("Jürgen;Müller\nAnna;Schmidt\n"), [("Jürgen", "Müller"), ("Anna", "Schmidt")])
+
+    def test_malformed_rows(self):
+        # Leere Zeilen und leere Vornamen fallen weg, eine einzelne Spalte wird als "Vorname Nachname" gelesen
+        text = "Vorname,Nachname\n\n,Ohnevorname\nAnna Maria\n   ,\nPaul,Muller,zuviel\n"
+        self.assertEqual(csv_rows(text), [("Anna", "Maria"), ("Paul", "Muller")])
+
+    def test_only_header(self):
+        self.assertEqual(csv_rows("Vorname;Nachname\n"), [])
+        self.assertEqual(csv_rows(""), [])
+
+class ImportFileTests(unittest.TestCase):
+    def write(self, name: str, text: str) -> str:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, name)
+        with open(path, "w", encoding="utf-8-sig", newline="") as f: f.write(text)
+        return path
+
+    def test_csv_with_bom(self):
+        path = self.write("spieler.csv", "Vorname;Nachname\r\nRené;Groß\r\n")
+        self.assertEqual(list(iter_import_file(path)), [("René", "Groß")])
+
+    def test_text_file(self):
+        path = self.write("spieler.txt", "Björn Schäfer\n\n  Samuel   Koch  \nSolo\n")
+        self.assertEqual(list(iter_import_file(path)), [("Björn", "Schäfer"), ("Samuel", "Koch"), ("Solo", "")])
+
+class DedupTests(unittest.TestCase):
+    def test_case_insensitive_dedup_with_umlauts(self):
+        registry = PlayerRegistry([User(uuid4(), "Jürgen", "Müller", None)])
+        sink = MemorySink(registry)
+        rows = [("JÜRGEN", "MÜLLER"), ("jürgen", "müller "), ("René", "Groß"), ("RENÉ", "GROSS"), ("Anna", "Mueller")]
+        progress = StreamingImporter(rows, sink.existing_keys(), batch_size=2).run(sink)
+        self.assertEqual((progress.read, progress.added, progress.skipped), (5, 2, 3))
+        self.assertEqual(sorted(f"{u.first_name} {u.last_name}" for u in registry),
+                         ["Anna Mueller", "Jürgen Müller", "René Groß"])
+
+    def test_sink_skips_players_added_meanwhile(self):
+        registry = PlayerRegistry()
+        sink = MemorySink(registry)
+        importer = StreamingImporter([("Anna", "Schmidt")], sink.existing_keys())
+        registry.add(User(uuid4(), "anna", "schmidt", None))
+        progress = importer.run(sink)
+        self.assertEqual((progress.added, progress.skipped, len(registry)), (0, 1, 1))
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
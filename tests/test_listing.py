@@ -0,0 +1,103 @@
+#region IMPORTS
+from dataclasses import replace
+from datetime import datetime, timedelta
+import random
+import unittest
+from uuid import uuid4
+
+from werwolf.listing import ListModel
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+#endregion IMPORTS
+
+#region TESTS
+FIRST_NAMES: tuple[str, ...] = ("Anna", "Jan", "Jürgen", "Hanna", "Paul", "Björn", "Stefan", "Lena", "Max", "René")
+LAST_NAMES: tuple[str, ...] = ("Müller", "Schmidt", "Mann", "Koch", "Weber", "Neumann", "Groß", "Becker")
+
+class ListModelUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(7)
+        now = datetime.now()
+        # Ganze Tage plus ein paar Stunden: kein Zeittext wechselt während des Tests
+        self.registry = PlayerRegistry(
+            User(uuid4(), self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES),
+                 now - timedelta(days=self.rng.randrange(1, 60), hours=self.rng.randrange(1, 12)) if i % 6 else None,
+                 self.rng.randrange(20), i % 11 == 0)
+            for i in range(60))
+        self.present: set = set()
+        self.paused: set = set()
+        self.games: dict = {}
+        self.model = ListModel(self.registry)
+        self.reference = ListModel(self.registry)
+
+    def assert_matches_rebuild(self, query: str) -> None:
+        self.reference.rebuild(self.present, self.paused, query, self.games)
+        self.assertEqual(self.model.present, self.reference.present)
+        self.assertEqual(self.model.others, self.reference.others)
+        self.assertEqual([u.id for u in self.model.pechvoegel], [u.id for u in self.reference.pechvoegel])
+
+    def step(self) -> set:
+        # Eine zufällige Änderung wie in MainApp; liefert die IDs, die MainApp markieren würde
+        users = list(self.registry)
+        user = self.rng.choice(users)
+        uid = user.id
+        op = self.rng.choice(("present", "present", "pause", "blacklist", "delete", "rename", "play"))
+        if op == "present":
+            if uid in self.present:
+                self.present.discard(uid)
+                self.paused.discard(uid)
+            elif not user.is_blacklisted:
+                self.present.add(uid)
+        elif op == "pause" and uid in self.present:
+            self.paused.symmetric_difference_update({uid})
+        elif op == "blacklist":
+            self.registry.update(replace(user, is_blacklisted=not user.is_blacklisted))
+            if not user.is_blacklisted:
+                self.present.discard(uid)
+                self.paused.discard(uid)
+        elif op == "delete" and len(users) > 20:
+            self.registry.remove(uid)
+            self.present.discard(uid)
+            self.paused.discard(uid)
+        elif op == "rename":
+            self.registry.update(replace(user, first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES)))
+        elif op == "play":
+            self.registry.update(replace(user, last_played=datetime.now(), total_games=user.total_games + 1))
+            self.games[uid] = self.games.get(uid, 0) + 1
+        return {uid}
+
+    def run_sequences(self, query: str) -> None:
+        self.model.rebuild(self.present, self.paused, query, self.games)
+        for _ in range(150):
+            # Wie der UpdateScheduler: mehrere Änderungen pro Idle-Zyklus gebündelt
+            dirty = set()
+            for _ in range(self.rng.randrange(1, 5)): dirty |= self.step()
+            self.model.update(dirty, self.present, self.paused, self.games)
+            self.assert_matches_rebuild(query)
+
+    def test_random_changes_without_search(self):
+        self.run_sequences("")
+
+    def test_random_changes_with_search(self):
+        self.run_sequences("an")
+
+    def test_pechvogel_star_moves(self):
+        now = datetime.now()
+        waiting = [User(uuid4(), f"Spieler{i}", "N", now - timedelta(days=10 + i)) for i in range(4)]
+        self.registry.extend(waiting)
+        self.present.update(u.id for u in waiting)
+        self.model.rebuild(self.present, self.paused, "", self.games)
+        self.assertEqual({u.id for u in self.model.pechvoegel}, {u.id for u in waiting[1:]})
+
+        # Der am längsten Wartende spielt: der Stern wandert zu Spieler0
+        longest = waiting[3]
+        self.registry.update(replace(longest, last_played=now, total_games=1))
+        touched = self.model.update({longest.id}, self.present, self.paused, self.games)
+        self.assertEqual(touched, {longest.id, waiting[0].id})
+        starred = {r.user.id for r in self.model.present if r.text.startswith("⭐")}
+        self.assertEqual(starred, {u.id for u in waiting[:3]})
+        self.assert_matches_rebuild("")
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
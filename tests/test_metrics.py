@@ -0,0 +1,67 @@
+#region IMPORTS
+import json
+import os
+import tempfile
+import unittest
+
+from werwolf.metrics import _NULL_TIMER, Metrics, _percentile, _Ring
+#endregion IMPORTS
+
+#region TESTS
+class RingTests(unittest.TestCase):
+    def test_wraparound(self):
+        ring = _Ring(4)
+        for v in (1.0, 2.0, 3.0):
+            ring.add(v)
+            self.assertEqual(ring.last(), v)
+        self.assertEqual(ring.window(), [1.0, 2.0, 3.0])
+        ring.add(4.0)
+        self.assertEqual(ring.pos, 0)
+        self.assertEqual(ring.last(), 4.0)
+        ring.add(5.0)
+        self.assertEqual((ring.pos, ring.last()), (1, 5.0))
+        self.assertEqual(sorted(ring.window()), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual((ring.total, ring.sum), (5, 15.0))
+
+class PercentileTests(unittest.TestCase):
+    def test_nearest_rank(self):
+        ordered = [float(v) for v in range(1, 11)]
+        self.assertEqual(_percentile(ordered, 50), 5.0)
+        self.assertEqual(_percentile(ordered, 90), 9.0)
+        self.assertEqual(_percentile(ordered, 99), 10.0)
+        self.assertEqual(_percentile(ordered, 0), 1.0)
+        self.assertEqual(_percentile([15.0, 20.0, 35.0, 40.0, 50.0], 30), 20.0)
+        self.assertEqual(_percentile([7.0], 99), 7.0)
+
+class MetricsTests(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        metrics = Metrics(enabled=False)
+        self.assertIs(metrics.timer("a"), _NULL_TIMER)
+        with metrics.timer("a"): pass
+        metrics.record("b", 0.5)
+        metrics.count("c")
+        metrics.timed("d")(lambda: None)()
+        stats = metrics.stats()
+        self.assertEqual((stats["timers"], stats["counters"]), ({}, {}))
+
+    def test_export(self):
+        metrics = Metrics(enabled=True, size=8)
+        for ms in (4, 1, 3, 2):
+            metrics.record("ui.refresh", ms / 1000)
+        metrics.count("import.added", 5)
+        metrics.count("import.added", 2)
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "metrics.json")
+            metrics.export(path, app="Werwolf", players=12)
+            with open(path, encoding="utf-8") as f: data = json.load(f)
+        self.assertEqual((data["app"], data["players"], data["enabled"]), ("Werwolf", 12, True))
+        self.assertIn("exported", data)
+        self.assertEqual(data["counters"], {"import.added": 7})
+        timer = data["timers"]["ui.refresh"]
+        self.assertEqual((timer["count"], timer["window"]), (4, 4))
+        for key, expected in (("last_ms", 2.0), ("mean_ms", 2.5), ("p50_ms", 2.0), ("p90_ms", 4.0), ("p99_ms", 4.0), ("max_ms", 4.0)):
+            self.assertAlmostEqual(timer[key], expected, msg=key)
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
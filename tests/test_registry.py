@@ -0,0 +1,57 @@
+#region IMPORTS
+import unittest
+from uuid import uuid4
+
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+from werwolf.search import SearchIndex
+#endregion IMPORTS
+
+#region TESTS
+class ExtendTests(unittest.TestCase):
+    def setUp(self):
+        self.existing = [User(uuid4(), "Michael", "Schmidt", None), User(uuid4(), "Anna", "Mueller", None)]
+        self.registry = PlayerRegistry(self.existing)
+        self.search = SearchIndex()
+        self.registry.attach(self.search)
+
+    def assert_unchanged(self) -> None:
+        self.assertEqual(list(self.registry), sorted(self.existing, key=lambda u: u.first_name))
+        self.assertIsNone(self.registry.find_by_name("Zoe", "Weber"))
+        self.assertEqual(self.search.query("zoe"), set())
+
+    def test_duplicate_of_existing_id_leaves_registry_untouched(self):
+        batch = [User(uuid4(), "Zoe", "Weber", None), User(self.existing[0].id, "Bernd", "Koch", None)]
+        with self.assertRaises(ValueError):
+            self.registry.extend(batch)
+        self.assert_unchanged()
+
+    def test_duplicate_within_batch_leaves_registry_untouched(self):
+        twin = uuid4()
+        with self.assertRaises(ValueError):
+            self.registry.extend(iter([User(twin, "Zoe", "Weber", None), User(twin, "Bernd", "Koch", None)]))
+        self.assert_unchanged()
+
+    def test_extend_keeps_order(self):
+        self.registry.extend(iter([User(uuid4(), "Zoe", "Weber", None), User(uuid4(), "Bernd", "Koch", None)]))
+        self.assertEqual([u.first_name for u in self.registry], ["Anna", "Bernd", "Michael", "Zoe"])
+        self.assertIsNotNone(self.registry.find_by_name("zoe", "WEBER"))
+
+class FindByNameTests(unittest.TestCase):
+    def test_shared_name_returns_first_in_order(self):
+        twins = [User(uuid4(), "Anna", "Schmidt", None), User(uuid4(), "anna ", "SCHMIDT", None), User(uuid4(), "Anna", "Schmidt", None)]
+        expected = min(twins, key=lambda u: u.id)
+        for order in (twins, twins[::-1]):
+            registry = PlayerRegistry([User(uuid4(), "Zoe", "Weber", None)])
+            for user in order: registry.add(user)
+            self.assertIs(registry.find_by_name("ANNA", "schmidt"), expected)
+            self.assertIs(registry.find_by_name("Anna", "Schmidt"), next(iter(registry)))
+            registry.remove(expected.id)
+            self.assertIs(registry.find_by_name("Anna", "Schmidt"), min((u for u in twins if u is not expected), key=lambda u: u.id))
+
+    def test_unknown_name(self):
+        self.assertIsNone(PlayerRegistry([User(uuid4(), "Anna", "Schmidt", None)]).find_by_name("Anna", "Schmid"))
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
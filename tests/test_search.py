@@ -0,0 +1,50 @@
+#region IMPORTS
+import unittest
+from uuid import uuid4
+
+from werwolf.models import User
+from werwolf.search import SearchIndex
+#endregion IMPORTS
+
+#region TESTS
+NAMES: tuple[tuple[str, str], ...] = (
+    ("Michael", "Schmidt"), ("Manuel", "Neuer"), ("Samuel", "Koch"), ("Joel", "Weber"),
+    ("Jürgen", "Müller"), ("Anna", "Mueller"), ("Paul", "Muller"), ("Björn", "Schäfer"), ("René", "Groß"),
+)
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.users = {f"{first} {last}": User(uuid4(), first, last, None) for first, last in NAMES}
+        self.index = SearchIndex(self.users.values())
+
+    def names(self, query: str) -> set[str]:
+        result = SearchIndex(self.users.values()).query(query)
+        by_id = {u.id: name for name, u in self.users.items()}
+        return {by_id[uid] for uid in result}
+
+    def test_plain_substrings_still_match(self):
+        self.assertLessEqual({"Michael Schmidt", "Manuel Neuer", "Samuel Koch", "Joel Weber"}, self.names("el"))
+        self.assertIn("Samuel Koch", self.names("e"))
+        self.assertEqual(self.names("muel"), {"Samuel Koch", "Jürgen Müller", "Anna Mueller"})
+
+    def test_umlaut_spellings(self):
+        self.assertEqual(self.names("Müller"), {"Jürgen Müller", "Anna Mueller", "Paul Muller"})
+        self.assertEqual(self.names("Mueller"), {"Jürgen Müller", "Anna Mueller"})
+        self.assertEqual(self.names("Muller"), {"Jürgen Müller", "Paul Muller"})
+        self.assertEqual(self.names("schaefer"), {"Björn Schäfer"})
+        self.assertEqual(self.names("rene gross"), {"René Groß"})
+
+    def test_narrowing_matches_fresh_query(self):
+        # Tippen Zeichen für Zeichen nutzt das vorige Ergebnis; muss dasselbe liefern wie eine neue Suche
+        for word in ("mueller", "müller", "samuel", "schäfer"):
+            for i in range(1, len(word) + 1):
+                self.assertEqual(self.index.query(word[:i]), SearchIndex(self.users.values()).query(word[:i]), word[:i])
+
+    def test_contains_uses_both_forms(self):
+        mueller = self.users["Jürgen Müller"]
+        self.assertTrue(self.index.contains(mueller.id, "Mueller"))
+        self.assertTrue(self.index.contains(self.users["Manuel Neuer"].id, "el"))
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
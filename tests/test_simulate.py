@@ -0,0 +1,41 @@
+#region IMPORTS
+from datetime import datetime, timedelta
+import importlib.util
+import unittest
+from uuid import uuid4
+
+from werwolf.models import User
+from werwolf.simulate import METRIC_NAMES, STRATEGIES, SimulationConfig, simulate
+#endregion IMPORTS
+
+#region TESTS
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy nicht installiert")
+class SimulationTests(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2026, 3, 1, 21, 30)
+        self.users = [User(uuid4(), f"V{i}", "N", self.now - timedelta(days=i % 10) if i % 4 else None, i % 5, i == 0)
+                      for i in range(30)]
+        self.config = SimulationConfig(evenings=40, table_size=8, runs=24, seed=5)
+
+    def run_sim(self, workers: int, names: tuple[str, ...] = ("quadratic", "uniform")) -> dict:
+        results = simulate(self.users, self.config, {name: STRATEGIES[name] for name in names}, workers, self.now)
+        return {r.strategy: r for r in results}
+
+    def test_same_seed_same_results_with_one_or_two_workers(self):
+        single, parallel = self.run_sim(1), self.run_sim(2)
+        self.assertEqual(single.keys(), parallel.keys())
+        for name, result in single.items():
+            self.assertEqual(result.runs, self.config.runs)
+            self.assertEqual(set(result.mean), set(METRIC_NAMES))
+            # Gleiche Saisons, nur anders auf die Prozesse verteilt: Mittelwerte bis auf Rundung gleich
+            for metric in METRIC_NAMES:
+                self.assertAlmostEqual(result.mean[metric], parallel[name].mean[metric], places=9, msg=f"{name} {metric}")
+                self.assertAlmostEqual(result.std[metric], parallel[name].std[metric], places=9, msg=f"{name} {metric}")
+
+    def test_uniform_waits_longer_than_quadratic(self):
+        results = self.run_sim(1)
+        self.assertGreater(results["uniform"].mean["wait_max"], results["quadratic"].mean["wait_max"])
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#region IMPORTS
+from datetime import datetime, timedelta, timezone
+import os
+import tempfile
+import unittest
+from uuid import uuid4
+
+from werwolf.models import User
+from werwolf.snapshot import HEADER, db_stamp, read_snapshot, write_snapshot
+from werwolf.storage import SqliteStorage
+#endregion IMPORTS
+
+#region TESTS
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.db_path = os.path.join(workdir.name, "data.db")
+        self.path = os.path.join(workdir.name, "roster.bin")
+        now = datetime(2026, 3, 1, 21, 30, 15, 123456)
+        self.users = [User(uuid4(), f"Vörname{i}", f"Nachname {i}", now - timedelta(hours=i) if i % 3 else None,
+                           i, i % 7 == 0) for i in range(50)]
+        self.users.append(User(uuid4(), "", "", None))
+        self.save(self.users)
+
+    def save(self, users: list[User]) -> None:
+        storage = SqliteStorage(self.db_path)
+        storage.save_users(users)
+        storage.close()
+
+    def write(self, users: list[User] | None = None) -> None:
+        write_snapshot(self.path, self.users if users is None else users, db_stamp(self.db_path))
+
+    def test_round_trip(self):
+        self.write()
+        self.assertEqual(read_snapshot(self.path, self.db_path), self.users)
+
+    def test_timezone_aware_last_played_is_stored_as_local_time(self):
+        aware = datetime(2026, 3, 1, 20, 0, tzinfo=timezone.utc)
+        user = User(uuid4(), "Anna", "Schmidt", aware)
+        self.write([user])
+        loaded = read_snapshot(self.path, self.db_path)[0]
+        self.assertIsNone(loaded.last_played.tzinfo)
+        self.assertEqual(loaded.last_played, aware.astimezone().replace(tzinfo=None))
+
+    def test_changed_database_forces_sqlite_path(self):
+        self.write()
+        self.save([User(uuid4(), f"Neu{i}", "Spieler", None) for i in range(200)])
+        self.assertIsNone(read_snapshot(self.path, self.db_path))
+
+    def test_missing_files(self):
+        self.assertIsNone(read_snapshot(self.path, self.db_path))
+        self.write()
+        self.assertIsNone(read_snapshot(self.path, self.db_path + ".fehlt"))
+
+    def test_truncated_or_corrupt_file_falls_back(self):
+        self.write()
+        with open(self.path, "rb") as f: data = f.read()
+        stamp = os.stat(self.db_path)
+        corrupt = {
+            "leer": b"",
+            "nur Kopf halb": data[:HEADER.size // 2],
+            "abgeschnitten": data[:-10],
+            "falsches Format": b"XXXX" + data[4:],
+            "kaputte Namen": data[:-4] + b"\xff\xfe\xfd\xfc",
+        }
+        for name, content in corrupt.items():
+            with open(self.path, "wb") as f: f.write(content)
+            os.utime(self.db_path, ns=(stamp.st_atime_ns, stamp.st_mtime_ns))
+            with self.assertLogs("WERWOLF_APP.storage", "WARNING"):
+                self.assertIsNone(read_snapshot(self.path, self.db_path), name)
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
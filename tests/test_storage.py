@@ -0,0 +1,116 @@
+#region IMPORTS
+from datetime import datetime
+import json
+import os
+import tempfile
+import unittest
+from uuid import uuid4
+
+from werwolf.models import User
+from werwolf.storage import SqliteStorage, load_state, user_to_dict
+#endregion IMPORTS
+
+#region TESTS
+class MigrationTests(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.json_path = os.path.join(workdir.name, "data.json")
+        self.db_path = os.path.join(workdir.name, "data.db")
+        self.users = [
+            User(uuid4(), "Jürgen", "Müller", datetime(2026, 2, 1, 20, 15), 4),
+            User(uuid4(), "Anna", "Maria Schmidt", None, 0, True),
+            User(uuid4(), "Solo", "", datetime(2026, 1, 3, 19, 0), 1),
+        ]
+
+    def write_json(self, content) -> None:
+        with open(self.json_path, "w") as f: json.dump(content, f)
+
+    def storage(self) -> SqliteStorage:
+        storage = SqliteStorage(self.db_path)
+        self.addCleanup(storage.close)
+        return storage
+
+    def test_legacy_list_layout(self):
+        self.write_json([user_to_dict(u) for u in self.users])
+        storage = self.storage()
+        self.assertTrue(storage.migrate_from_json(self.json_path))
+        self.assertEqual(sorted(storage.load_users(), key=lambda u: u.first_name), sorted(self.users, key=lambda u: u.first_name))
+        self.assertEqual(storage.load_history(), [])
+        self.assertEqual(storage.get_meta("migrated_from"), os.path.abspath(self.json_path))
+
+    def test_dict_layout_resolves_history_names(self):
+        known = self.users[1]
+        history = [
+            {"timestamp": "2026-02-01T20:15:00", "players": ["Jürgen Müller", "Anna Maria Schmidt", "Solo "]},
+            {"timestamp": "2026-02-08T20:15:00", "players": ["Jürgen Müller"], "player_ids": [str(known.id)]},
+        ]
+        self.write_json({"users": [user_to_dict(u) for u in self.users], "history": history})
+        storage = self.storage()
+        self.assertTrue(storage.migrate_from_json(self.json_path))
+        first, second = storage.load_history()
+        self.assertEqual(first.player_ids, tuple(u.id for u in self.users))
+        self.assertEqual(first.players, ("Jürgen Müller", "Anna Maria Schmidt", "Solo "))
+        # Vorhandene IDs gewinnen gegen die Namen
+        self.assertEqual(second.player_ids, (known.id,))
+
+    def test_unresolved_history_names(self):
+        history = [{"timestamp": "2026-02-01T20:15:00", "players": ["Jürgen Müller", "Unbekannt Person", "Müller Jürgen"]}]
+        self.write_json({"users": [user_to_dict(u) for u in self.users], "history": history})
+        storage = self.storage()
+        storage.migrate_from_json(self.json_path)
+        (entry,) = storage.load_history()
+        self.assertEqual(entry.player_ids, (self.users[0].id, None, None))
+        self.assertEqual(entry.players, ("Jürgen Müller", "Unbekannt Person", "Müller Jürgen"))
+
+    def test_history_names_with_spaces_in_first_name(self):
+        users = self.users + [User(uuid4(), "Anna Lena", "Schmidt", None), User(uuid4(), "Jan", "van der Berg", None)]
+        history = [{"timestamp": "2026-02-01T20:15:00", "players": ["Anna Lena Schmidt", "Jan van der Berg", "Solo"]}]
+        self.write_json({"users": [user_to_dict(u) for u in users], "history": history})
+        storage = self.storage()
+        storage.migrate_from_json(self.json_path)
+        (entry,) = storage.load_history()
+        self.assertEqual(entry.player_ids, (users[3].id, users[4].id, users[2].id))
+
+    def test_second_run_is_skipped(self):
+        self.write_json({"users": [user_to_dict(u) for u in self.users],
+                         "history": [{"timestamp": "2026-02-01T20:15:00", "players": ["Jürgen Müller"]}]})
+        storage = self.storage()
+        self.assertTrue(storage.migrate_from_json(self.json_path))
+        storage.delete_user(self.users[2].id)
+        # Auch mit einer geänderten data.json wird nichts mehr übernommen oder überschrieben
+        self.write_json([user_to_dict(User(uuid4(), "Neu", "Spieler", None))])
+        self.assertFalse(storage.migrate_from_json(self.json_path))
+        self.assertEqual(len(storage.load_users()), 2)
+        self.assertEqual(storage.history_count(), 1)
+
+    def test_missing_json(self):
+        storage = self.storage()
+        self.assertFalse(storage.migrate_from_json(self.json_path))
+        self.assertIsNone(storage.get_meta("migrated_from"))
+
+    def test_load_state_migrates_once(self):
+        self.write_json([user_to_dict(u) for u in self.users])
+        for _ in range(2):
+            storage, users, history = load_state(self.db_path, self.json_path)
+            storage.close()
+            self.assertEqual(len(users), 3)
+            self.assertEqual(len(history), 0)
+
+class SchemaTests(unittest.TestCase):
+    def test_unused_history_players_table_is_dropped(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "data.db")
+            storage = SqliteStorage(path)
+            storage.conn.execute("CREATE TABLE history_players (history_id INTEGER, position INTEGER, user_id TEXT)")
+            storage.close()
+            storage = SqliteStorage(path)
+            try:
+                tables = {row[0] for row in storage.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            finally:
+                storage.close()
+            self.assertNotIn("history_players", tables)
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+#region IMPORTS
+import asyncio
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from uuid import uuid4
+
+from werwolf.history import DrawHistory, HistoryEntry
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+from werwolf.storage import SqliteStorage
+from werwolf.sync import (BATCH_DELAY, SyncClient, SyncServer, apply_message, blacklist_change, coalesce, draw_change,
+                          pause_change, presence_change)
+#endregion IMPORTS
+
+#region HELPERS
+TIMEOUT: float = 5.0
+
+def make_users(n: int) -> list[User]:
+    return [User(uuid4(), f"Vorname{i}", f"Nachname{i}", None) for i in range(n)]
+
+class ServerThread:
+    # SyncServer auf 127.0.0.1 mit freiem Port, eigene Event-Loop im Hintergrund-Thread
+    def __init__(self, server: SyncServer):
+        self.server = server
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.port = self.call(server.start("127.0.0.1", 0))
+
+    def call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(TIMEOUT)
+
+    def stop(self) -> None:
+        self.call(self.server.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(TIMEOUT)
+        self.loop.close()
+
+class Replica:
+    # Lokaler Stand eines Clients, so wie ihn MainApp hält; pump() spielt die Rolle von _poll_sync
+    def __init__(self, port: int, users: list[User], storage: SqliteStorage | None = None,
+                 epoch: str | None = None, version: int = 0):
+        self.registry = PlayerRegistry(users)
+        self.present: set = set()
+        self.paused: set = set()
+        self.history = DrawHistory()
+        self.storage = storage
+        self.received: list[str] = []
+        self.client = SyncClient("127.0.0.1", port)
+        self.client.epoch, self.client.version = epoch, version
+        self.client.start()
+
+    def send(self, *changes) -> None:
+        self.client.send(*changes)
+
+    def pump(self, until, timeout: float = TIMEOUT) -> None:
+        deadline = time.monotonic() + timeout
+        while not until():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: raise AssertionError("Zeitüberschreitung beim Warten auf den Sync-Server")
+            try:
+                message = self.client.inbox.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if message["type"] == "status": continue
+            self.received.append(message["type"])
+            apply_message(self.client, message, self.registry, self.present, self.paused, self.history, self.storage)
+
+    def stop(self) -> None:
+        self.client.stop()
+#endregion HELPERS
+
+#region TESTS
+class SyncTests(unittest.TestCase):
+    def setUp(self):
+        self.users = make_users(5)
+        self.server = SyncServer(PlayerRegistry(self.users), DrawHistory())
+        self.thread = ServerThread(self.server)
+        self.replicas: list[Replica] = []
+
+    def tearDown(self):
+        for replica in self.replicas: replica.stop()
+        self.thread.stop()
+
+    def replica(self, users: list[User] | None = None, **kwargs) -> Replica:
+        replica = Replica(self.thread.port, list(self.users if users is None else users), **kwargs)
+        self.replicas.append(replica)
+        replica.pump(lambda: replica.client.epoch is not None)
+        return replica
+
+    def test_presence_propagates(self):
+        a, b = self.replica(), self.replica()
+        uid = self.users[0].id
+        a.present.add(uid)
+        a.send(presence_change(uid, True))
+        b.pump(lambda: uid in b.present)
+        a.pump(lambda: a.client.version == self.server.version)
+        self.assertEqual(self.server.present, {uid})
+
+    def test_stale_change_is_rejected_with_fixup(self):
+        a, b = self.replica(), self.replica()
+        uid = self.users[1].id
+        a.present.add(uid)
+        a.send(presence_change(uid, True))
+        a.pump(lambda: a.client.version == 1)
+        # b hat v1 noch nicht angewendet und nimmt den Spieler auf Basis v0 wieder raus;
+        # erst pumpen, wenn der Push raus ist, sonst zählt b vorher noch auf v1 hoch
+        b.send(presence_change(uid, False))
+        time.sleep(BATCH_DELAY * 6)
+        b.pump(lambda: "reject" in b.received)
+        b.pump(lambda: b.client.version == 1)
+        self.assertIn(uid, b.present)
+        self.assertEqual(self.server.present, {uid})
+        self.assertEqual(self.server.version, 1)
+
+    def test_reconnect_catches_up_from_delta_log(self):
+        a, b = self.replica(), self.replica()
+        epoch, version = b.client.epoch, b.client.version
+        b.stop()
+        for user in self.users[:3]:
+            a.present.add(user.id)
+            a.send(presence_change(user.id, True))
+        a.pump(lambda: a.client.version == self.server.version and len(self.server.present) == 3)
+
+        c = self.replica(epoch=epoch, version=version)
+        c.pump(lambda: c.client.version == self.server.version)
+        self.assertEqual(c.received[0], "deltas")
+        self.assertEqual(c.present, {u.id for u in self.users[:3]})
+
+    def test_pause_for_absent_player_is_rejected(self):
+        a, b = self.replica(), self.replica()
+        uid = self.users[2].id
+        a.paused.add(uid)
+        a.send(pause_change(uid, True))
+        a.pump(lambda: "reject" in a.received)
+        self.assertNotIn(uid, a.paused)
+        self.assertEqual(self.server.paused, set())
+        self.assertEqual(self.server.version, 0)
+        self.assertNotIn(uid, b.paused)
+
+    def test_empty_server_snapshot_keeps_local_players(self):
+        self.thread.stop()
+        self.server = SyncServer(PlayerRegistry(), DrawHistory())
+        self.thread = ServerThread(self.server)
+
+        local = make_users(25)
+        with tempfile.TemporaryDirectory() as workdir:
+            storage = SqliteStorage(os.path.join(workdir, "data.db"))
+            storage.save_users(local)
+            try:
+                replica = self.replica(local, storage=storage)
+                self.assertEqual(replica.received, ["snapshot"])
+                self.assertEqual(len(replica.registry), 25)
+                self.assertEqual(len(storage.load_users()), 25)
+            finally:
+                storage.close()
+
+class CoalesceTests(unittest.TestCase):
+    # Offline gesammelte Änderungen so, wie MainApp sie veröffentlicht, gebündelt auf den Server angewendet
+    def setUp(self):
+        self.user = make_users(1)[0]
+        self.uid = self.user.id
+        self.server = SyncServer(PlayerRegistry([self.user]), DrawHistory())
+        self.server.apply(0, [presence_change(self.uid, True), pause_change(self.uid, True)])
+
+    def push(self, *changes) -> None:
+        self.server.apply(self.server.version, coalesce(changes))
+
+    def test_leave_and_return_clears_pause(self):
+        # toggle_presence: gehen (mit Pause aufheben), wiederkommen
+        self.push(pause_change(self.uid, False), presence_change(self.uid, False), presence_change(self.uid, True))
+        self.assertEqual(self.server.present, {self.uid})
+        self.assertEqual(self.server.paused, set())
+
+    def test_blacklist_and_unblock_removes_presence(self):
+        # toggle_blacklist: sperren (mit Abmelden und Pause aufheben), wieder entsperren
+        self.push(presence_change(self.uid, False), pause_change(self.uid, False), blacklist_change(self.uid, True),
+                  blacklist_change(self.uid, False))
+        self.assertEqual(self.server.present, set())
+        self.assertEqual(self.server.paused, set())
+        self.assertFalse(self.server.registry.get(self.uid).is_blacklisted)
+
+class ServerStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.users = make_users(3)
+        self.workdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.workdir.name, "data.db")
+        self.storage = SqliteStorage(self.path)
+        self.storage.save_users(self.users)
+
+    def tearDown(self):
+        self.storage.close()
+        self.workdir.cleanup()
+
+    def entry(self) -> HistoryEntry:
+        return HistoryEntry(datetime(2026, 3, 1, 20, 0), tuple(u.id for u in self.users[:2]),
+                            tuple(u.first_name for u in self.users[:2]))
+
+    def test_draw_on_shared_db_is_stored_once(self):
+        # Oberfläche und Server mit derselben data.db: beide schreiben dieselbe Runde
+        entry = self.entry()
+        self.storage.record_draw([], entry)
+        server = SyncServer(PlayerRegistry(self.users), DrawHistory(), SqliteStorage(self.path))
+        try:
+            server.apply(0, [draw_change(entry)])
+        finally:
+            server.storage.close()
+        self.assertEqual(self.storage.history_count(), 1)
+        self.assertEqual(len(self.storage.load_history()), 1)
+
+    def test_existing_duplicates_are_removed_on_open(self):
+        entry = self.entry()
+        self.storage.conn.execute("DROP INDEX idx_history_unique")
+        self.storage.record_draw([], entry)
+        self.storage.record_draw([], entry)
+        self.storage.close()
+        self.storage = SqliteStorage(self.path)
+        self.assertEqual(self.storage.history_count(), 1)
+        self.storage.record_draw([], entry)
+        self.assertEqual(self.storage.history_count(), 1)
+
+    def test_presence_for_unknown_player_is_rejected(self):
+        server = SyncServer(PlayerRegistry(self.users), DrawHistory())
+        stranger = make_users(1)[0].id
+        accepted, fixups = server.apply(0, [presence_change(stranger, True)])
+        self.assertEqual(accepted, [])
+        self.assertEqual(fixups, [presence_change(stranger, False)])
+        self.assertEqual(server.present, set())
+
+    def test_presence_for_blacklisted_player_is_rejected(self):
+        blocked = self.users[0].id
+        server = SyncServer(PlayerRegistry(self.users), DrawHistory())
+        server.apply(0, [blacklist_change(blocked, True)])
+        accepted, fixups = server.apply(server.version, [presence_change(blocked, True)])
+        self.assertEqual(accepted, [])
+        self.assertEqual(fixups, [presence_change(blocked, False)])
+        self.assertEqual(server.present, set())
+        self.assertEqual(server.version, 1)
+
+    def test_catch_up_leaves_out_own_draws(self):
+        # Ein Client, der vor der Broadcast-Nachricht seiner Auslosung neu verbindet, bekommt sie nicht als fremde Runde
+        server = SyncServer(PlayerRegistry(self.users), DrawHistory())
+        server.apply(0, [draw_change(self.entry())], client="a")
+        server.apply(1, [presence_change(self.users[2].id, True)], client="b")
+        own = server.catch_up(server.epoch, 0, "a")
+        other = server.catch_up(server.epoch, 0, "b")
+        self.assertEqual([c["op"] for c in own["changes"]], ["user", "user", "present"])
+        self.assertEqual([c["op"] for c in other["changes"]], ["user", "user", "history", "present"])
+
+        client = SyncClient("127.0.0.1")
+        self.addCleanup(client._loop.close)
+        client.client_id, client.epoch = "a", server.epoch
+        history = DrawHistory([self.entry()])
+        apply_message(client, own, PlayerRegistry(self.users), set(), set(), history)
+        self.assertEqual(len(history), 1)
+        self.assertEqual(client.version, 2)
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
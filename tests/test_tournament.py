@@ -0,0 +1,83 @@
+#region IMPORTS
+from collections import Counter
+from datetime import datetime
+import unittest
+from uuid import uuid4
+
+from werwolf.draw import WeightedSampler
+from werwolf.history import DrawHistory, HistoryEntry
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+from werwolf.tournament import PARALLEL_MIN_PLAYERS, TablePlanner, co_player_pairs, perform_tournament, table_sizes
+#endregion IMPORTS
+
+#region TESTS
+def previous_round(users: list[User], sizes: list[int]) -> DrawHistory:
+    # Letzte Runde: die Spieler der Reihe nach an Tische der Größen sizes
+    ids = tuple(u.id for u in users[:sum(sizes)])
+    return DrawHistory([HistoryEntry(datetime(2026, 3, 1, 20, 0), ids, tuple(u.first_name for u in users[:len(ids)]), tuple(sizes))])
+
+def clash_count(assignment: list[int], pairs: list[tuple[int, int]]) -> int:
+    return sum(1 for a, b in pairs if assignment[a] == assignment[b])
+
+class TableSizeTests(unittest.TestCase):
+    def test_sizes(self):
+        self.assertEqual(table_sizes(60, 5), [12] * 5)
+        self.assertEqual(table_sizes(23, 4), [6, 6, 6, 5])
+        self.assertEqual(table_sizes(3, 5), [1, 1, 1])
+        for players in range(0, 40):
+            for tables in range(1, 7):
+                sizes = table_sizes(players, tables)
+                self.assertEqual(sum(sizes), players)
+                if sizes: self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+class TournamentTests(unittest.TestCase):
+    def setUp(self):
+        self.users = [User(uuid4(), f"V{i:03}", "N", None) for i in range(70)]
+        self.now = datetime(2026, 3, 8, 20, 0)
+
+    def test_tables_partition_the_drawn_players(self):
+        planner = TablePlanner(workers=1, seed=3)
+        self.addCleanup(planner.close)
+        for table_count, table_size in ((5, 12), (4, 6), (3, 30)):
+            history = previous_round(self.users, [12] * 5)
+            registry = PlayerRegistry(self.users)
+            tables = perform_tournament(registry, self.users, table_count, table_size, WeightedSampler(seed=1), history,
+                                        planner, now=self.now)
+            seated = [u.id for table in tables for u in table]
+            self.assertEqual(len(seated), len(set(seated)))
+            self.assertLessEqual(set(seated), {u.id for u in self.users})
+            self.assertEqual([len(t) for t in tables], table_sizes(min(table_count * table_size, len(self.users)), table_count))
+            self.assertEqual(history.last().tables, tuple(len(t) for t in tables))
+            self.assertTrue(all(registry.get(uid).total_games == 1 for uid in seated))
+
+    def test_known_instance_reaches_minimum(self):
+        # 60 Spieler, vorher 5 Tische à 12: jeder neue Tisch mischt 5 alte Tische (3+3+2+2+2), also mindestens
+        # 5 * (3 + 3 + 1 + 1 + 1) = 45 Wiederholungs-Paare
+        players = self.users[:60]
+        pairs = co_player_pairs(previous_round(players, [12] * 5), [u.id for u in players])
+        planner = TablePlanner(workers=1, seed=7)
+        self.addCleanup(planner.close)
+        assignment = planner.assign(table_sizes(60, 5), pairs, 60)
+        self.assertEqual(Counter(assignment), Counter({t: 12 for t in range(5)}))
+        self.assertEqual(clash_count(assignment, pairs), 45)
+
+    def test_parallel_and_in_process_agree(self):
+        n = PARALLEL_MIN_PLAYERS + 30
+        users = [User(uuid4(), f"V{i:03}", "N", None) for i in range(n)]
+        sizes = table_sizes(n, 10)
+        pairs = co_player_pairs(previous_round(users, sizes), [u.id for u in users])
+        results = []
+        for workers in (1, 2):
+            planner = TablePlanner(workers=workers, restarts=4, seed=11)
+            self.addCleanup(planner.close)
+            assignment = planner.assign(sizes, pairs, n)
+            self.assertEqual(workers > 1, planner._executor is not None)
+            self.assertEqual(Counter(assignment), Counter(dict(enumerate(sizes))))
+            results.append(assignment)
+        # Gleiche Seeds, gleiche Neustarts: der beste Lauf ist derselbe, egal wo er gerechnet wurde
+        self.assertEqual(results[0], results[1])
+#endregion TESTS
+
+if __name__ == "__main__":
+    unittest.main()
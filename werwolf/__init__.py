@@ -0,0 +1,30 @@
+#region IMPORTS
+# Headless-Kern: kein Import von customtkinter/rich hier, damit Skripte und CLI schnell starten.
+# Die Oberfläche liegt in werwolf.gui und wird nur bei Bedarf importiert.
+from werwolf.models import User, days_since, relative_time
+from werwolf.clock import DisplayClock
+from werwolf.registry import NameKey, PlayerRegistry, name_key
+from werwolf.history import DrawHistory, HistoryEntry
+from werwolf.draw import FenwickTree, WeightedSampler, default_weight, perform_draw
+from werwolf.tournament import TablePlanner, perform_tournament
+from werwolf.simulate import STRATEGIES, SimulationConfig, SimulationResult, simulate
+from werwolf.storage import DATA_FILE, DB_FILE, SqliteStorage, load_state, read_json_data, write_json_data
+from werwolf.columns import PlayerColumns, UserView, draw_rows
+from werwolf.importer import ImportProgress, MemorySink, RegistrySink, StreamingImporter, iter_import_file, iter_text_rows
+#endregion IMPORTS
+
+__all__ = [
+    "User", "days_since", "relative_time", "DisplayClock", "NameKey", "PlayerRegistry", "name_key",
+    "DrawHistory", "HistoryEntry",
+    "FenwickTree", "WeightedSampler", "default_weight", "perform_draw", "TablePlanner", "perform_tournament",
+    "STRATEGIES", "SimulationConfig", "SimulationResult", "simulate",
+    "DATA_FILE", "DB_FILE", "SqliteStorage", "load_state", "read_json_data", "write_json_data",
+    "PlayerColumns", "UserView", "draw_rows",
+    "ImportProgress", "MemorySink", "RegistrySink", "StreamingImporter", "iter_import_file", "iter_text_rows",
+    "APP_NAME", "APP_VERSION",
+]
+
+#region GLOBALS
+APP_NAME: str = "Werwolf User Selector"
+APP_VERSION: str = "1.7.1" # Version Bump für Logging-Update
+#endregion GLOBALS
@@ -0,0 +1,3 @@
+from werwolf.cli import main
+
+raise SystemExit(main())
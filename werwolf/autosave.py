@@ -0,0 +1,135 @@
+#region IMPORTS
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import json
+import logging
+import threading
+import time
+from uuid import UUID
+
+from werwolf.history import HistoryEntry
+from werwolf.log import get_logger
+from werwolf.metrics import METRICS
+from werwolf.models import User
+from werwolf.storage import atomic_write, user_to_dict
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("storage")
+
+#region GLOBALS
+AUTOSAVE_FILE: str = "autosave.json"
+AUTOSAVE_INTERVAL: float = 30.0 # höchstens ein Schreibvorgang pro so viele Sekunden
+GENERATIONS: int = 3 # ältere Stände liegen als autosave.json.1 (neuester) bis .3 daneben
+SESSION_MAX_AGE: timedelta = timedelta(hours=12) # ältere Sitzungen werden beim Start nicht wiederhergestellt
+#endregion GLOBALS
+
+#region AUTOSAVE
+# Spieler und Historie stehen ohnehin nach jeder Änderung in data.db. Das Autosave ist eine vollständige
+# Sicherung daneben im Format von data.json (lässt sich also mit read_json_data bzw. migrate_from_json
+# einlesen) und enthält zusätzlich die laufende Sitzung: Anwesende, Pausierte und Spiele dieses Abends,
+# die sonst bei einem Absturz verloren wären.
+@dataclass(frozen=True)
+class SessionState:
+    # Unveränderliche Kopie des Stands: wird im Tk-Thread erstellt und erst im Schreib-Thread serialisiert.
+    # User und HistoryEntry sind selbst frozen, kopiert werden nur die Container.
+    taken: datetime
+    users: tuple[User, ...]
+    history: tuple[HistoryEntry, ...]
+    present: frozenset[UUID] = frozenset()
+    paused: frozenset[UUID] = frozenset()
+    games: tuple[tuple[UUID, int], ...] = ()
+
+    @classmethod
+    def capture(cls, users: Iterable[User], history: Iterable[HistoryEntry], present: Iterable[UUID] = (),
+                paused: Iterable[UUID] = (), games: Mapping[UUID, int] | None = None) -> "SessionState":
+        return cls(datetime.now(), tuple(users), tuple(history), frozenset(present), frozenset(paused),
+                   tuple((games or {}).items()))
+
+    def to_json(self) -> bytes:
+        data = {"users": [user_to_dict(u) for u in self.users], "history": [e.to_dict() for e in self.history],
+                "saved": self.taken.isoformat()}
+        if self.present or self.paused or self.games:
+            data["session"] = {"present": [str(uid) for uid in self.present], "paused": [str(uid) for uid in self.paused],
+                               "games": {str(uid): n for uid, n in self.games}}
+        return json.dumps(data, separators=(",", ":")).encode()
+
+def read_session(path: str = AUTOSAVE_FILE, generations: int = GENERATIONS, max_age: timedelta = SESSION_MAX_AGE,
+                 now: datetime | None = None) -> tuple[set[UUID], set[UUID], dict[UUID, int]] | None:
+    # (Anwesende, Pausierte, Spiele) aus dem neuesten lesbaren Autosave. None, wenn dort keine Sitzung steht
+    # (z.B. nach regulärem Beenden) oder sie älter als max_age ist.
+    now = now or datetime.now()
+    for candidate in [path] + [f"{path}.{i}" for i in range(1, generations + 1)]:
+        try:
+            with open(candidate, "rb") as f:
+                content = json.load(f)
+            saved = datetime.fromisoformat(content["saved"])
+            session = content.get("session")
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Autosave {candidate} ist unlesbar, versuche ältere Generation: {e}")
+            continue
+        if not session or now - saved > max_age: return None
+        return ({UUID(uid) for uid in session["present"]}, {UUID(uid) for uid in session["paused"]},
+                {UUID(uid): n for uid, n in session["games"].items()})
+    return None
+
+class Autosaver:
+    # Schreib-Thread für das Autosave. submit() ersetzt einen noch nicht geschriebenen Stand, Schübe von
+    # Änderungen werden so zu einem Schreibvorgang zusammengefasst; zwischen zwei Schreibvorgängen liegen
+    # mindestens interval Sekunden. stop() schreibt einen noch offenen Stand sofort.
+    def __init__(self, path: str = AUTOSAVE_FILE, interval: float = AUTOSAVE_INTERVAL, generations: int = GENERATIONS):
+        self.path = path
+        self.interval = interval
+        self.generations = generations
+        self.writes: int = 0
+        self._pending: SessionState | None = None
+        self._last_write: float = float("-inf")
+        self._stopping: bool = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="Autosave", daemon=True)
+
+    def start(self) -> None:
+        if not self._thread.is_alive(): self._thread.start()
+
+    def submit(self, state: SessionState) -> None:
+        with self._cond:
+            self._pending = state
+            self._cond.notify()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self._thread.is_alive(): return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopping:
+                    self._cond.wait()
+                while not self._stopping and (wait := self._last_write + self.interval - time.monotonic()) > 0:
+                    self._cond.wait(wait)
+                state, self._pending = self._pending, None
+            if state is None: return
+            self._write(state)
+
+    def _write(self, state: SessionState) -> None:
+        started = time.perf_counter()
+        try:
+            with METRICS.timer("autosave.write"):
+                data = state.to_json()
+                atomic_write(self.path, data, self.generations)
+        except OSError as e:
+            logger.error(f"Autosave nach {self.path} fehlgeschlagen: {e}")
+        except Exception:
+            # Z.B. ein nicht serialisierbarer Wert: der Schreib-Thread muss für die nächsten Stände weiterlaufen
+            logger.exception(f"Autosave nach {self.path} fehlgeschlagen, Stand wird verworfen.")
+        else:
+            self.writes += 1
+            logger.debug(f"Autosave: {len(state.users)} Spieler, {len(state.present)} anwesend, "
+                         f"{len(data) // 1024} KiB in {(time.perf_counter() - started) * 1000:.0f} ms.")
+        self._last_write = time.monotonic()
+#endregion AUTOSAVE
@@ -0,0 +1,250 @@
+#region IMPORTS
+import argparse
+from datetime import datetime
+import heapq
+import json
+import logging
+import sys
+import time
+
+from werwolf import APP_NAME, APP_VERSION
+from werwolf.columns import PlayerColumns
+from werwolf.draw import WeightedSampler, perform_draw
+from werwolf.log import configure_levels, get_logger, parse_levels
+from werwolf.history import DrawHistory
+from werwolf.importer import RegistrySink, StreamingImporter, iter_import_file, iter_text_rows
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+from werwolf.simulate import METRIC_NAMES, STRATEGIES, SimulationConfig, results_to_dict, simulate
+from werwolf.storage import DATA_FILE, DB_FILE, SqliteStorage, load_state, user_to_dict
+from werwolf.tournament import TablePlanner, perform_tournament
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("cli")
+
+#region COMMANDS
+def _open(args) -> tuple[SqliteStorage, PlayerRegistry, DrawHistory]:
+    storage, users, history = load_state(args.db, args.json)
+    return storage, PlayerRegistry(users), history
+
+def _read_present(registry: PlayerRegistry, path: str) -> list[User]:
+    # Anwesenheitsliste: ein Name pro Zeile ("Vorname Nachname"), "-" liest von stdin
+    try:
+        f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8-sig")
+    except OSError as e:
+        raise argparse.ArgumentTypeError(f"--present: {path} kann nicht gelesen werden ({e.strerror})") from None
+    present: dict = {}
+    try:
+        for f_name, l_name in iter_text_rows(f):
+            user = registry.find_by_name(f_name, l_name)
+            if user is None:
+                logger.warning(f"Unbekannter Spieler in Anwesenheitsliste: {f_name} {l_name}")
+                continue
+            present[user.id] = user
+    finally:
+        if f is not sys.stdin: f.close()
+    return registry.ordered(present)
+
+def cmd_draw(args) -> int:
+    storage, registry, history = _open(args)
+    try:
+        pool = _read_present(registry, args.present) if args.present else list(registry)
+        candidates = [u for u in pool if not u.is_blacklisted]
+        if not candidates:
+            print("Keine aktiven Spieler vorhanden.", file=sys.stderr)
+            return 1
+
+        try:
+            sampler = WeightedSampler(seed=args.seed, method=args.method)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+        if args.tables is not None:
+            planner = TablePlanner(seed=args.seed)
+            try:
+                tables = perform_tournament(registry, candidates, args.tables, args.count, sampler, history, planner,
+                                            None if args.dry_run else storage)
+            finally:
+                planner.close()
+            for t, table in enumerate(tables, 1):
+                print(f"Tisch {t}:")
+                for i, user in enumerate(table, 1):
+                    print(f"  {i}. {user.first_name} {user.last_name}")
+            return 0
+
+        winners = perform_draw(registry, candidates, min(args.count, len(candidates)), sampler,
+                               history, None if args.dry_run else storage)
+        for i, user in enumerate(winners, 1):
+            print(f"{i}. {user.first_name} {user.last_name}")
+        return 0
+    finally:
+        storage.close()
+
+def cmd_import(args) -> int:
+    storage, registry, _ = _open(args)
+    try:
+        sink = RegistrySink(registry, storage)
+        progress = StreamingImporter(iter_import_file(args.file), sink.existing_keys(), args.batch_size).run(sink)
+        print(f"{progress.read} Zeilen gelesen, {progress.added} neue Spieler, {progress.skipped} Duplikate.")
+        return 0
+    finally:
+        storage.close()
+
+def cmd_stats(args) -> int:
+    # Liest die Spieler spaltenweise statt als User-Objekte, damit auch sehr große Kader wenig Speicher brauchen
+    storage = SqliteStorage(args.db)
+    storage.migrate_from_json(args.json)
+    columns = PlayerColumns.from_storage(storage)
+    history_count = storage.history_count()
+    storage.close()
+    now = datetime.now()
+    active = columns.active_rows()
+    weights = columns.weights(active, now)
+    waiting = heapq.nlargest(args.top, range(len(active)), key=weights.__getitem__)
+
+    print(f"{APP_NAME} v{APP_VERSION}")
+    print(f"Spieler: {len(columns)} ({len(columns) - len(active)} gesperrt)")
+    print(f"Spiele gesamt: {sum(columns.games)}")
+    print(f"Historien-Einträge: {history_count}")
+    if waiting:
+        print(f"Längste Wartezeit (Top {len(waiting)}):")
+        for u in (columns.view(active[i]) for i in waiting):
+            print(f"  {u.first_name} {u.last_name} ({u.get_time_diff_str(now)}, {u.total_games} Spiele)")
+    return 0
+
+def cmd_serve(args) -> int:
+    # Erst hier importiert, damit die übrigen Befehle asyncio nicht laden
+    from werwolf.sync import SYNC_PORT, serve
+    port = SYNC_PORT if args.port is None else args.port
+    storage, registry, history = _open(args)
+    print(f"Sync-Server für {len(registry)} Spieler auf {args.host}:{port} (Strg+C beendet).")
+    try:
+        serve(registry, history, storage, args.host, port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        storage.close()
+    return 0
+
+def cmd_export(args) -> int:
+    storage, registry, history = _open(args)
+    storage.close()
+    data = {"users": [user_to_dict(u) for u in registry], "history": history.to_dicts()}
+    if args.output == "-":
+        json.dump(data, sys.stdout, indent=4, ensure_ascii=False)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=4)
+        print(f"{len(registry)} Spieler nach {args.output} exportiert.")
+    return 0
+
+def cmd_simulate(args) -> int:
+    storage, registry, _ = _open(args)
+    storage.close()
+    users = list(registry)
+    if not users:
+        print("Keine Spieler vorhanden.", file=sys.stderr)
+        return 1
+
+    config = SimulationConfig(args.evenings, args.table_size, args.attendance, args.spread, args.interval, args.runs, args.seed,
+                              args.rounds, args.round_hours, args.jitter)
+    strategies = {name: STRATEGIES[name] for name in args.strategies}
+    try:
+        results = simulate(users, config, strategies, args.workers)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"{len(users)} Spieler, {config.runs} Saisons à {config.evenings} Abende, {config.table_size} Plätze, "
+          f"Anwesenheit {config.attendance:.0%} ± {config.attendance_spread:.0%}")
+    print(f"{'Strategie':16}" + "".join(f"{m:>12}" for m in METRIC_NAMES))
+    for r in sorted(results, key=lambda r: r.mean["rate_std"]):
+        print(f"{r.strategy:16}" + "".join(f"{r.mean[m]:12.3f}" for m in METRIC_NAMES))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results_to_dict(config, len(users), results), f, indent=4)
+        print(f"Ergebnisse nach {args.output} exportiert.")
+    return 0
+#endregion COMMANDS
+
+#region MAIN
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1: raise argparse.ArgumentTypeError(f"muss mindestens 1 sein, nicht {number}")
+    return number
+
+def log_levels(value: str) -> dict[str, int]:
+    # argparse zeigt bei ValueError nur "invalid ... value", die eigentliche Meldung käme nie an
+    try:
+        return parse_levels(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="werwolf", description=f"{APP_NAME} v{APP_VERSION} (Kommandozeile)")
+    parser.add_argument("--db", default=DB_FILE, help=f"SQLite-Datenbank (Standard: {DB_FILE})")
+    parser.add_argument("--json", default=DATA_FILE, help=f"data.json für die einmalige Migration (Standard: {DATA_FILE})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug-Ausgaben anzeigen")
+    parser.add_argument("--log-levels", type=log_levels, default={}, metavar="SPEC",
+                        help="Log-Level pro Subsystem, z.B. 'draw=DEBUG,storage=WARNING'")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("draw", help="Spieler auslosen")
+    p.add_argument("count", type=positive_int, help="Anzahl zu ziehender Spieler (mit --tables: pro Tisch)")
+    p.add_argument("--tables", type=positive_int, metavar="N", help="Turniermodus: N Tische auf einmal auslosen")
+    p.add_argument("--present", metavar="DATEI", help="Anwesenheitsliste (ein Name pro Zeile, '-' für stdin); Standard: alle Spieler")
+    p.add_argument("--seed", type=int, help="Seed für reproduzierbare Ziehungen")
+    p.add_argument("--method", choices=WeightedSampler.METHODS, default="fenwick")
+    p.add_argument("--dry-run", action="store_true", help="Nur anzeigen, nichts speichern")
+    p.set_defaults(func=cmd_draw)
+
+    p = sub.add_parser("import", help="Spieler aus CSV/TXT importieren")
+    p.add_argument("file")
+    p.add_argument("--batch-size", type=positive_int, default=500)
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("stats", help="Übersicht über Spieler und Historie")
+    p.add_argument("--top", type=int, default=5, help="Anzahl der am längsten wartenden Spieler")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("simulate", help="Gewichtungen über viele simulierte Saisons vergleichen (benötigt numpy)")
+    p.add_argument("--evenings", type=positive_int, default=100, help="Spielabende pro Saison")
+    p.add_argument("--table-size", type=positive_int, default=12, help="Plätze pro Abend")
+    p.add_argument("--attendance", type=float, default=0.6, help="Mittlere Anwesenheitswahrscheinlichkeit")
+    p.add_argument("--spread", type=float, default=0.2, help="Streuung der Anwesenheit zwischen Spielern")
+    p.add_argument("--interval", type=float, default=7.0, help="Tage zwischen zwei Abenden")
+    p.add_argument("--rounds", type=positive_int, default=3, help="Runden pro Abend")
+    p.add_argument("--round-hours", type=float, default=1.0, help="Stunden zwischen zwei Runden")
+    p.add_argument("--jitter", type=float, default=1.5, help="Abendbeginn schwankt um ± so viele Stunden")
+    p.add_argument("--runs", type=positive_int, default=200, help="Saisons pro Strategie")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--workers", type=positive_int, help="Anzahl Prozesse (Standard: alle Kerne)")
+    p.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    p.add_argument("--output", metavar="DATEI", help="Ergebnisse zusätzlich als JSON speichern")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("serve", help="Sync-Server für mehrere Oberflächen starten (WERWOLF_SYNC=host:port)")
+    p.add_argument("--host", default="127.0.0.1", help="Adresse, z.B. 0.0.0.0 für alle Netzwerke")
+    p.add_argument("--port", type=int, help="TCP-Port (Standard: Standard-Port des Sync-Servers)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("export", help="Daten als JSON exportieren (Format von data.json)")
+    p.add_argument("output", nargs="?", default="-", help="Zieldatei, '-' für stdout")
+    p.set_defaults(func=cmd_export)
+    return parser
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(levelname)s: %(name)s: %(message)s")
+    configure_levels(args.log_levels)
+    start = time.perf_counter()
+    try:
+        result = args.func(args)
+    except argparse.ArgumentTypeError as e:
+        # Fehler in Argumenten, die erst der Befehl selbst auswertet (z.B. --present)
+        parser.error(str(e))
+    logger.debug(f"Befehl '{args.command}' in {(time.perf_counter() - start) * 1000:.1f} ms ausgeführt.")
+    return result
+#endregion MAIN
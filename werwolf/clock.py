@@ -0,0 +1,62 @@
+#region IMPORTS
+from datetime import datetime
+import heapq
+from uuid import UUID
+
+from werwolf.models import User, days_since, relative_time
+#endregion IMPORTS
+
+#region CLASSES
+class DisplayClock:
+    # Eine gemeinsame Uhr für alle Zeilen: Texte wie "vor 3 Std." und die Tage seit dem letzten Spiel
+    # werden gegen self.now berechnet und pro Spieler gecacht. Ein Heap merkt sich, wann sich welcher
+    # Text das nächste Mal ändert, damit tick() nur diese Spieler neu berechnen muss.
+    def __init__(self, now: datetime | None = None):
+        self.now: datetime = now or datetime.now()
+        self._labels: dict[UUID, tuple[datetime | None, str, int]] = {}
+        self._changes: list[tuple[datetime, UUID, datetime]] = []
+
+    def _compute(self, user_id: UUID, last_played: datetime | None) -> tuple[datetime | None, str, int]:
+        label, next_change = relative_time(last_played, self.now)
+        entry = (last_played, label, days_since(last_played, self.now))
+        self._labels[user_id] = entry
+        if next_change: heapq.heappush(self._changes, (next_change, user_id, last_played))
+        return entry
+
+    def _entry(self, user: User) -> tuple[datetime | None, str, int]:
+        entry = self._labels.get(user.id)
+        # Hat der Spieler seit dem Cachen gespielt, stimmt last_played nicht mehr -> neu berechnen
+        if entry is None or entry[0] != user.last_played: entry = self._compute(user.id, user.last_played)
+        return entry
+
+    def label(self, user: User) -> str:
+        return self._entry(user)[1]
+
+    def days(self, user: User) -> int:
+        return self._entry(user)[2]
+
+    def display_text(self, user: User) -> str:
+        return user.get_display_text(label=self.label(user))
+
+    def forget(self, user_id: UUID) -> None:
+        # Heap-Einträge bleiben liegen und werden in tick() als veraltet verworfen
+        self._labels.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._labels.clear()
+        self._changes.clear()
+
+    def next_change(self) -> datetime | None:
+        return self._changes[0][0] if self._changes else None
+
+    def tick(self, now: datetime | None = None) -> set[UUID]:
+        # Uhr vorstellen; liefert die IDs, deren Text sich dadurch geändert hat
+        self.now = now or datetime.now()
+        changed: set[UUID] = set()
+        while self._changes and self._changes[0][0] <= self.now:
+            _, user_id, last_played = heapq.heappop(self._changes)
+            entry = self._labels.get(user_id)
+            if entry is None or entry[0] != last_played: continue
+            if self._compute(user_id, last_played)[1] != entry[1]: changed.add(user_id)
+        return changed
+#endregion CLASSES
@@ -0,0 +1,157 @@
+#region IMPORTS
+from array import array
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from itertools import compress
+from uuid import UUID
+
+from werwolf.draw import WeightedSampler
+from werwolf.models import NEVER_DAYS, PlayerDisplay
+from werwolf.snapshot import FLAG_BLACKLISTED, NEVER, from_micros, to_micros
+from werwolf.storage import SqliteStorage
+#endregion IMPORTS
+
+#region COLUMNS
+DAY_US: int = 86_400_000_000
+
+class UserView(PlayerDisplay):
+    # Leichte Sicht auf eine Zeile von PlayerColumns mit der lesenden Schnittstelle von User (Attribute und Anzeigetexte).
+    # Hält nur Store und Zeilennummer; die Werte werden bei jedem Zugriff aus den Spalten gelesen.
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "PlayerColumns", row: int):
+        self.store = store
+        self.row = row
+
+    @property
+    def id(self) -> UUID:
+        return UUID(bytes=self.store.uuid_bytes(self.row))
+
+    @property
+    def first_name(self) -> str:
+        return self.store.names[self.store.first[self.row]]
+
+    @property
+    def last_name(self) -> str:
+        return self.store.names[self.store.last[self.row]]
+
+    @property
+    def last_played(self) -> datetime | None:
+        return from_micros(self.store.played[self.row])
+
+    @property
+    def total_games(self) -> int:
+        return self.store.games[self.row]
+
+    @property
+    def is_blacklisted(self) -> bool:
+        return bool(self.store.flags[self.row] & FLAG_BLACKLISTED)
+
+    def __repr__(self) -> str:
+        return f"UserView(row={self.row}, {self.first_name!r} {self.last_name!r})"
+
+class PlayerColumns:
+    # Spaltenweiser Schnappschuss des Spielerbestands für Auswertungen über sehr große Kader (stats,
+    # Benchmarks): pro Spieler nur ein paar Bytes in array-Spalten (UUID 16 Bytes, last_played in µs, Spiele,
+    # Flags, Namens-IDs) statt eines User-Objekts mit UUID, datetime und eigenem __dict__. Namen werden
+    # interniert. Einmal geladen, kommen keine Spieler hinzu oder weg und nichts wird zurückgespeichert;
+    # nur draw_rows schreibt Spielstände in den Spalten fort (Headless-Läufe, Benchmarks). Oberfläche,
+    # perform_draw und Sync arbeiten mit PlayerRegistry und User.
+    def __init__(self):
+        self._uuids = bytearray()
+        self.played = array("q")
+        self.games = array("I")
+        self.flags = array("B")
+        self.first = array("I")
+        self.last = array("I")
+        self.names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._ids: set[bytes] = set()
+
+    @classmethod
+    def from_storage(cls, storage: SqliteStorage) -> "PlayerColumns":
+        # Direkt aus den Datenbankzeilen, ohne Zwischenschritt über User-Objekte
+        store = cls()
+        for uid, first, last, played, games, blacklisted in storage.user_rows():
+            store._append(bytes.fromhex(uid.replace("-", "")), first, last,
+                          to_micros(datetime.fromisoformat(played)) if played else NEVER,
+                          games, FLAG_BLACKLISTED if blacklisted else 0)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.played)
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def _append(self, uid: bytes, first: str, last: str, played: int, games: int, flags: int) -> int:
+        if uid in self._ids: raise ValueError(f"User mit ID {UUID(bytes=uid)} existiert bereits.")
+        row = len(self.played)
+        self._uuids += uid
+        self.played.append(played)
+        self.games.append(games)
+        self.flags.append(flags)
+        self.first.append(self._intern(first))
+        self.last.append(self._intern(last))
+        self._ids.add(uid)
+        return row
+
+    def uuid_bytes(self, row: int) -> bytes:
+        return bytes(self._uuids[16 * row:16 * row + 16])
+
+    def view(self, row: int) -> UserView:
+        return UserView(self, row)
+
+    def active_rows(self, rows: Iterable[int] | None = None) -> list[int]:
+        # Ziehbare (nicht gesperrte) Zeilen, optional eingeschränkt auf rows (z.B. Anwesende)
+        flags = self.flags
+        if rows is None: return list(compress(range(len(flags)), (not f for f in flags)))
+        return [row for row in rows if not flags[row]]
+
+    def weights(self, rows: Sequence[int], now: datetime, np=None) -> Sequence[float]:
+        # default_weight über die Spalten: (ganze Tage seit letztem Spiel + 1)^2, ohne datetime pro Zeile
+        now_us = to_micros(now)
+        if np is not None:
+            played = self.as_numpy(np)["played"][np.asarray(rows, dtype=np.intp)]
+            never = played == NEVER
+            days = np.maximum(now_us - np.where(never, now_us, played), 0) // DAY_US
+            days[never] = NEVER_DAYS
+            return ((days + 1) ** 2).astype(np.float64)
+        played = self.played
+        out = array("d")
+        for row in rows:
+            us = played[row]
+            days = NEVER_DAYS if us == NEVER else max(0, (now_us - us) // DAY_US)
+            out.append(float((days + 1) ** 2))
+        return out
+
+    def record_games(self, rows: Iterable[int], now: datetime) -> None:
+        now_us = to_micros(now)
+        for row in rows:
+            self.played[row] = now_us
+            self.games[row] += 1
+
+    def as_numpy(self, np) -> dict:
+        # Spalten als NumPy-Arrays ohne Kopie (gleicher Speicher wie die array-Spalten)
+        return {
+            "played": np.frombuffer(self.played, dtype=np.int64),
+            "games": np.frombuffer(self.games, dtype=np.uint32),
+            "flags": np.frombuffer(self.flags, dtype=np.uint8),
+            "first": np.frombuffer(self.first, dtype=np.uint32),
+            "last": np.frombuffer(self.last, dtype=np.uint32),
+        }
+
+def draw_rows(store: PlayerColumns, rows: Sequence[int], count: int, sampler: WeightedSampler,
+              now: datetime | None = None) -> list[int]:
+    # Auslosung direkt auf den Spalten: gleiche Gewichtung und gleiche Sampler wie perform_draw,
+    # nur mit Zeilennummern statt User-Objekten. Spielstände werden in den Spalten fortgeschrieben.
+    now = now or datetime.now()
+    weights = store.weights(rows, now, sampler.np)
+    picks = sampler.sample(rows, count, weights=weights)
+    store.record_games(picks, now)
+    return picks
+#endregion COLUMNS
@@ -0,0 +1,199 @@
+#region IMPORTS
+from collections.abc import Callable, Sequence
+from dataclasses import replace
+from datetime import datetime
+import heapq
+import logging
+import math
+import random
+from typing import TYPE_CHECKING
+
+from werwolf.history import DrawHistory, HistoryEntry
+from werwolf.log import get_logger
+from werwolf.models import User, days_since
+from werwolf.registry import PlayerRegistry
+
+if TYPE_CHECKING:
+    from werwolf.storage import SqliteStorage
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("draw")
+
+#region DRAW_ENGINE
+WeightFn = Callable[[User, datetime], float]
+DaysFn = Callable[[User], int] # z.B. DisplayClock.days: schon berechnete Tage seit dem letzten Spiel
+WEIGHT_LOG_LIMIT: int = 50 # max. Zeilen der Gewichtungstabelle im Debug-Log
+
+def load_numpy(feature: str):
+    # NumPy ist optional und wird erst beim ersten Gebrauch importiert (Startzeit)
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError(f"{feature} benötigt das Paket numpy (Extra 'sim': pip install .[sim] bzw. uv sync --extra sim).") from None
+    return numpy
+
+def weight_for_days(days: int) -> float:
+    return float(pow(days + 1, 2))
+
+def default_weight(user: User, now: datetime) -> float:
+    # Bisherige Gewichtung: (Tage seit letztem Spiel + 1)^2, "nie gespielt" zählt als 999 Tage
+    return weight_for_days(days_since(user.last_played, now))
+
+class FenwickTree:
+    # Binärer Indexbaum über Gewichte: Präfixsummen, Updates und Suche in O(log n)
+    def __init__(self, weights: Sequence[float]):
+        self.size = len(weights)
+        self.tree = [0.0] * (self.size + 1)
+        for i, w in enumerate(weights, 1):
+            self.tree[i] += w
+            parent = i + (i & -i)
+            if parent <= self.size: self.tree[parent] += self.tree[i]
+        self.step = 1 << self.size.bit_length() if self.size else 0
+
+    def add(self, index: int, delta: float) -> None:
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        result = 0.0
+        i = self.size
+        while i > 0:
+            result += self.tree[i]
+            i -= i & -i
+        return result
+
+    def find(self, target: float) -> int:
+        # Kleinster Index, dessen Präfixsumme target übersteigt
+        pos = 0
+        step = self.step
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return min(pos, self.size - 1)
+
+def _nearest_positive(remaining: Sequence[float], idx: int) -> int:
+    # Nur bei Rundung am Ende der Präfixsummen: der nächste noch ziehbare Index links, sonst rechts davon
+    for i in range(idx, -1, -1):
+        if remaining[i] > 0: return i
+    return next(i for i in range(idx, len(remaining)) if remaining[i] > 0)
+
+class WeightedSampler:
+    # Gewichtetes Ziehen ohne Zurücklegen. Methoden:
+    #   "fenwick" - sequentielles Ziehen über FenwickTree, O(n + k log n)
+    #   "keys"    - Efraimidis-Spirakis Schlüssel log(u)/w, O(n log k)
+    #   "numpy"   - wie "keys", aber vektorisiert (benötigt NumPy)
+    METHODS: tuple[str, ...] = ("fenwick", "keys", "numpy")
+
+    def __init__(self, weight_fn: WeightFn = default_weight, seed: int | None = None, method: str = "fenwick"):
+        if method not in self.METHODS:
+            raise ValueError(f"Unbekannte Zieh-Methode: {method}")
+        self.np = load_numpy("Zieh-Methode 'numpy'") if method == "numpy" else None
+        self.weight_fn = weight_fn
+        self.method = method
+        self.reseed(seed)
+
+    def reseed(self, seed: int | None) -> None:
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.np_rng = self.np.random.default_rng(seed) if self.np is not None else None
+
+    def weigh(self, pool: Sequence[User], now: datetime | None = None, days: DaysFn | None = None) -> list[float]:
+        # Mit days nimmt die Standardgewichtung die Tage aus der Listenanzeige (DisplayClock) statt sie pro
+        # Spieler neu zu berechnen; eigene weight_fn bekommen weiterhin (User, now)
+        if days is not None and self.weight_fn is default_weight: return [weight_for_days(days(u)) for u in pool]
+        now = now or datetime.now()
+        return [self.weight_fn(u, now) for u in pool]
+
+    def sample(self, pool: Sequence[User], k: int, now: datetime | None = None,
+               weights: Sequence[float] | None = None) -> list[User]:
+        if weights is None: weights = self.weigh(pool, now)
+        k = min(k, len(pool))
+        if k <= 0: return []
+
+        if self.method == "numpy": picks = self._sample_numpy(weights, k)
+        elif self.method == "keys": picks = self._sample_keys(weights, k)
+        else: picks = self._sample_fenwick(weights, k)
+        return [pool[i] for i in picks]
+
+    def _sample_fenwick(self, weights: Sequence[float], k: int) -> list[int]:
+        # Wie bei "keys"/"numpy" kommen nur positive Gewichte in Frage, gezogen wird höchstens so oft, wie es
+        # davon gibt. Die Summe kommt jedes Mal aus dem Baum statt aus einer mitgezählten (driftenden) Variablen.
+        valid = [i for i, w in enumerate(weights) if w > 0]
+        remaining = [weights[i] for i in valid]
+        tree = FenwickTree(remaining)
+        picks = []
+        for _ in range(min(k, len(valid))):
+            idx = tree.find(self.rng.random() * tree.total())
+            if remaining[idx] <= 0:
+                # Rundungsreste in den Teilsummen: Baum aus den Restgewichten neu aufbauen und nochmal ziehen
+                tree = FenwickTree(remaining)
+                idx = tree.find(self.rng.random() * tree.total())
+                if remaining[idx] <= 0: idx = _nearest_positive(remaining, idx)
+            picks.append(valid[idx])
+            tree.add(idx, -remaining[idx])
+            remaining[idx] = 0.0
+        return picks
+
+    def _sample_keys(self, weights: Sequence[float], k: int) -> list[int]:
+        rnd = self.rng.random
+        keys = ((math.log(1.0 - rnd()) / w, i) for i, w in enumerate(weights) if w > 0)
+        return [i for _, i in heapq.nlargest(k, keys)]
+
+    def _sample_numpy(self, weights: Sequence[float], k: int) -> list[int]:
+        np = self.np
+        w = np.asarray(weights, dtype=np.float64)
+        valid = np.flatnonzero(w > 0)
+        k = min(k, valid.size)
+        if k == 0: return []
+        keys = np.log(1.0 - self.np_rng.random(valid.size)) / w[valid]
+        top = np.argpartition(-keys, k - 1)[:k]
+        top = top[np.argsort(-keys[top])]
+        return valid[top].tolist()
+
+def _weight_table(candidates: Sequence[User], weights: Sequence[float], now: datetime) -> str:
+    ranked = sorted(zip(weights, range(len(candidates))), reverse=True)
+    lines = [f"Candidate: {candidates[i].first_name:10} | Last: {candidates[i].get_time_diff_str(now):15} | Weight: {w}"
+             for w, i in ranked[:WEIGHT_LOG_LIMIT]]
+    if len(ranked) > WEIGHT_LOG_LIMIT:
+        lines.append(f"... {len(ranked) - WEIGHT_LOG_LIMIT} weitere Kandidaten")
+    lines.append(f"Kandidaten: {len(ranked)} | Summe: {sum(weights)} | Min: {ranked[-1][0] if ranked else 0} | Max: {ranked[0][0] if ranked else 0}")
+    return "\n".join(lines)
+
+def perform_draw(registry: PlayerRegistry, candidates: Sequence[User], count: int, sampler: WeightedSampler,
+                 history: DrawHistory, storage: "SqliteStorage | None" = None,
+                 now: datetime | None = None, days: DaysFn | None = None) -> list[User]:
+    # Eine komplette Auslosung: ziehen, Spielstände fortschreiben, Historie ergänzen, speichern.
+    # days muss zu now passen (DisplayClock.days nach clock.tick(), now = clock.now)
+    if count < 1: raise ValueError(f"Anzahl muss mindestens 1 sein, nicht {count}.")
+    now = now or datetime.now()
+    weights = sampler.weigh(candidates, now, days)
+
+    # Logging der Gewichtung: eine zusammengefasste Meldung, nur gebaut wenn DEBUG aktiv ist
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("--- Gewichtungs-Berechnung ---\n%s", _weight_table(candidates, weights, now))
+
+    winners = sampler.sample(candidates, count, weights=weights)
+    updated_winners = record_draw(registry, winners, history, storage, now)
+    logger.info("Auslosung beendet. Gewinner (in Zugreihenfolge): %s", [f"{u.first_name} {u.last_name}" for u in updated_winners])
+    return updated_winners
+
+def record_draw(registry: PlayerRegistry, winners: Sequence[User], history: DrawHistory,
+                storage: "SqliteStorage | None", now: datetime, tables: tuple[int, ...] = ()) -> list[User]:
+    # Spielstände fortschreiben und die Runde als ein Historien-Eintrag ablegen (tables siehe HistoryEntry)
+    updated_winners = []
+    for user in winners:
+        updated = replace(user, last_played=now, total_games=user.total_games + 1)
+        registry.update(updated)
+        updated_winners.append(updated)
+
+    entry = HistoryEntry(now, tuple(u.id for u in updated_winners),
+                         tuple(f"{u.first_name} {u.last_name}" for u in updated_winners), tables)
+    history.append(entry)
+    if storage is not None: storage.record_draw(updated_winners, entry)
+    return updated_winners
+#endregion DRAW_ENGINE
@@ -0,0 +1,933 @@
+#region IMPORTS
+import atexit
+from collections.abc import Callable, Iterable
+from dataclasses import replace
+from datetime import datetime
+import io
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from uuid import UUID, uuid4
+from tkinter import filedialog, messagebox
+
+import customtkinter as ctk
+
+from werwolf import APP_NAME, APP_VERSION
+from werwolf.autosave import AUTOSAVE_FILE, Autosaver, SessionState, read_session
+from werwolf.draw import WeightedSampler, perform_draw
+from werwolf.history import DrawHistory
+from werwolf.importer import ImportProgress, NameRow, RegistrySink, StreamingImporter, iter_import_file, iter_text_rows
+from werwolf.listing import ListModel, ListRow
+from werwolf.log import get_logger, setup_logging
+from werwolf.metrics import METRICS
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+from werwolf.snapshot import SNAPSHOT_FILE, db_stamp, read_snapshot, write_snapshot
+from werwolf.storage import DATA_FILE, DB_FILE, SqliteStorage
+from werwolf.sync import (SYNC_ENV, Change, SyncClient, apply_message, blacklist_change, clear_change, delete_change,
+                          draw_change, parse_address, pause_change, presence_change, user_change)
+from werwolf.tournament import TablePlanner, perform_tournament
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("ui")
+
+#region GLOBALS
+ROSTER: PlayerRegistry = PlayerRegistry()
+HISTORY: DrawHistory = DrawHistory()
+STORAGE: SqliteStorage | None = None
+PLANNER: TablePlanner = TablePlanner() # Prozess-Pool startet erst beim ersten großen Turnier
+AUTOSAVER: Autosaver = Autosaver() # Schreib-Thread startet, sobald die Daten geladen sind
+#endregion GLOBALS
+
+#region SCHEDULER
+class UpdateScheduler:
+    # Sammelt geänderte Spieler-IDs und führt pro Idle-Zyklus höchstens ein Listen-Update aus.
+    # mark_all() erzwingt einen kompletten Neuaufbau (Suche, Import, Laden).
+    def __init__(self, widget: ctk.CTk, apply: Callable[[set[UUID], bool], None]):
+        self.widget = widget
+        self.apply = apply
+        self.dirty: set[UUID] = set()
+        self.full: bool = False
+        self.pending: str | None = None
+
+    def mark(self, *user_ids: UUID) -> None:
+        self.dirty.update(user_ids)
+        self._schedule()
+
+    def mark_all(self) -> None:
+        self.full = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self.pending is None:
+            self.pending = self.widget.after_idle(self.flush)
+
+    def flush(self) -> None:
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+        dirty, full = self.dirty, self.full
+        self.dirty, self.full = set(), False
+        if dirty or full: self.apply(dirty, full)
+#endregion SCHEDULER
+
+#region WIDGETS
+class VirtualList(ctk.CTkFrame):
+    # Feste Anzahl Button-Zeilen (passend zur Fensterhöhe), die beim Scrollen
+    # nur neu beschriftet werden. Kosten hängen von der Höhe ab, nicht von der Anzahl Spieler.
+    BUTTON_HEIGHT: int = 28
+    ROW_PADY: int = 2
+
+    def __init__(self, parent, on_click, on_right_click, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.on_click = on_click
+        self.on_right_click = on_right_click
+        self.rows: list[ListRow] = []
+        self.offset: int = 0
+        self.pool: list[ctk.CTkButton] = []
+        self.bound: list[ListRow | None] = []
+        self.default_text_color = ctk.ThemeManager.theme["CTkButton"]["text_color"]
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 3), pady=3)
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", expand=True, fill="both")
+        self.viewport.pack_propagate(False)
+        self.viewport.bind("<Configure>", lambda e: self._resize_pool(e.height))
+        self._bind_wheel(self.viewport)
+
+    def _bind_wheel(self, widget) -> None:
+        widget.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll_by(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll_by(1))
+
+    def _resize_pool(self, height: int) -> None:
+        needed = max(1, height // self._row_height() + 1)
+        if needed == len(self.pool): return
+        logger.debug(f"VirtualList Pool: {len(self.pool)} -> {needed} Zeilen")
+
+        METRICS.count("ui.widgets_created", max(0, needed - len(self.pool)))
+        METRICS.count("ui.widgets_destroyed", max(0, len(self.pool) - needed))
+        while len(self.pool) < needed:
+            slot = len(self.pool)
+            btn = ctk.CTkButton(self.viewport, text="", anchor="w", height=self.BUTTON_HEIGHT,
+                                command=lambda i=slot: self._on_slot_click(i))
+            btn.bind("<Button-3>", lambda event, i=slot: self._on_slot_right_click(i))
+            self._bind_wheel(btn)
+            self.pool.append(btn)
+            self.bound.append(None)
+        while len(self.pool) > needed:
+            self.pool.pop().destroy()
+            self.bound.pop()
+        self._render()
+
+    def set_rows(self, rows: list[ListRow]) -> None:
+        self.rows = rows
+        self._render()
+
+    def scroll_by(self, delta: int) -> None:
+        self.offset += delta
+        self._render()
+
+    def _on_scrollbar(self, action: str, value, unit: str | None = None) -> None:
+        if action == "moveto":
+            self.offset = round(float(value) * len(self.rows))
+        else:
+            # "scroll": value Schritte in unit ("units" = eine Zeile, "pages" = eine Fensterhöhe)
+            self.offset += int(value) * (self._visible_rows() if unit == "pages" else 1)
+        self._render()
+
+    def _visible_rows(self) -> int:
+        return max(1, self.viewport.winfo_height() // self._row_height())
+
+    def _row_height(self) -> int:
+        # In echten Pixeln wie winfo_height(): Buttonhöhe und pack-Abstand skaliert CTk mit der
+        # Anzeigeskalierung (125 %, 150 % ...), feste Pixelwerte würden dann zu viele Zeilen annehmen
+        button = self.pool[0].winfo_reqheight() if self.pool else self._apply_widget_scaling(self.BUTTON_HEIGHT)
+        return max(1, button + 2 * self._apply_widget_scaling(self.ROW_PADY))
+
+    def _render(self) -> None:
+        visible = self._visible_rows()
+        self.offset = max(0, min(self.offset, len(self.rows) - visible))
+
+        configured = 0
+        for slot, btn in enumerate(self.pool):
+            idx = self.offset + slot
+            row = self.rows[idx] if idx < len(self.rows) else None
+            if row == self.bound[slot]: continue
+            self.bound[slot] = row
+
+            if row is None:
+                btn.pack_forget()
+                continue
+            btn.configure(text=row.text, fg_color=row.fg_color, text_color=row.text_color or self.default_text_color)
+            configured += 1
+            if not btn.winfo_manager():
+                btn.pack(fill="x", pady=self.ROW_PADY, padx=5)
+        METRICS.count("ui.rows_configured", configured)
+
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), min(1.0, (self.offset + visible) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_slot_click(self, slot: int) -> None:
+        row = self.bound[slot]
+        if row: self.on_click(row.user)
+
+    def _on_slot_right_click(self, slot: int) -> None:
+        row = self.bound[slot]
+        if row: self.on_right_click(row.user)
+#endregion WIDGETS
+
+#region WINDOWS
+class BulkImportWindow(ctk.CTkToplevel):
+    POLL_MS: int = 50
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        logger.debug("Initialisiere BulkImportWindow")
+        self.parent = parent
+        self.title("Bulk Import")
+        self.geometry("400x560")
+        self.attributes("-topmost", True)
+        self.importer: StreamingImporter | None = None
+        self.import_started: float = 0.0
+        self.sink = RegistrySink(ROSTER, STORAGE)
+        self.added_count = 0
+
+        ctk.CTkLabel(self, text="Namen zeilenweise einfügen:", font=("Arial", 16, "bold")).pack(pady=10)
+        self.txt_input = ctk.CTkTextbox(self, width=350, height=300)
+        self.txt_input.pack(padx=20, pady=10)
+
+        self.lbl_progress = ctk.CTkLabel(self, text="")
+        self.lbl_progress.pack(pady=2)
+        self.progress_bar = ctk.CTkProgressBar(self, mode="indeterminate")
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(fill="x", pady=10)
+
+        self.btn_import = ctk.CTkButton(btn_frame, text="Importieren", fg_color="#2ecc71", command=self.do_import)
+        self.btn_import.pack(side="right", padx=20)
+        self.btn_file = ctk.CTkButton(btn_frame, text="Aus Datei...", fg_color="#27ae60", command=self.import_file)
+        self.btn_file.pack(side="right", padx=5)
+        ctk.CTkButton(btn_frame, text="Abbrechen", fg_color="#e74c3c", command=self.cancel).pack(side="right", padx=5)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+    def cancel(self) -> None:
+        if self.importer is not None:
+            # Worker anhalten; was schon übernommen wurde, steht in ROSTER/data.db und muss in die Listen
+            self.importer.cancel()
+            logger.info(f"Bulk Import abgebrochen. {self.added_count} User wurden bereits hinzugefügt.")
+            self.parent.refresh_lists()
+        self.destroy()
+
+    def do_import(self):
+        raw_text = self.txt_input.get("1.0", "end-1c")
+        logger.info("Bulk Import aus Textfeld gestartet.")
+        self._start(iter_text_rows(io.StringIO(raw_text)))
+
+    def import_file(self):
+        path = filedialog.askopenfilename(parent=self, title="Spielerliste importieren",
+                                          filetypes=[("CSV / Text", "*.csv *.txt"), ("Alle Dateien", "*.*")])
+        if not path: return
+        logger.info(f"Bulk Import aus Datei gestartet: {path}")
+        self._start(iter_import_file(path))
+
+    def _start(self, rows: Iterable[NameRow]) -> None:
+        if self.importer is not None: return
+        self.importer = StreamingImporter(rows, self.sink.existing_keys())
+        self.import_started = time.perf_counter()
+        self.btn_import.configure(state="disabled")
+        self.btn_file.configure(state="disabled")
+        self.progress_bar.pack(fill="x", padx=20, pady=2, before=self.lbl_progress)
+        self.progress_bar.start()
+        self.importer.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        if not self.winfo_exists(): return
+        for batch, progress in self.importer.drain():
+            with METRICS.timer("import.batch"):
+                fresh = self.sink.apply(batch)
+            METRICS.count("import.added", len(fresh))
+            self.added_count += len(fresh)
+            self.parent.publish(*(user_change(u) for u in fresh))
+            skipped = progress.read - self.added_count if progress.done else progress.skipped
+            self.lbl_progress.configure(text=f"{progress.read} gelesen | {self.added_count} neu | {skipped} Duplikate")
+            if progress.done:
+                self._finish(progress, skipped)
+                return
+        self.after(self.POLL_MS, self._poll)
+
+    def _finish(self, progress: ImportProgress, skipped: int) -> None:
+        self.progress_bar.stop()
+        METRICS.record("import.total", time.perf_counter() - self.import_started)
+        logger.info(f"Bulk Import abgeschlossen. {progress.read} Zeilen, {self.added_count} User hinzugefügt, {skipped} Duplikate übersprungen.")
+        self.parent.refresh_lists()
+        if progress.error:
+            messagebox.showerror("Fehler", f"Import abgebrochen: {progress.error}\n{self.added_count} Spieler wurden bereits hinzugefügt.")
+        else:
+            messagebox.showinfo("Erfolg", f"{self.added_count} neue Spieler hinzugefügt.")
+        self.destroy()
+
+class HistoryWindow(ctk.CTkToplevel):
+    # Rendert die Historie seitenweise (neueste zuerst) und lädt beim Scrollen nach,
+    # damit das Öffnen nicht von der Anzahl gespeicherter Runden abhängt.
+    PAGE_SIZE: int = 25
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        logger.debug("Öffne HistoryWindow")
+        self.title("Vergangene Runden")
+        self.geometry("500x600")
+        self.attributes("-topmost", True)
+        self.loaded = 0
+        self.loading = False
+
+        ctk.CTkLabel(self, text=f"Historie der Ziehungen ({len(HISTORY)})", font=("Arial", 20, "bold")).pack(pady=15)
+        
+        self.container = ctk.CTkScrollableFrame(self)
+        self.container.pack(expand=True, fill="both", padx=20, pady=10)
+
+        if not HISTORY:
+            logger.info("Historie ist leer.")
+            ctk.CTkLabel(self.container, text="Noch keine Spiele aufgezeichnet.").pack(pady=20)
+            return
+
+        self.btn_more = ctk.CTkButton(self.container, text="Ältere Runden laden", fg_color="#34495e", command=self.load_page)
+        self._hook_scroll()
+        self.load_page()
+
+    def _hook_scroll(self) -> None:
+        # Nächste Seite nachladen, sobald das Ende der Liste in Sicht kommt
+        canvas = getattr(self.container, "_parent_canvas", None)
+        scrollbar = getattr(self.container, "_scrollbar", None)
+        if canvas is None or scrollbar is None: return
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 0.98 and self.loaded < len(HISTORY) and not self.loading:
+                self.loading = True
+                self.after_idle(self.load_page)
+        canvas.configure(yscrollcommand=on_scroll)
+
+    def load_page(self) -> None:
+        entries = HISTORY.newest(self.loaded, self.PAGE_SIZE)
+        self.btn_more.pack_forget()
+        for entry in entries:
+            frame = ctk.CTkFrame(self.container)
+            frame.pack(fill="x", pady=10, padx=5)
+            
+            time_str = entry.timestamp.strftime("%d.%m.%Y %H:%M")
+            ctk.CTkLabel(frame, text=f"Runde am {time_str}", font=("Arial", 12, "bold"), text_color="#3498db").pack(pady=2, padx=10, anchor="w")
+            
+            if entry.tables:
+                names = "\n".join(f"Tisch {i}: {', '.join(players)}" for i, (_, players) in enumerate(entry.groups(), 1))
+            else:
+                names = ", ".join(entry.players)
+            lbl_names = ctk.CTkLabel(frame, text=names, font=("Arial", 11), wraplength=400, justify="left")
+            lbl_names.pack(pady=5, padx=10, anchor="w")
+
+        self.loaded += len(entries)
+        self.loading = False
+        logger.debug(f"Historie: {self.loaded}/{len(HISTORY)} Runden angezeigt.")
+        if self.loaded < len(HISTORY): self.btn_more.pack(pady=10)
+
+class ResultWindow(ctk.CTkToplevel):
+    def __init__(self, parent, winners: list[User], tables: list[list[User]] | None = None):
+        super().__init__(parent)
+        logger.info(f"ResultWindow erstellt für {len(winners)} Gewinner.")
+        self.title("Die Auserwählten")
+        self.geometry("400x600")
+        self.attributes("-topmost", True)
+        
+        ctk.CTkLabel(self, text="Auslosung abgeschlossen", font=("Arial", 20, "bold"), text_color="#2ecc71").pack(pady=15)
+        
+        scroll = ctk.CTkScrollableFrame(self)
+        scroll.pack(expand=True, fill="both", padx=20, pady=10)
+
+        for t, table in enumerate(tables or [winners], 1):
+            if tables:
+                ctk.CTkLabel(scroll, text=f"Tisch {t}", font=("Arial", 16, "bold"), text_color="#e67e22").pack(anchor="w", padx=5, pady=(10, 2))
+            for i, user in enumerate(table, 1):
+                f = ctk.CTkFrame(scroll)
+                f.pack(fill="x", pady=3)
+                ctk.CTkLabel(f, text=f"{i}. {user.first_name} {user.last_name}", font=("Arial", 14)).pack(side="left", padx=10, pady=5)
+
+class DiagnosticsWindow(ctk.CTkToplevel):
+    # Versteckt hinter F12: zeigt die laufenden Messwerte (Perzentile der letzten Messungen je Timer)
+    # und exportiert sie als JSON, z.B. um sie einem Bugreport anzuhängen.
+    REFRESH_MS: int = 1000
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        logger.debug("Öffne DiagnosticsWindow")
+        self.title("Diagnose")
+        self.geometry("720x520")
+        self.attributes("-topmost", True)
+
+        self.lbl_status = ctk.CTkLabel(self, text="", font=("Arial", 14, "bold"))
+        self.lbl_status.pack(pady=10)
+        self.txt_stats = ctk.CTkTextbox(self, font=("Courier", 12), wrap="none")
+        self.txt_stats.pack(expand=True, fill="both", padx=15, pady=5)
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(fill="x", pady=10)
+        self.btn_toggle = ctk.CTkButton(btn_frame, text="", command=self.toggle)
+        self.btn_toggle.pack(side="left", padx=15)
+        ctk.CTkButton(btn_frame, text="Zurücksetzen", fg_color="#c0392b", command=self.reset).pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="Als JSON exportieren", fg_color="#27ae60", command=self.export).pack(side="right", padx=15)
+        self.refresh()
+
+    def refresh(self) -> None:
+        if not self.winfo_exists(): return
+        state = "aktiv" if METRICS.enabled else "aus"
+        self.lbl_status.configure(text=f"Messung {state} (seit {METRICS.started:%H:%M:%S})")
+        self.btn_toggle.configure(text="Messung ausschalten" if METRICS.enabled else "Messung einschalten")
+        self.txt_stats.configure(state="normal")
+        self.txt_stats.delete("1.0", "end")
+        self.txt_stats.insert("1.0", METRICS.summary())
+        self.txt_stats.configure(state="disabled")
+        self.after(self.REFRESH_MS, self.refresh)
+
+    def toggle(self) -> None:
+        METRICS.enable(not METRICS.enabled)
+
+    def reset(self) -> None:
+        METRICS.reset()
+
+    def export(self) -> None:
+        path = filedialog.asksaveasfilename(parent=self, title="Messwerte exportieren", defaultextension=".json",
+                                            initialfile=f"werwolf_metrics--{datetime.now():%d.%m.%YT%H-%M-%S}.json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path: return
+        try:
+            METRICS.export(path, app=APP_NAME, version=APP_VERSION, players=len(ROSTER), history=len(HISTORY))
+        except OSError as e:
+            logger.error(f"Export der Messwerte nach {path} fehlgeschlagen: {e}")
+            messagebox.showerror("Fehler", f"Export fehlgeschlagen: {e}", parent=self)
+#endregion WINDOWS
+
+#region MAIN_APP
+class MainApp(ctk.CTk):
+    SEARCH_DEBOUNCE_MS: int = 150
+    SYNC_POLL_MS: int = 50
+    CLOCK_TICK_MS: int = 60_000 # spätestens jede Minute prüfen, ob ein Zeittext wechselt
+    LOAD_POLL_MS: int = 20
+    AUTOSAVE_DELAY_MS: int = 5000 # Änderungen so lange sammeln, bevor eine Kopie ans Autosave geht
+
+    def __init__(self, started: float | None = None) -> None:
+        logger.info(f"Starte {APP_NAME} v{APP_VERSION}...")
+        self.started = started or time.perf_counter()
+        super().__init__()
+        self.title(f"{APP_NAME} v{APP_VERSION}")
+        self.geometry("1200x850")
+
+        self.present_user_ids: set[UUID] = set()
+        self.paused_user_ids: set[UUID] = set()
+        self.session_games: dict[UUID, int] = {}
+        self.sampler = WeightedSampler()
+        self.list_model = ListModel(ROSTER)
+        self.updates = UpdateScheduler(self, self._apply_updates)
+        self.search_job: str | None = None
+        self.last_query: str = ""
+        self.clock_job: str | None = None
+        self.sync: SyncClient | None = None
+        self.diagnostics: DiagnosticsWindow | None = None
+        self.autosave_job: str | None = None
+        self.ready: bool = False
+        self.load_queue: queue.SimpleQueue[tuple] = queue.SimpleQueue()
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        # UI Komponenten
+        self._setup_ui()
+        self.bind("<F12>", lambda e: self.open_diagnostics())
+        
+        # Daten laden: im Hintergrund, das Fenster erscheint sofort mit Platzhalter
+        self.after_idle(lambda: logger.info(f"Erster Frame nach {self._elapsed_ms():.0f} ms."))
+        threading.Thread(target=self._load_worker, name="DataLoader", daemon=True).start()
+        self.after(self.LOAD_POLL_MS, self._poll_load)
+        self._schedule_clock_tick()
+
+    def _setup_ui(self):
+        logger.debug("Baue Haupt-UI auf...")
+        # Header
+        self.lbl_title = ctk.CTkLabel(self, text="Werwolf Spielermanagement Deluxe", font=("Arial", 28, "bold"))
+        self.lbl_title.grid(row=0, column=0, columnspan=2, pady=20)
+
+        # Linke Spalte
+        self.frame_left = ctk.CTkFrame(self)
+        self.frame_left.grid(row=1, column=0, padx=15, pady=10, sticky="nsew")
+        
+        header_left = ctk.CTkFrame(self.frame_left, fg_color="transparent")
+        header_left.pack(fill="x", pady=5)
+        
+        self.lbl_present_count = ctk.CTkLabel(header_left, text="Anwesend (0)", font=("Arial", 18, "bold"), text_color="#e67e22")
+        self.lbl_present_count.pack(side="left", padx=10)
+        
+        ctk.CTkButton(header_left, text="Alle Leeren", fg_color="#c0392b", 
+                     command=self.clear_presence).pack(side="right", padx=10)
+
+        self.listbox_present = VirtualList(self.frame_left, self.toggle_presence, self.show_context_menu, fg_color="#2c3e50")
+        self.listbox_present.pack(expand=True, fill="both", padx=10, pady=5)
+
+        # Rechte Spalte
+        self.frame_right = ctk.CTkFrame(self)
+        self.frame_right.grid(row=1, column=1, padx=15, pady=10, sticky="nsew")
+        
+        search_frame = ctk.CTkFrame(self.frame_right, fg_color="transparent")
+        search_frame.pack(fill="x", pady=5, padx=10)
+        ctk.CTkLabel(search_frame, text="Suche:").pack(side="left", padx=5)
+        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="Name tippen...")
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.search_entry.bind("<KeyRelease>", lambda e: self._on_search_key())
+
+        self.listbox_all = VirtualList(self.frame_right, self.toggle_presence, self.show_context_menu)
+        self.listbox_all.pack(expand=True, fill="both", padx=10, pady=5)
+        self.lbl_loading = ctk.CTkLabel(self.frame_right, text="Lade Spieler...", font=("Arial", 16), text_color="gray")
+        self.lbl_loading.place(relx=0.5, rely=0.5, anchor="center")
+
+        # Bottom Bar
+        self.control_frame = ctk.CTkFrame(self)
+        self.control_frame.grid(row=2, column=0, columnspan=2, sticky="ew", padx=15, pady=15)
+
+        self.btn_addUser = ctk.CTkButton(self.control_frame, text="+ Neuer Spieler", command=self.add_user_popup, fg_color="#2ecc71")
+        self.btn_addUser.pack(side="left", padx=5)
+        
+        self.btn_bulkAdd = ctk.CTkButton(self.control_frame, text="Bulk Import", command=lambda: BulkImportWindow(self), fg_color="#27ae60")
+        self.btn_bulkAdd.pack(side="left", padx=5)
+
+        self.btn_history = ctk.CTkButton(self.control_frame, text="Historie", command=lambda: HistoryWindow(self), fg_color="#34495e")
+        self.btn_history.pack(side="left", padx=5)
+
+        self.btn_draw = ctk.CTkButton(self.control_frame, text="JETZT LOSEN", command=self.draw_from_present, fg_color="#e67e22", height=45, font=("Arial", 16, "bold"))
+        self.btn_draw.pack(side="right", padx=10)
+
+        self.draw_count_entry = ctk.CTkEntry(self.control_frame, width=60, font=("Arial", 14, "bold"))
+        self.draw_count_entry.insert(0, "12")
+        self.draw_count_entry.pack(side="right", padx=5)
+
+        # Turniermodus: mehrere Tische à draw_count_entry Spieler auf einmal
+        self.btn_tournament = ctk.CTkButton(self.control_frame, text="TISCHE LOSEN", command=self.draw_tables, fg_color="#8e44ad", height=45, font=("Arial", 14, "bold"))
+        self.btn_tournament.pack(side="right", padx=10)
+
+        self.table_count_entry = ctk.CTkEntry(self.control_frame, width=50, font=("Arial", 14, "bold"))
+        self.table_count_entry.insert(0, "2")
+        self.table_count_entry.pack(side="right", padx=5)
+        ctk.CTkLabel(self.control_frame, text="Tische:").pack(side="right")
+
+        # Brauchen Datenbank bzw. Historie und werden erst nach dem Laden freigegeben
+        self.data_buttons = [self.btn_addUser, self.btn_bulkAdd, self.btn_history, self.btn_draw, self.btn_tournament]
+        for btn in self.data_buttons: btn.configure(state="disabled")
+
+    def open_diagnostics(self) -> None:
+        if self.diagnostics is not None and self.diagnostics.winfo_exists():
+            self.diagnostics.focus()
+            return
+        self.diagnostics = DiagnosticsWindow(self)
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def _connect_sync(self) -> None:
+        # Optional: mit einem Sync-Server (python -m werwolf serve) abgleichen, wenn WERWOLF_SYNC gesetzt ist
+        address = os.environ.get(SYNC_ENV)
+        if not address: return
+        host, port = parse_address(address)
+        logger.info(f"Verbinde mit Sync-Server {host}:{port}...")
+        self.sync = SyncClient(host, port)
+        self.sync.start()
+        self.after(self.SYNC_POLL_MS, self._poll_sync)
+
+    def publish(self, *changes: Change) -> None:
+        # Jede lokale Änderung läuft hier durch: fürs Autosave vormerken und ggf. an den Sync-Server
+        if not changes: return
+        self._schedule_autosave()
+        if self.sync is not None: self.sync.send(*changes)
+
+    def _schedule_autosave(self) -> None:
+        if not self.ready or self.autosave_job is not None: return
+        self.autosave_job = self.after(self.AUTOSAVE_DELAY_MS, self._autosave)
+
+    def _autosave(self) -> None:
+        # Nur die Kopie entsteht im Tk-Thread; Serialisieren und Schreiben übernimmt AUTOSAVER
+        self.autosave_job = None
+        AUTOSAVER.submit(SessionState.capture(ROSTER.values(), HISTORY, self.present_user_ids, self.paused_user_ids, self.session_games))
+
+    def _restore_session(self, session: tuple[set[UUID], set[UUID], dict[UUID, int]] | None) -> None:
+        # Nach einem Absturz: Anwesenheit und Spiele des Abends aus dem Autosave übernehmen
+        if session is None: return
+        present, paused, games = session
+        self.present_user_ids.update(uid for uid in present if (u := ROSTER.get(uid)) is not None and not u.is_blacklisted)
+        self.paused_user_ids.update(paused & self.present_user_ids)
+        self.session_games.update((uid, n) for uid, n in games.items() if uid in ROSTER)
+        logger.warning(f"Sitzung aus {AUTOSAVE_FILE} wiederhergestellt: {len(self.present_user_ids)} anwesend, "
+                       f"{len(self.paused_user_ids)} pausiert.")
+        self.updates.mark_all()
+
+    def _poll_sync(self) -> None:
+        while not self.sync.inbox.empty():
+            message = self.sync.inbox.get()
+            if message["type"] == "status":
+                state = "verbunden" if message["connected"] else "getrennt"
+                logger.info(f"Sync-Server {state}.")
+                self.title(f"{APP_NAME} v{APP_VERSION}" + ("" if message["connected"] else " (offline)"))
+                continue
+            dirty, full = apply_message(self.sync, message, ROSTER, self.present_user_ids, self.paused_user_ids, HISTORY, STORAGE)
+            if full or dirty: self._schedule_autosave()
+            if full: self.updates.mark_all()
+            elif dirty: self.updates.mark(*dirty)
+        self.after(self.SYNC_POLL_MS, self._poll_sync)
+
+    def clear_presence(self):
+        logger.warning("Benutzer versucht Anwesenheitsliste zu leeren.")
+        if messagebox.askyesno("Leeren", "Alle Spieler aus der Anwesenheitsliste entfernen?"):
+            old_ids = set(self.present_user_ids)
+            self.present_user_ids.clear()
+            self.paused_user_ids.clear()
+            logger.info(f"Anwesenheitsliste geleert ({len(old_ids)} Spieler entfernt).")
+            self.publish(clear_change())
+            self.updates.mark(*old_ids)
+
+    def _load_worker(self) -> None:
+        # Hintergrund-Thread: erst der Schnappschuss (schnell, Liste sofort sichtbar), dann Datenbank und
+        # Historie. Die Verbindung hier wird wieder geschlossen, der Tk-Thread öffnet seine eigene.
+        try:
+            users = None
+            try:
+                with METRICS.timer("load.snapshot"):
+                    users = read_snapshot(SNAPSHOT_FILE, DB_FILE)
+            except OSError as e:
+                logger.warning(f"Schnappschuss {SNAPSHOT_FILE} nicht lesbar: {e}")
+            if users is not None: self.load_queue.put(("users", users, True))
+
+            logger.info(f"Lade Daten aus {DB_FILE}...")
+            storage = SqliteStorage(DB_FILE)
+            try:
+                if storage.migrate_from_json(DATA_FILE): logger.info(f"{DATA_FILE} wurde nach {DB_FILE} übernommen.")
+                if users is None:
+                    with METRICS.timer("load.users"):
+                        users = storage.load_users()
+                    self.load_queue.put(("users", users, False))
+                with METRICS.timer("load.history"):
+                    history = storage.load_history()
+            finally:
+                # Vor der "history"-Meldung schließen: erst danach öffnet der Tk-Thread STORAGE und schreibt,
+                # Checkpoint und Schließen dieser Verbindung dürfen damit nicht überlappen
+                storage.close()
+            try:
+                session = read_session(AUTOSAVE_FILE)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Sitzung aus {AUTOSAVE_FILE} nicht lesbar: {e}")
+                session = None
+            self.load_queue.put(("history", history, session))
+        except Exception as e:
+            logger.critical(f"Fehler beim Laden der Daten: {e}", exc_info=True)
+            self.load_queue.put(("error", e))
+
+    def _poll_load(self) -> None:
+        global STORAGE, HISTORY
+        while not self.load_queue.empty():
+            kind, *payload = self.load_queue.get()
+            if kind == "users":
+                users, from_snapshot = payload
+                ROSTER.clear()
+                ROSTER.extend(users)
+                self.lbl_loading.place_forget()
+                self.refresh_lists()
+                source = "Schnappschuss" if from_snapshot else "Datenbank"
+                METRICS.record("load.visible", self._elapsed_ms() / 1000)
+                logger.info(f"{len(ROSTER)} Spieler aus {source} sichtbar nach {self._elapsed_ms():.0f} ms.")
+            elif kind == "history":
+                HISTORY = DrawHistory(payload[0])
+                STORAGE = SqliteStorage(DB_FILE)
+                for btn in self.data_buttons: btn.configure(state="normal")
+                self.ready = True
+                self._restore_session(payload[1])
+                AUTOSAVER.start()
+                METRICS.record("load.ready", self._elapsed_ms() / 1000)
+                logger.info(f"Bedienbar nach {self._elapsed_ms():.0f} ms ({len(ROSTER)} Spieler, {len(HISTORY)} Historien-Einträge).")
+                self._connect_sync()
+                return
+            else:
+                # Das Label ist nach einem Schnappschuss schon ausgeblendet
+                self.lbl_loading.configure(text="Fehler beim Laden der Daten (siehe Log)", text_color="red")
+                self.lbl_loading.place(relx=0.5, rely=0.5, anchor="center")
+                return
+        self.after(self.LOAD_POLL_MS, self._poll_load)
+
+    @METRICS.timed("ui.refresh")
+    def refresh_lists(self) -> None:
+        logger.debug("Refresh der Listen-UI wird ausgeführt.")
+        self.last_query = self.search_entry.get()
+        self.list_model.rebuild(self.present_user_ids, self.paused_user_ids, self.last_query, self.session_games)
+        self._show_rows()
+
+    def _on_search_key(self) -> None:
+        # Erst suchen, wenn kurz nicht mehr getippt wurde
+        if self.search_job is not None: self.after_cancel(self.search_job)
+        self.search_job = self.after(self.SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    @METRICS.timed("ui.search")
+    def apply_search(self) -> None:
+        self.search_job = None
+        query = self.search_entry.get()
+        if query == self.last_query: return
+        logger.debug(f"Suche: '{self.last_query}' -> '{query}'")
+        self.last_query = query
+        self.list_model.set_query(query, self.present_user_ids, self.paused_user_ids, self.session_games)
+        self.listbox_all.set_rows(self.list_model.others)
+
+    def _apply_updates(self, dirty: set[UUID], full: bool) -> None:
+        if full:
+            self.refresh_lists()
+            return
+        with METRICS.timer("ui.update"):
+            touched = self.list_model.update(dirty, self.present_user_ids, self.paused_user_ids, self.session_games)
+            self._show_rows()
+        logger.debug(f"Listen-Update für {len(touched)} Spieler ({len(dirty)} geändert).")
+
+    def _schedule_clock_tick(self) -> None:
+        # Bis zum nächsten Textwechsel schlafen, aber mindestens jede Minute aufwachen,
+        # damit neu gezogene Spieler ("gerade eben") rechtzeitig umspringen
+        delay = self.CLOCK_TICK_MS
+        next_change = self.list_model.clock.next_change()
+        if next_change is not None:
+            until = (next_change - datetime.now()).total_seconds() * 1000
+            delay = max(1000, min(delay, int(until) + 50))
+        self.clock_job = self.after(delay, self._on_clock_tick)
+
+    def _on_clock_tick(self) -> None:
+        changed = self.list_model.clock.tick()
+        if changed:
+            logger.debug(f"Zeitanzeige für {len(changed)} Spieler gewechselt.")
+            self.updates.mark(*changed)
+        self._schedule_clock_tick()
+
+    def _show_rows(self) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            days = self.list_model.clock.days
+            logger.debug("Pechvögel des Tages: %s", [f"{u.first_name} ({days(u)} Tage)" for u in self.list_model.pechvoegel])
+        self.lbl_present_count.configure(text=f"Anwesend ({len(self.present_user_ids)})")
+        # VirtualList vergleicht Zeile für Zeile und konfiguriert nur geänderte Buttons neu
+        self.listbox_present.set_rows(self.list_model.present)
+        self.listbox_all.set_rows(self.list_model.others)
+
+    def show_context_menu(self, user: User):
+        if not self.ready: return
+        logger.debug(f"Kontextmenü für {user.first_name} {user.last_name} aufgerufen.")
+        menu = ctk.CTkToplevel(self)
+        menu.title("Optionen")
+        menu.geometry("250x230")
+        menu.attributes("-topmost", True)
+        
+        ctk.CTkLabel(menu, text=f"{user.first_name} verwalten", font=("Arial", 12, "bold")).pack(pady=(10, 0))
+        ctk.CTkLabel(menu, text=f"Runden in der Historie: {HISTORY.games_of(user.id)}", font=("Arial", 11)).pack(pady=(0, 5))
+        
+        if user.id in self.present_user_ids:
+            p_text = "Aktivieren" if user.id in self.paused_user_ids else "Pausieren"
+            ctk.CTkButton(menu, text=p_text, fg_color="#3498db", 
+                         command=lambda: [self.toggle_pause(user), menu.destroy()]).pack(pady=5, padx=10, fill="x")
+
+        status_txt = "Entsperren" if user.is_blacklisted else "Blacklisten"
+        ctk.CTkButton(menu, text=status_txt, fg_color="#f39c12", 
+                     command=lambda: [self.toggle_blacklist(user), menu.destroy()]).pack(pady=5, padx=10, fill="x")
+        
+        ctk.CTkButton(menu, text="Löschen", fg_color="#e74c3c", 
+                     command=lambda: [self.delete_user(user), menu.destroy()]).pack(pady=5, padx=10, fill="x")
+
+    def toggle_pause(self, user: User):
+        if user.id in self.paused_user_ids:
+            self.paused_user_ids.remove(user.id)
+            logger.info(f"User {user.first_name} wurde REAKTIVIERT.")
+        else:
+            self.paused_user_ids.add(user.id)
+            logger.info(f"User {user.first_name} wurde PAUSIERT.")
+        self.publish(pause_change(user.id, user.id in self.paused_user_ids))
+        self.updates.mark(user.id)
+
+    def toggle_blacklist(self, user: User):
+        current = ROSTER.get(user.id)
+        if current is None:
+            logger.error(f"Blacklist-Änderung für unbekannten User: {user.first_name} (ID: {user.id})")
+            return
+        new_status = not current.is_blacklisted
+        updated = replace(current, is_blacklisted=new_status)
+        ROSTER.update(updated)
+        STORAGE.save_user(updated)
+        logger.warning(f"BLACKLIST STATUS GEÄNDERT: {user.first_name} -> {new_status}")
+        
+        # Nebenwirkungen ausdrücklich mitschicken: coalesce() behält pro Spieler und Operation nur die
+        # letzte Änderung, aus "sperren, entsperren" würde sonst "entsperren" und der Server behielte ihn anwesend
+        changes = []
+        if new_status and user.id in self.present_user_ids:
+            self.present_user_ids.discard(user.id)
+            changes.append(presence_change(user.id, False))
+            logger.debug(f"{user.first_name} aus Anwesenheitsliste entfernt wegen Blacklist.")
+        if new_status and user.id in self.paused_user_ids:
+            self.paused_user_ids.discard(user.id)
+            changes.append(pause_change(user.id, False))
+        self.publish(*changes, blacklist_change(user.id, new_status))
+        self.updates.mark(user.id)
+
+    def delete_user(self, user: User):
+        logger.warning(f"Versuch User zu löschen: {user.first_name}")
+        if messagebox.askyesno("Löschen", f"{user.first_name} wirklich löschen?"):
+            ROSTER.remove(user.id)
+            STORAGE.delete_user(user.id)
+            self.present_user_ids.discard(user.id)
+            self.paused_user_ids.discard(user.id)
+            logger.info(f"User {user.first_name} (ID: {user.id}) endgültig gelöscht.")
+            self.publish(delete_change(user.id))
+            self.updates.mark(user.id)
+
+    def toggle_presence(self, user: User) -> None:
+        if user.is_blacklisted:
+            logger.error(f"Klick auf geblockten User verhindert: {user.first_name}")
+            messagebox.showwarning("Gesperrt", "Dieser Spieler steht auf der Blacklist!")
+            return
+        
+        changes = []
+        if user.id in self.present_user_ids: 
+            self.present_user_ids.remove(user.id)
+            if user.id in self.paused_user_ids:
+                # Pause ausdrücklich aufheben, siehe toggle_blacklist
+                self.paused_user_ids.remove(user.id)
+                changes.append(pause_change(user.id, False))
+            logger.debug(f"{user.first_name} ist nun ABWESEND.")
+        else: 
+            self.present_user_ids.add(user.id)
+            logger.debug(f"{user.first_name} ist nun ANWESEND.")
+        self.publish(*changes, presence_change(user.id, user.id in self.present_user_ids))
+        self.updates.mark(user.id)
+
+    def add_user_popup(self) -> None:
+        logger.debug("Öffne Popup für neuen Spieler.")
+        popup = ctk.CTkToplevel(self)
+        popup.geometry("300x200")
+        v = ctk.CTkEntry(popup, placeholder_text="Vorname"); v.pack(pady=10)
+        n = ctk.CTkEntry(popup, placeholder_text="Nachname"); n.pack(pady=10)
+        def save():
+            if v.get():
+                new_user = User(id=uuid4(), first_name=v.get(), last_name=n.get(), last_played=None)
+                ROSTER.add(new_user)
+                STORAGE.save_user(new_user)
+                logger.info(f"Neuer Spieler manuell erstellt: {new_user.first_name} (ID: {new_user.id})")
+                self.publish(user_change(new_user))
+                self.updates.mark(new_user.id)
+                popup.destroy()
+            else:
+                logger.error("Speichern fehlgeschlagen: Vorname fehlt.")
+        ctk.CTkButton(popup, text="Speichern", command=save).pack()
+
+    def _draw_candidates(self) -> list[User]:
+        candidates = [u for u in ROSTER.ordered(self.present_user_ids - self.paused_user_ids) if not u.is_blacklisted]
+        
+        logger.info(f"Pool-Größe für Auslosung: {len(candidates)}")
+        
+        if not candidates:
+            logger.warning("Auslosung abgebrochen: Keine aktiven Kandidaten.")
+            messagebox.showinfo("Info", "Keine aktiven Spieler anwesend.")
+        return candidates
+
+    def _count_drawn(self, winners: Iterable[User], changed: set[UUID]) -> None:
+        ids = [u.id for u in winners]
+        for uid in ids:
+            self.session_games[uid] = self.session_games.get(uid, 0) + 1
+        self.publish(draw_change(HISTORY.last()))
+        self.updates.mark(*changed, *ids)
+
+    @METRICS.timed("draw.present")
+    def draw_from_present(self) -> None:
+        raw_val = self.draw_count_entry.get()
+        logger.info(f"Auslosung gestartet. Zielanzahl: {raw_val}")
+        try: target = int(raw_val)
+        except Exception as e:
+            logger.error(f"Ungültige Anzahl im Entry: {raw_val} ({e})")
+            return
+        if target < 1:
+            logger.error(f"Ungültige Anzahl: {target}")
+            return
+
+        candidates = self._draw_candidates()
+        if not candidates: return
+
+        count = min(target, len(candidates))
+        # Gewichtung und Listenanzeige rechnen mit demselben Zeitstempel und denselben gecachten Tagen
+        clock = self.list_model.clock
+        changed = clock.tick()
+        updated_winners = perform_draw(ROSTER, candidates, count, self.sampler, HISTORY, STORAGE, now=clock.now, days=clock.days)
+        self._count_drawn(updated_winners, changed)
+        ResultWindow(self, updated_winners)
+
+    @METRICS.timed("draw.tables")
+    def draw_tables(self) -> None:
+        raw_size, raw_tables = self.draw_count_entry.get(), self.table_count_entry.get()
+        logger.info(f"Turnier-Auslosung gestartet: {raw_tables} Tische à {raw_size} Spieler")
+        try: table_size, table_count = int(raw_size), int(raw_tables)
+        except Exception as e:
+            logger.error(f"Ungültige Tischangaben im Entry: {raw_tables} x {raw_size} ({e})")
+            return
+        if table_size < 1 or table_count < 1:
+            logger.error(f"Ungültige Tischangaben: {table_count} x {table_size}")
+            return
+
+        candidates = self._draw_candidates()
+        if not candidates: return
+
+        clock = self.list_model.clock
+        changed = clock.tick()
+        tables = perform_tournament(ROSTER, candidates, table_count, table_size, self.sampler, HISTORY, PLANNER,
+                                    STORAGE, now=clock.now, days=clock.days)
+        winners = [u for table in tables for u in table]
+        self._count_drawn(winners, changed)
+        ResultWindow(self, winners, tables)
+
+    def run(self) -> None: 
+        logger.info("Mainloop wird gestartet.")
+        self.mainloop()
+        if self.sync is not None: self.sync.stop()
+#endregion MAIN_APP
+
+def on_exit() -> None:
+    logger.info("Programm wird beendet. Schließe Datenbank...")
+    PLANNER.close()
+    if STORAGE is not None:
+        # Letzte Sicherung ohne Sitzung: nach regulärem Beenden wird beim Start nichts wiederhergestellt
+        AUTOSAVER.submit(SessionState.capture(ROSTER.values(), HISTORY))
+        AUTOSAVER.stop()
+        _close_storage()
+    # Landet mit in der Log-Datei, damit langsame Spieleabende sich hinterher nachvollziehen lassen
+    if METRICS.enabled: logger.info(f"Messwerte dieser Sitzung:\n{METRICS.summary()}")
+
+def _close_storage() -> None:
+    # Alle Änderungen sind bereits einzeln gespeichert, hier wird nur noch das WAL zurückgeschrieben
+    with METRICS.timer("exit.close_db"):
+        STORAGE.close()
+    logger.info(f"Datenbank {DB_FILE} geschlossen. {len(ROSTER)} User gesichert.")
+    # Schnappschuss für den nächsten Start, passend zum jetzt geschlossenen Stand der Datenbank
+    stamp = db_stamp(DB_FILE)
+    if stamp is None: return
+    try:
+        with METRICS.timer("exit.snapshot"):
+            count = write_snapshot(SNAPSHOT_FILE, ROSTER, stamp)
+        logger.info(f"Schnappschuss {SNAPSHOT_FILE} mit {count} Spielern geschrieben.")
+    except (OSError, TypeError, struct.error) as e:
+        logger.error(f"Schnappschuss {SNAPSHOT_FILE} konnte nicht geschrieben werden: {e}", exc_info=True)
+
+def main() -> None:
+    started = time.perf_counter()
+    setup_logging()
+    atexit.register(on_exit)
+    try:
+        app = MainApp(started)
+        app.run()
+    except Exception as e:
+        logger.critical(f"FATALER FEHLER beim Programmstart: {e}", exc_info=True)
@@ -0,0 +1,100 @@
+#region IMPORTS
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from werwolf.registry import PlayerRegistry
+#endregion IMPORTS
+
+#region CLASSES
+NameResolver = Callable[[str], UUID | None]
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    timestamp: datetime
+    player_ids: tuple[UUID | None, ...]
+    players: tuple[str, ...] # Anzeigenamen zum Zeitpunkt der Ziehung
+    tables: tuple[int, ...] = () # Turniermodus: Spieler pro Tisch, in Reihenfolge von players; leer = ein Tisch
+
+    def groups(self) -> list[tuple[tuple[UUID | None, ...], tuple[str, ...]]]:
+        # (IDs, Namen) pro Tisch; normale Runden sind ein einziger Tisch
+        if not self.tables: return [(self.player_ids, self.players)]
+        groups, start = [], 0
+        for size in self.tables:
+            groups.append((self.player_ids[start:start + size], self.players[start:start + size]))
+            start += size
+        return groups
+
+    def to_dict(self) -> dict:
+        data = {
+            "timestamp": self.timestamp.isoformat(),
+            "players": list(self.players),
+            "player_ids": [str(uid) if uid else None for uid in self.player_ids],
+        }
+        if self.tables: data["tables"] = list(self.tables)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, resolve: NameResolver | None = None) -> "HistoryEntry":
+        # Alte Einträge haben nur Namen, die IDs werden dann über resolve nachgeschlagen
+        players = tuple(data["players"])
+        if data.get("player_ids") is not None:
+            ids = tuple(UUID(uid) if uid else None for uid in data["player_ids"])
+        else:
+            ids = tuple(resolve(name) if resolve else None for name in players)
+        return cls(datetime.fromisoformat(data["timestamp"]), ids, players, tuple(data.get("tables") or ()))
+
+def name_resolver(registry: PlayerRegistry) -> NameResolver:
+    # "Vorname Nachname" -> UUID. Beim Import ist der Vorname das erste Wort, manuell angelegte Spieler
+    # können aber auch Leerzeichen im Vornamen haben ("Anna Lena Schmidt"): daher jede Trennstelle
+    # von links nach rechts probieren, der erste Treffer gewinnt.
+    def resolve(name: str) -> UUID | None:
+        parts = name.split(" ")
+        for i in range(1, max(2, len(parts))):
+            user = registry.find_by_name(" ".join(parts[:i]), " ".join(parts[i:]))
+            if user is not None: return user.id
+        return None
+    return resolve
+
+class DrawHistory:
+    # Append-only Liste aller Ziehungen plus invertierter Index Spieler -> Einträge
+    def __init__(self, entries: Iterable[HistoryEntry] = ()):
+        self._entries: list[HistoryEntry] = []
+        self._by_player: dict[UUID, list[int]] = {}
+        for entry in entries: self.append(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> HistoryEntry:
+        return self._entries[index]
+
+    def append(self, entry: HistoryEntry) -> int:
+        index = len(self._entries)
+        self._entries.append(entry)
+        for uid in entry.player_ids:
+            if uid is not None: self._by_player.setdefault(uid, []).append(index)
+        return index
+
+    def last(self) -> HistoryEntry | None:
+        return self._entries[-1] if self._entries else None
+
+    def newest(self, offset: int = 0, limit: int = 25) -> list[HistoryEntry]:
+        # Seite in umgekehrter Reihenfolge (neueste zuerst), ohne die ganze Liste zu kopieren
+        end = len(self._entries) - offset
+        if end <= 0: return []
+        return self._entries[max(0, end - limit):end][::-1]
+
+    def for_player(self, user_id: UUID) -> list[HistoryEntry]:
+        return [self._entries[i] for i in self._by_player.get(user_id, ())]
+
+    def games_of(self, user_id: UUID) -> int:
+        return len(self._by_player.get(user_id, ()))
+
+    def to_dicts(self) -> list[dict]:
+        return [e.to_dict() for e in self._entries]
+#endregion CLASSES
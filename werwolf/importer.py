@@ -0,0 +1,170 @@
+#region IMPORTS
+from collections.abc import Iterable, Iterator
+import csv
+from dataclasses import dataclass, replace
+import logging
+import queue
+import threading
+from uuid import uuid4
+
+from werwolf.log import get_logger
+from werwolf.models import User
+from werwolf.registry import NameKey, PlayerRegistry, name_key
+from werwolf.storage import SqliteStorage
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("import")
+
+#region IMPORTER
+NameRow = tuple[str, str]
+CSV_FIRST_NAME_HEADERS: set[str] = {"vorname", "first_name", "firstname", "first name"}
+CSV_LAST_NAME_HEADERS: set[str] = {"nachname", "last_name", "lastname", "last name", "name"}
+
+def parse_name(line: str) -> NameRow | None:
+    parts = line.strip().split(maxsplit=1)
+    if not parts: return None
+    return (parts[0], parts[1] if len(parts) > 1 else "")
+
+def iter_text_rows(lines: Iterable[str]) -> Iterator[NameRow]:
+    for line in lines:
+        row = parse_name(line)
+        if row: yield row
+
+def _detect_delimiter(header_line: str) -> str:
+    # Nur die erste Zeile zählt: eine einzelne unregelmäßige Zeile weiter unten brachte den Sniffer
+    # sonst aus dem Tritt, und mit "," als Notlösung wurde eine ";"-Kopfzeile als Spieler importiert.
+    # Erst die bekannten Spaltennamen probieren, dann die Zeile erraten lassen, zuletzt ",".
+    for delimiter in (";", "\t", ","):
+        if any(c.strip().casefold() in CSV_FIRST_NAME_HEADERS for c in header_line.split(delimiter)): return delimiter
+    try: return csv.Sniffer().sniff(header_line, delimiters=",;\t").delimiter
+    except csv.Error: return ","
+
+def iter_csv_rows(f) -> Iterator[NameRow]:
+    # Trennzeichen an der ersten Zeile erkennen, Kopfzeile (Vorname/Nachname) erkennen, sonst Spalte 1 + 2 verwenden
+    header_line = f.readline()
+    f.seek(0)
+    reader = csv.reader(f, delimiter=_detect_delimiter(header_line))
+
+    first_col, last_col = 0, 1
+    header = next(reader, None)
+    if header is None: return
+    lowered = [h.strip().casefold() for h in header]
+    if any(h in CSV_FIRST_NAME_HEADERS for h in lowered):
+        first_col = next(i for i, h in enumerate(lowered) if h in CSV_FIRST_NAME_HEADERS)
+        last_col = next((i for i, h in enumerate(lowered) if h in CSV_LAST_NAME_HEADERS), -1)
+        rows = reader
+    else:
+        rows = _chain_first(header, reader)
+
+    for cells in rows:
+        if len(cells) <= first_col: continue
+        if last_col < 0 or len(cells) <= last_col:
+            row = parse_name(cells[first_col])
+            if row: yield row
+            continue
+        f_name, l_name = cells[first_col].strip(), cells[last_col].strip()
+        if f_name: yield (f_name, l_name)
+
+def _chain_first(first: list[str], rest: Iterator[list[str]]) -> Iterator[list[str]]:
+    yield first
+    yield from rest
+
+def iter_import_file(path: str) -> Iterator[NameRow]:
+    # Liest die Datei zeilenweise, es wird nie der komplette Inhalt in den Speicher geladen
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            yield from iter_csv_rows(f)
+        else:
+            yield from iter_text_rows(f)
+
+@dataclass(frozen=True)
+class ImportProgress:
+    read: int = 0
+    added: int = 0
+    skipped: int = 0
+    done: bool = False
+    error: str | None = None
+
+class RegistrySink:
+    # Übernimmt fertige Batches in ein PlayerRegistry (und optional in den Storage)
+    def __init__(self, registry: PlayerRegistry, storage: SqliteStorage | None = None):
+        self.registry = registry
+        self.storage = storage
+
+    def existing_keys(self) -> set[NameKey]:
+        return {name_key(u.first_name, u.last_name) for u in self.registry}
+
+    def apply(self, users: list[User]) -> list[User]:
+        # Zweite Prüfung gegen das Registry, falls seit dem Start des Imports jemand manuell angelegt wurde
+        fresh = [u for u in users if self.registry.find_by_name(u.first_name, u.last_name) is None]
+        self.registry.extend(fresh)
+        if self.storage is not None and fresh: self.storage.save_users(fresh)
+        return fresh
+
+class MemorySink(RegistrySink):
+    # Für Headless-Läufe und Benchmarks: reines In-Memory-Ziel ohne Datenbank
+    def __init__(self, registry: PlayerRegistry | None = None):
+        super().__init__(registry if registry is not None else PlayerRegistry())
+
+class StreamingImporter:
+    # Parsen und Deduplizieren laufen im Worker-Thread, das Anwenden der Batches
+    # passiert im Thread des Aufrufers (bei der UI also im Tk-Thread via after()).
+    def __init__(self, rows: Iterable[NameRow], existing: Iterable[NameKey] = (), batch_size: int = 500):
+        self.rows = rows
+        self.seen: set[NameKey] = set(existing)
+        self.batch_size = batch_size
+        self.queue: queue.Queue[tuple[list[User], ImportProgress]] = queue.Queue()
+        self.thread: threading.Thread | None = None
+        self.cancelled = threading.Event()
+
+    def batches(self) -> Iterator[tuple[list[User], ImportProgress]]:
+        read = added = skipped = 0
+        batch: list[User] = []
+        for f_name, l_name in self.rows:
+            if self.cancelled.is_set(): return
+            read += 1
+            key = name_key(f_name, l_name)
+            if key in self.seen:
+                skipped += 1
+                continue
+            self.seen.add(key)
+            batch.append(User(id=uuid4(), first_name=f_name, last_name=l_name, last_played=None))
+            added += 1
+            if len(batch) >= self.batch_size:
+                logger.debug("Import-Batch fertig: %d gelesen, %d neu, %d Duplikate", read, added, skipped)
+                yield batch, ImportProgress(read, added, skipped)
+                batch = []
+        yield batch, ImportProgress(read, added, skipped, done=True)
+
+    def run(self, sink: RegistrySink) -> ImportProgress:
+        # Synchroner Lauf ohne Thread, z.B. headless
+        added = 0
+        progress = ImportProgress(done=True)
+        for batch, progress in self.batches():
+            added += len(sink.apply(batch))
+        return replace(progress, added=added, skipped=progress.read - added)
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._worker, name="bulk-import", daemon=True)
+        self.thread.start()
+
+    def cancel(self) -> None:
+        # Worker hört nach der aktuellen Zeile auf; bereits übergebene Batches bleiben übernommen
+        self.cancelled.set()
+
+    def _worker(self) -> None:
+        last = ImportProgress()
+        try:
+            for item in self.batches():
+                self.queue.put(item)
+                last = item[1]
+        except Exception as e:
+            logger.critical(f"Fehler im Import-Worker: {e}", exc_info=True)
+            # Zähler des letzten Batches mitgeben, sonst stünden in der Anzeige 0 gelesene Zeilen
+            self.queue.put(([], replace(last, done=True, error=str(e))))
+
+    def drain(self) -> Iterator[tuple[list[User], ImportProgress]]:
+        while True:
+            try: yield self.queue.get_nowait()
+            except queue.Empty: return
+#endregion IMPORTER
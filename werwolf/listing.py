@@ -0,0 +1,167 @@
+#region IMPORTS
+from bisect import bisect_left
+from collections.abc import Iterable, Set
+from dataclasses import dataclass
+from uuid import UUID
+
+from werwolf.clock import DisplayClock
+from werwolf.models import User
+from werwolf.registry import NameKey, PlayerRegistry, name_key
+from werwolf.search import SearchIndex
+#endregion IMPORTS
+
+#region CLASSES
+@dataclass(frozen=True)
+class ListRow:
+    user: User
+    text: str
+    fg_color: str = "transparent"
+    text_color: str | None = None
+
+def make_list_row(user: User, is_present: bool, is_paused: bool, is_pech: bool, session_count: int,
+                  clock: DisplayClock) -> ListRow:
+    btn_color = "transparent"
+    text_color = None
+
+    if user.is_blacklisted:
+        btn_color = "#c0392b"
+        text_color = "white"
+    elif is_paused:
+        btn_color = "#7f8c8d"
+        text_color = "#bdc3c7"
+    elif is_present:
+        btn_color = "#d35400"
+        text_color = "white"
+
+    pech_icon = "⭐ " if is_pech and not is_paused else ""
+    stats = f" [Sitzung: {session_count} | Total: {user.total_games}]"
+    return ListRow(user, f"{pech_icon}{clock.display_text(user)}{stats}", btn_color, text_color)
+
+@dataclass(frozen=True)
+class ListRows:
+    present: list[ListRow]
+    others: list[ListRow]
+    pechvoegel: list[User]
+
+def find_pechvoegel(registry: PlayerRegistry, present_ids: Set[UUID], paused_ids: Set[UUID],
+                    clock: DisplayClock) -> list[User]:
+    active_candidates = registry.ordered(present_ids - paused_ids)
+    return sorted(active_candidates, key=clock.days, reverse=True)[:3]
+
+def _rows_for(users: Iterable[User], present_ids: Set[UUID], paused_ids: Set[UUID], pech_ids: Set[UUID],
+              session_games: dict[UUID, int], clock: DisplayClock) -> list[ListRow]:
+    return [make_list_row(u, u.id in present_ids, u.id in paused_ids, u.id in pech_ids, session_games.get(u.id, 0), clock)
+            for u in users]
+
+def _other_users(registry: PlayerRegistry, present_ids: Set[UUID], matches: Set[UUID] | None) -> Iterable[User]:
+    # Ohne Suche alle Abwesenden in Registry-Reihenfolge, sonst nur die Treffer
+    if matches is None: return (u for u in registry if u.id not in present_ids)
+    return registry.ordered(uid for uid in matches if uid not in present_ids)
+
+def build_list_rows(registry: PlayerRegistry, present_ids: Set[UUID], paused_ids: Set[UUID],
+                    matches: Set[UUID] | None = None, session_games: dict[UUID, int] | None = None,
+                    clock: DisplayClock | None = None) -> ListRows:
+    # Reiner Datenteil von MainApp.refresh_lists: welche Zeile steht in welcher Liste, mit welchem Text.
+    # Ohne Tk, damit er auch headless (Benchmarks) laufen kann. matches kommt aus SearchIndex.query
+    # (None = keine Suche); Anwesende werden immer angezeigt. Ohne clock gilt ein frischer Zeitstempel
+    # für den ganzen Aufbau.
+    session_games = session_games or {}
+    clock = clock or DisplayClock()
+    pechvoegel = find_pechvoegel(registry, present_ids, paused_ids, clock)
+    pech_ids = {u.id for u in pechvoegel}
+    rows_present = _rows_for(registry.ordered(present_ids), present_ids, paused_ids, pech_ids, session_games, clock)
+    rows_all = _rows_for(_other_users(registry, present_ids, matches), present_ids, paused_ids, pech_ids, session_games, clock)
+    return ListRows(rows_present, rows_all, pechvoegel)
+
+RowKey = tuple[NameKey, UUID]
+
+def row_key(user: User) -> RowKey:
+    # Gleiche Reihenfolge wie PlayerRegistry: Name, bei Gleichstand UUID
+    return (name_key(user.first_name, user.last_name), user.id)
+
+class ListModel:
+    # Hält die Zeilen beider Listen und passt sie bei Änderungen einzelner Spieler gezielt an
+    # (entfernen/einsortieren per bisect), statt jedes Mal alle Zeilen neu zu bauen.
+    def __init__(self, registry: PlayerRegistry, search: SearchIndex | None = None):
+        self.registry = registry
+        if search is None:
+            search = SearchIndex()
+            registry.attach(search)
+        self.search = search
+        self.clock = DisplayClock()
+        self.present: list[ListRow] = []
+        self.others: list[ListRow] = []
+        self._present_keys: list[RowKey] = []
+        self._others_keys: list[RowKey] = []
+        self._placement: dict[UUID, tuple[bool, RowKey]] = {}
+        self.pechvoegel: list[User] = []
+        self.query: str = ""
+
+    def _set_others(self, rows: list[ListRow]) -> None:
+        for key in self._others_keys: self._placement.pop(key[1], None)
+        self.others = rows
+        self._others_keys = [row_key(r.user) for r in rows]
+        self._placement.update((k[1], (False, k)) for k in self._others_keys)
+
+    def rebuild(self, present_ids: Set[UUID], paused_ids: Set[UUID], query: str = "",
+                session_games: dict[UUID, int] | None = None) -> None:
+        self.query = query.strip()
+        self.clock.tick()
+        rows = build_list_rows(self.registry, present_ids, paused_ids, self.search.query(query), session_games, self.clock)
+        self.pechvoegel = rows.pechvoegel
+        self.present = rows.present
+        self._present_keys = [row_key(r.user) for r in self.present]
+        self._placement = {k[1]: (True, k) for k in self._present_keys}
+        self._others_keys = []
+        self._set_others(rows.others)
+
+    def set_query(self, query: str, present_ids: Set[UUID], paused_ids: Set[UUID],
+                  session_games: dict[UUID, int] | None = None) -> None:
+        # Neue Suche: nur die rechte Liste ändert sich, die Anwesenden bleiben wie sie sind
+        self.query = query.strip()
+        pech_ids = {u.id for u in self.pechvoegel}
+        users = _other_users(self.registry, present_ids, self.search.query(query))
+        self._set_others(_rows_for(users, present_ids, paused_ids, pech_ids, session_games or {}, self.clock))
+
+    def _is_visible(self, user: User, is_present: bool) -> bool:
+        if is_present or not self.query: return True
+        return self.search.contains(user.id, self.query)
+
+    def _remove(self, user_id: UUID) -> None:
+        placement = self._placement.pop(user_id, None)
+        if placement is None: return
+        in_present, key = placement
+        rows, keys = (self.present, self._present_keys) if in_present else (self.others, self._others_keys)
+        pos = bisect_left(keys, key)
+        del keys[pos]
+        del rows[pos]
+
+    def update(self, dirty_ids: Iterable[UUID], present_ids: Set[UUID], paused_ids: Set[UUID],
+               session_games: dict[UUID, int] | None = None) -> set[UUID]:
+        # Liefert alle tatsächlich angefassten IDs (inkl. Spieler, die Pechvogel-Stern gewonnen/verloren haben
+        # oder deren Zeittext seit dem letzten Tick gewechselt hat)
+        session_games = session_games or {}
+        dirty = set(dirty_ids) | self.clock.tick()
+        pechvoegel = find_pechvoegel(self.registry, present_ids, paused_ids, self.clock)
+        pech_ids = {u.id for u in pechvoegel}
+        dirty |= pech_ids ^ {u.id for u in self.pechvoegel}
+        self.pechvoegel = pechvoegel
+
+        for uid in dirty:
+            self._remove(uid)
+            user = self.registry.get(uid)
+            if user is None:
+                self.clock.forget(uid)
+                continue
+
+            is_present = uid in present_ids
+            if not self._is_visible(user, is_present): continue
+            row = make_list_row(user, is_present, uid in paused_ids, uid in pech_ids, session_games.get(uid, 0), self.clock)
+            rows, keys = (self.present, self._present_keys) if is_present else (self.others, self._others_keys)
+            key = row_key(user)
+            pos = bisect_left(keys, key)
+            keys.insert(pos, key)
+            rows.insert(pos, row)
+            self._placement[uid] = (is_present, key)
+        return dirty
+#endregion CLASSES
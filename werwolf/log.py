@@ -0,0 +1,100 @@
+#region IMPORTS
+import atexit
+from datetime import datetime
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+import queue
+#endregion IMPORTS
+
+#region GLOBALS
+LOG_DIR: str = "logs"
+ROOT_LOGGER: str = "WERWOLF_APP"
+LOG_LEVELS_ENV: str = "WERWOLF_LOG_LEVELS"
+
+# Subsysteme, jeweils ein Kind-Logger von WERWOLF_APP
+SUBSYSTEMS: tuple[str, ...] = ("ui", "draw", "import", "storage", "sync", "metrics", "cli")
+
+_listener: QueueListener | None = None
+#endregion GLOBALS
+
+#region LOGGING
+def get_logger(subsystem: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+def parse_levels(spec: str) -> dict[str, int]:
+    # "draw=INFO,import=WARNING" -> {"draw": 20, "import": 30}; "app=..." setzt WERWOLF_APP selbst
+    levels: dict[str, int] = {}
+    for part in spec.split(","):
+        if not part.strip(): continue
+        name, _, level = part.partition("=")
+        name = name.strip()
+        if name != "app" and name not in SUBSYSTEMS:
+            raise ValueError(f"Unbekanntes Subsystem: {name} (bekannt: app, {', '.join(SUBSYSTEMS)})")
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unbekanntes Log-Level: {part.strip()}")
+        levels[name] = value
+    return levels
+
+def configure_levels(levels: dict[str, int] | None = None) -> None:
+    # Explizite Levels gewinnen, danach die Umgebungsvariable WERWOLF_LOG_LEVELS
+    try:
+        merged = parse_levels(os.environ.get(LOG_LEVELS_ENV, ""))
+    except ValueError as e:
+        # Ein Tippfehler in der Umgebungsvariable soll den Start nicht verhindern
+        get_logger("cli").warning(f"{LOG_LEVELS_ENV} wird ignoriert: {e}")
+        merged = {}
+    merged.update(levels or {})
+    for name, level in merged.items():
+        target = logging.getLogger(ROOT_LOGGER) if name == "app" else get_logger(name)
+        target.setLevel(level)
+
+class _LocalQueueHandler(QueueHandler):
+    # Prozessinterne Queue: Nachricht wird hier fertig formatiert (args können sich sonst noch ändern),
+    # exc_info bleibt aber erhalten, damit der RichHandler weiterhin Tracebacks mit Locals zeigt.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def setup_logging(console_level: int = logging.DEBUG, log_file: bool = True,
+                  levels: dict[str, int] | None = None) -> logging.Logger:
+    # Wird erst beim Programmstart aufgerufen, nicht beim Import: rich und die Log-Datei
+    # kosten nur dann etwas, wenn sie auch gebraucht werden. Konsole und Datei hängen
+    # hinter einem QueueListener, der Tk-Thread schreibt also nie selbst auf Platte/Terminal.
+    global _listener
+    from rich.logging import RichHandler
+    from rich.traceback import install as rtb_install
+    rtb_install()
+
+    handlers: list[logging.Handler] = [RichHandler(rich_tracebacks=True, tracebacks_show_locals=True, level=console_level)]
+    if log_file:
+        # Erhöhtes Level auf DEBUG und detailliertes Format
+        os.makedirs(LOG_DIR, exist_ok=True)
+        file_handler = logging.FileHandler(f"{LOG_DIR}/werwolf_app--{datetime.now().strftime("%d.%m.%YT%H-%M-%S")}.log", encoding="utf-8")
+        file_handler.setLevel(logging.DEBUG)
+        file_formatter = logging.Formatter("%(asctime)s | %(levelname)-8s | %(threadName)s | %(name)s | %(funcName)s:%(lineno)d - %(message)s")
+        file_handler.setFormatter(file_formatter)
+        handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(message)s",
+        handlers=[_LocalQueueHandler(log_queue)]
+    )
+    configure_levels(levels)
+    return logging.getLogger(ROOT_LOGGER)
+
+def shutdown_logging() -> None:
+    # Restliche Einträge aus der Queue noch schreiben lassen
+    global _listener
+    if _listener is None: return
+    _listener.stop()
+    _listener = None
+#endregion LOGGING
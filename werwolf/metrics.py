@@ -0,0 +1,154 @@
+#region IMPORTS
+from array import array
+from collections.abc import Callable
+from contextlib import nullcontext
+from datetime import datetime
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+from werwolf.log import get_logger
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("metrics")
+
+#region GLOBALS
+METRICS_ENV: str = "WERWOLF_METRICS" # "1" -> Messung schon beim Start aktiv
+RING_SIZE: int = 512 # so viele letzte Messungen pro Timer fließen in die Perzentile ein
+PERCENTILES: tuple[int, ...] = (50, 90, 99)
+#endregion GLOBALS
+
+#region METRICS
+class _Ring:
+    # Feste Anzahl letzter Messwerte (Sekunden); ältere werden überschrieben, total zählt alle
+    __slots__ = ("values", "pos", "total", "sum")
+
+    def __init__(self, size: int):
+        self.values = array("d", bytes(8 * size))
+        self.pos = 0
+        self.total = 0
+        self.sum = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.values[self.pos] = seconds
+        self.pos = (self.pos + 1) % len(self.values)
+        self.total += 1
+        self.sum += seconds
+
+    def window(self) -> list[float]:
+        if self.total >= len(self.values): return list(self.values)
+        return list(self.values[:self.pos])
+
+    def last(self) -> float:
+        return self.values[self.pos - 1]
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.metrics.record(self.name, time.perf_counter() - self.start)
+
+_NULL_TIMER = nullcontext()
+
+def _percentile(ordered: list[float], p: int) -> float:
+    # Nearest-Rank auf der sortierten Stichprobe
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+class Metrics:
+    # Timer und Zähler für die Diagnose. Ausgeschaltet kostet jeder Aufruf nur die Abfrage von
+    # self.enabled (timer() liefert dann einen geteilten No-Op-Kontext), daher bleibt die Messung
+    # auch in Release-Builds eingebaut. Pro Timer liegen die letzten RING_SIZE Werte in einem Ringpuffer,
+    # daraus werden die Perzentile erst bei stats() berechnet.
+    def __init__(self, enabled: bool = False, size: int = RING_SIZE):
+        self.enabled = enabled
+        self.size = size
+        self.started: datetime = datetime.now()
+        self._timers: dict[str, _Ring] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock() # der Lade-Thread misst parallel zum Tk-Thread
+
+    def enable(self, on: bool = True) -> None:
+        if on == self.enabled: return
+        self.enabled = on
+        logger.info(f"Messung {'eingeschaltet' if on else 'ausgeschaltet'}.")
+
+    def timer(self, name: str):
+        if not self.enabled: return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        def wrap(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                if not self.enabled: return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return inner
+        return wrap
+
+    def record(self, name: str, seconds: float) -> None:
+        if not self.enabled: return
+        with self._lock:
+            ring = self._timers.get(name)
+            if ring is None: ring = self._timers[name] = _Ring(self.size)
+            ring.add(seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not self.enabled or not n: return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self.started = datetime.now()
+
+    def stats(self) -> dict:
+        # Millisekunden; count = alle Messungen, window = davon im Ringpuffer (Basis der Perzentile)
+        with self._lock:
+            rings = [(name, ring.window(), ring.last(), ring.total, ring.sum) for name, ring in self._timers.items()]
+            counters = dict(self._counters)
+        timers = {}
+        for name, window, last, total, total_sum in sorted(rings):
+            ordered = sorted(window)
+            timers[name] = {
+                "count": total, "window": len(ordered), "last_ms": last * 1000, "mean_ms": total_sum / total * 1000,
+                **{f"p{p}_ms": _percentile(ordered, p) * 1000 for p in PERCENTILES}, "max_ms": ordered[-1] * 1000,
+            }
+        return {"enabled": self.enabled, "since": self.started.isoformat(timespec="seconds"),
+                "timers": timers, "counters": dict(sorted(counters.items()))}
+
+    def export(self, path: str, **extra) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**extra, "exported": datetime.now().isoformat(timespec="seconds"), **self.stats()}, f, indent=2, ensure_ascii=False)
+        logger.info(f"Messwerte nach {path} exportiert.")
+
+    def summary(self) -> str:
+        stats = self.stats()
+        lines = [f"{'Timer':26} {'Anzahl':>7} {'zuletzt':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for name, t in stats["timers"].items():
+            lines.append(f"{name:26} {t['count']:>7} {t['last_ms']:>9.2f} {t['p50_ms']:>9.2f} {t['p90_ms']:>9.2f} {t['p99_ms']:>9.2f} {t['max_ms']:>9.2f}")
+        if stats["counters"]:
+            lines.append("")
+            lines.append(f"{'Zähler':26} {'Wert':>7}")
+            lines.extend(f"{name:26} {value:>7}" for name, value in stats["counters"].items())
+        return "\n".join(lines)
+
+METRICS: Metrics = Metrics(enabled=os.environ.get(METRICS_ENV, "") not in ("", "0"))
+#endregion METRICS
@@ -0,0 +1,54 @@
+#region IMPORTS
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+#endregion IMPORTS
+
+#region FUNCTIONS
+NEVER_DAYS: int = 999 # "nie gespielt" zählt für Gewichtung und Anzeige als so viele Tage
+
+def relative_time(last_played: datetime | None, now: datetime) -> tuple[str, datetime | None]:
+    # Anzeigetext ("vor 3 Std.") plus Zeitpunkt, ab dem sich dieser Text das nächste Mal ändert
+    if not last_played: return "nie", None
+    seconds = (now - last_played).total_seconds()
+    if seconds < 60: return "gerade eben", last_played + timedelta(minutes=1)
+    minutes = int(seconds // 60)
+    if minutes < 60: return f"vor {minutes} Min.", last_played + timedelta(minutes=minutes + 1)
+    hours = int(minutes // 60)
+    if hours < 24: return f"vor {hours} Std.", last_played + timedelta(hours=hours + 1)
+    days = int(hours // 24)
+    return f"vor {days} Tagen", last_played + timedelta(days=days + 1)
+
+def days_since(last_played: datetime | None, now: datetime) -> int:
+    # "nie gespielt" zählt als 999 Tage; eine Uhr, die knapp hinter dem Spielzeitpunkt steht, ergibt 0
+    if not last_played: return NEVER_DAYS
+    return max(0, (now - last_played).days)
+#endregion FUNCTIONS
+
+#region CLASSES
+class PlayerDisplay:
+    # Lesende Anzeige-Logik über first_name, last_name, last_played und is_blacklisted;
+    # gemeinsam für User und die Spalten-Sicht UserView (daher leere __slots__)
+    __slots__ = ()
+
+    def get_time_diff_str(self, now: datetime | None = None) -> str:
+        return relative_time(self.last_played, now or datetime.now())[0]
+
+    def days_since_last_play(self, now: datetime | None = None) -> int:
+        return days_since(self.last_played, now or datetime.now())
+
+    def get_display_text(self, now: datetime | None = None, label: str | None = None) -> str:
+        if label is None: label = self.get_time_diff_str(now)
+        status = " [!] GESPERRT" if self.is_blacklisted else f" ({label})"
+        return f"{self.first_name} {self.last_name}{status}"
+
+@dataclass(frozen=True)
+class User(PlayerDisplay):
+    id: UUID
+    first_name: str
+    last_name: str
+    last_played: datetime | None
+    total_games: int = 0
+    is_blacklisted: bool = False
+
+#endregion CLASSES
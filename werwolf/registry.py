@@ -0,0 +1,118 @@
+#region IMPORTS
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Iterator
+from typing import Protocol
+from uuid import UUID
+
+from werwolf.models import User
+#endregion IMPORTS
+
+#region REGISTRY
+NameKey = tuple[str, str]
+
+class RegistryIndex(Protocol):
+    # Zusatz-Index (z.B. SearchIndex), den das Registry bei jeder Namensänderung mitführt
+    def add(self, user: User) -> None: ...
+    def remove(self, user: User) -> None: ...
+    def clear(self) -> None: ...
+
+def name_key(first_name: str, last_name: str) -> NameKey:
+    return (first_name.strip().casefold(), last_name.strip().casefold())
+
+class PlayerRegistry:
+    # Spieler-Verzeichnis mit Indizes: UUID -> User, normalisierter Name -> UUIDs
+    # und eine stets sortierte Reihenfolge (Vorname, Nachname).
+    def __init__(self, users: Iterable[User] = ()):
+        self._by_id: dict[UUID, User] = {}
+        self._by_name: dict[NameKey, set[UUID]] = {}
+        self._order: list[tuple[NameKey, UUID]] = []
+        self._indexes: list[RegistryIndex] = []
+        self.extend(users)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[User]:
+        by_id = self._by_id
+        return (by_id[uid] for _, uid in self._order)
+
+    def values(self) -> list[User]:
+        # Ohne Namenssortierung: deutlich schneller als iter(), wenn die Reihenfolge egal ist (z.B. Autosave)
+        return list(self._by_id.values())
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return user_id in self._by_id
+
+    def get(self, user_id: UUID) -> User | None:
+        return self._by_id.get(user_id)
+
+    def find_by_name(self, first_name: str, last_name: str) -> User | None:
+        # Bei gleichem normalisierten Namen (manuell angelegt, Sync) gewinnt der erste in Anzeige-Reihenfolge,
+        # also die kleinste UUID, statt eines zufälligen Elements aus dem Set
+        key = name_key(first_name, last_name)
+        if key not in self._by_name: return None
+        return self._by_id[self._order[bisect_left(self._order, (key,))][1]]
+
+    def attach(self, index: RegistryIndex) -> None:
+        for user in self: index.add(user)
+        self._indexes.append(index)
+
+    def ordered(self, user_ids: Iterable[UUID]) -> list[User]:
+        # Teilmenge in Anzeige-Reihenfolge, ohne über den ganzen Bestand zu laufen
+        users = [self._by_id[uid] for uid in user_ids if uid in self._by_id]
+        users.sort(key=lambda u: (name_key(u.first_name, u.last_name), u.id))
+        return users
+
+    def _index(self, user: User) -> NameKey:
+        key = name_key(user.first_name, user.last_name)
+        self._by_id[user.id] = user
+        self._by_name.setdefault(key, set()).add(user.id)
+        for index in self._indexes: index.add(user)
+        return key
+
+    def _unindex(self, user: User) -> None:
+        key = name_key(user.first_name, user.last_name)
+        del self._by_id[user.id]
+        ids = self._by_name[key]
+        ids.discard(user.id)
+        if not ids: del self._by_name[key]
+        del self._order[bisect_left(self._order, (key, user.id))]
+        for index in self._indexes: index.remove(user)
+
+    def add(self, user: User) -> None:
+        if user.id in self._by_id:
+            raise ValueError(f"User mit ID {user.id} existiert bereits.")
+        insort(self._order, (self._index(user), user.id))
+
+    def extend(self, users: Iterable[User]) -> None:
+        # Bulk-Variante: einmal sortieren statt n-mal einfügen. Alle IDs werden vorab geprüft,
+        # damit eine doppelte ID mitten im Batch das Registry nicht halb befüllt zurücklässt.
+        users = list(users)
+        seen: set[UUID] = set()
+        for user in users:
+            if user.id in self._by_id or user.id in seen:
+                raise ValueError(f"User mit ID {user.id} existiert bereits.")
+            seen.add(user.id)
+        for user in users: self._order.append((self._index(user), user.id))
+        self._order.sort()
+
+    def update(self, user: User) -> User:
+        old = self._by_id[user.id]
+        if (old.first_name, old.last_name) != (user.first_name, user.last_name):
+            self._unindex(old)
+            self.add(user)
+        else:
+            self._by_id[user.id] = user
+        return old
+
+    def remove(self, user_id: UUID) -> User | None:
+        user = self._by_id.get(user_id)
+        if user is not None: self._unindex(user)
+        return user
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_name.clear()
+        self._order.clear()
+        for index in self._indexes: index.clear()
+#endregion REGISTRY
@@ -0,0 +1,100 @@
+#region IMPORTS
+from collections.abc import Iterable
+import unicodedata
+from uuid import UUID
+
+from werwolf.models import User
+#endregion IMPORTS
+
+#region SEARCH
+# Umlaute auch in Umschrift finden: jeder Name steht zweimal im Index, einmal wörtlich ("müller" -> "muller")
+# und einmal mit ausgeschriebenen Umlauten ("mueller"). Eine Suche trifft, wenn eine ihrer beiden Formen in
+# einer der beiden steht. So finden "Müller", "Mueller" und "Muller" den Müller, ohne dass ein "ue" in
+# gewöhnlichen Namen (Samuel, Manuel) verloren geht.
+UMLAUTS: dict[int, str] = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+SEPARATOR: str = "\0" # trennt die beiden Formen, kommt in keiner Suche vor
+
+def fold(text: str) -> str:
+    # Klein, ohne Akzente/Umlaut-Punkte, ß -> ss
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+def expand(text: str) -> str:
+    # Wie fold, aber Umlaute ausgeschrieben: "Müller" -> "mueller"
+    return fold(unicodedata.normalize("NFC", text.casefold()).translate(UMLAUTS))
+
+def query_forms(text: str) -> tuple[str, ...]:
+    plain, expanded = fold(text), expand(text)
+    return (plain,) if plain == expanded else (plain, expanded)
+
+def search_text(user: User) -> str:
+    return SEPARATOR.join(query_forms(f"{user.first_name} {user.last_name}"))
+
+class SearchIndex:
+    # Trigramm-Index über die gefalteten Namen. Wird vom PlayerRegistry bei add/remove mitgeführt
+    # (PlayerRegistry.attach). Verlängert eine Suche die vorige, wird nur deren Ergebnis gefiltert.
+    GRAM: int = 3
+
+    def __init__(self, users: Iterable[User] = ()):
+        self._text: dict[UUID, str] = {}
+        self._grams: dict[str, set[UUID]] = {}
+        self.version: int = 0
+        self._last: tuple[str, int, set[UUID]] | None = None
+        for user in users: self.add(user)
+
+    def _grams_of(self, text: str) -> set[str]:
+        return {text[i:i + self.GRAM] for i in range(len(text) - self.GRAM + 1)}
+
+    def add(self, user: User) -> None:
+        text = search_text(user)
+        self._text[user.id] = text
+        for gram in self._grams_of(text):
+            self._grams.setdefault(gram, set()).add(user.id)
+        self.version += 1
+
+    def remove(self, user: User) -> None:
+        text = self._text.pop(user.id, None)
+        if text is None: return
+        for gram in self._grams_of(text):
+            ids = self._grams.get(gram)
+            if ids is None: continue
+            ids.discard(user.id)
+            if not ids: del self._grams[gram]
+        self.version += 1
+
+    def clear(self) -> None:
+        self._text.clear()
+        self._grams.clear()
+        self.version += 1
+
+    def contains(self, user_id: UUID, query: str) -> bool:
+        text = self._text.get(user_id, "")
+        return any(form in text for form in query_forms(query.strip()))
+
+    def _candidates(self, form: str) -> Iterable[UUID]:
+        if len(form) < self.GRAM: return self._text.keys()
+        postings = sorted((self._grams.get(g, set()) for g in self._grams_of(form)), key=len)
+        return postings[0].intersection(*postings[1:]) if postings else set()
+
+    def query(self, text: str) -> set[UUID] | None:
+        # None heißt: kein Filter (leere Suche)
+        key = text.strip().casefold()
+        forms = query_forms(key)
+        if not forms[0]: return None
+        texts = self._text
+
+        if self._last is not None:
+            last_key, last_version, last_result = self._last
+            if last_version == self.version and last_key in key:
+                # fold/expand bilden Zeichen für Zeichen ab: jeder Treffer von key ist auch einer von last_key,
+                # also nur eingrenzen statt neu suchen
+                result = {uid for uid in last_result if any(form in texts[uid] for form in forms)}
+                self._last = (key, self.version, result)
+                return result
+
+        result = set()
+        for form in forms:
+            result.update(uid for uid in self._candidates(form) if form in texts[uid])
+        self._last = (key, self.version, result)
+        return result
+#endregion SEARCH
@@ -0,0 +1,163 @@
+#region IMPORTS
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import logging
+import os
+import time
+
+from werwolf.draw import load_numpy
+from werwolf.log import get_logger
+from werwolf.models import NEVER_DAYS, User
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("draw")
+
+#region STRATEGIES
+# Vektorisierte Gewichtungen: bekommen ein NumPy-Array "Tage seit letztem Spiel" (mit Nachkommastellen)
+# und liefern die Gewichte. Müssen auf Modulebene liegen, damit sie an Worker-Prozesse gehen können.
+VectorWeightFn = Callable[..., object]
+
+def weight_quadratic(days):
+    # Bisherige Gewichtung aus default_weight: ganze Tage, (Tage+1)^2
+    return (days // 1 + 1) ** 2
+
+def weight_quadratic_hours(days):
+    # Wie quadratic, aber ohne Abrunden: wer heute früher gespielt hat, wiegt etwas mehr
+    return (days + 1) ** 2
+
+def weight_linear(days):
+    return days // 1 + 1
+
+def weight_cubic(days):
+    return (days // 1 + 1) ** 3
+
+def weight_uniform(days):
+    return days * 0 + 1
+
+STRATEGIES: dict[str, VectorWeightFn] = {
+    "quadratic": weight_quadratic,
+    "quadratic_hours": weight_quadratic_hours,
+    "linear": weight_linear,
+    "cubic": weight_cubic,
+    "uniform": weight_uniform,
+}
+#endregion STRATEGIES
+
+#region SIMULATION
+METRIC_NAMES: tuple[str, ...] = ("games_std", "games_range", "rate_std", "wait_max", "wait_p95", "wait_mean", "never_drawn")
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    evenings: int = 100
+    table_size: int = 12
+    attendance: float = 0.6 # mittlere Anwesenheitswahrscheinlichkeit pro Abend
+    attendance_spread: float = 0.2 # pro Spieler gleichverteilt in attendance ± spread
+    interval_days: float = 7.0 # Abstand zwischen zwei Abenden
+    runs: int = 200 # Saisons pro Strategie
+    seed: int | None = None
+    rounds: int = 3 # Runden pro Abend, jede mit eigener Auslosung unter denselben Anwesenden
+    round_hours: float = 1.0 # Abstand zwischen zwei Runden
+    jitter_hours: float = 1.5 # Abendbeginn schwankt gleichverteilt um ± so viele Stunden
+
+@dataclass(frozen=True)
+class SimulationResult:
+    strategy: str
+    runs: int
+    mean: dict[str, float]
+    std: dict[str, float]
+
+def roster_state(users: Iterable[User], now: datetime | None = None) -> tuple[list[float], list[bool]]:
+    # Startzustand aus dem echten Kader: Tage seit dem letzten Spiel (nie = 999) und wer ziehbar ist
+    now = now or datetime.now()
+    days, active = [], []
+    for u in users:
+        days.append((now - u.last_played).total_seconds() / 86400 if u.last_played else float(NEVER_DAYS))
+        active.append(not u.is_blacklisted)
+    return days, active
+
+def _run_season(np, weight_fn: VectorWeightFn, start_days, active, config: SimulationConfig, seed: int) -> list[float]:
+    # Eine Saison: pro Abend Anwesenheit würfeln, dann in jeder Runde table_size Plätze gewichtet ohne
+    # Zurücklegen vergeben (Efraimidis-Spirakis über alle Anwesenden auf einmal), Wartesträhnen pro Runde
+    # mitzählen. Mehrere Runden pro Abend und ein schwankender Abendbeginn sorgen für Abstände mit
+    # Nachkommastellen, sonst wären ganze Tage und stundengenaue Gewichtung nicht zu unterscheiden.
+    rng = np.random.default_rng(seed)
+    n = start_days.size
+    chance = np.clip(config.attendance + config.attendance_spread * (2 * rng.random(n) - 1), 0.0, 1.0)
+    last = -start_days
+    games = np.zeros(n, dtype=np.int64)
+    attended = np.zeros(n, dtype=np.int64)
+    streak = np.zeros(n, dtype=np.int64)
+    longest = np.zeros(n, dtype=np.int64)
+
+    for evening in range(1, config.evenings + 1):
+        begin = evening * config.interval_days + config.jitter_hours * (2 * rng.random() - 1) / 24
+        present = (rng.random(n) < chance) & active
+        attended += present * config.rounds
+        pool = np.flatnonzero(present)
+        k = min(config.table_size, pool.size)
+        for r in range(config.rounds):
+            now = begin + r * config.round_hours / 24
+            won = np.zeros(n, dtype=bool)
+            if k:
+                weights = np.asarray(weight_fn(now - last[pool]), dtype=np.float64)
+                keys = np.log(1.0 - rng.random(pool.size)) / np.maximum(weights, 1e-300)
+                winners = pool[np.argpartition(-keys, k - 1)[:k]]
+                won[winners] = True
+                games[winners] += 1
+                last[winners] = now
+            waiting = present & ~won
+            streak[waiting] += 1
+            streak[won] = 0
+            np.maximum(longest, streak, out=longest)
+
+    seen = attended > 0
+    if not seen.any(): return [0.0] * len(METRIC_NAMES)
+    g, w = games[seen], longest[seen]
+    return [float(g.std()), float(g.max() - g.min()), float((g / attended[seen]).std()),
+            float(w.max()), float(np.percentile(w, 95)), float(w.mean()), float((g == 0).mean())]
+
+def _simulate_batch(weight_fn: VectorWeightFn, start_days: Sequence[float], active: Sequence[bool],
+                    config: SimulationConfig, seeds: Sequence[int]) -> list[list[float]]:
+    # Läuft im Worker-Prozess
+    np = load_numpy("Die Simulation")
+    days = np.asarray(start_days, dtype=np.float64)
+    mask = np.asarray(active, dtype=bool)
+    return [_run_season(np, weight_fn, days, mask, config, seed) for seed in seeds]
+
+def simulate(users: Sequence[User], config: SimulationConfig, strategies: dict[str, VectorWeightFn] | None = None,
+             workers: int | None = None, now: datetime | None = None) -> list[SimulationResult]:
+    # Alle Strategien bekommen dieselben Seeds: Anwesenheit und Zufallszahlen sind pro Saison identisch,
+    # Unterschiede in den Kennzahlen kommen also nur aus der Gewichtung.
+    np = load_numpy("Die Simulation")
+    strategies = strategies or STRATEGIES
+    workers = workers or os.cpu_count() or 1
+    start_days, active = roster_state(users, now)
+    seeds = [int(s) for s in np.random.SeedSequence(config.seed).generate_state(config.runs)]
+    chunks = [seeds[i::workers] for i in range(min(workers, len(seeds)))]
+
+    start = time.perf_counter()
+    rows: dict[str, list[list[float]]] = {}
+    if workers == 1:
+        for name, fn in strategies.items():
+            rows[name] = _simulate_batch(fn, start_days, active, config, seeds)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: [pool.submit(_simulate_batch, fn, start_days, active, config, chunk) for chunk in chunks]
+                       for name, fn in strategies.items()}
+            for name, parts in futures.items():
+                rows[name] = [row for f in parts for row in f.result()]
+    logger.info(f"Simulation: {len(strategies)} Strategien x {config.runs} Saisons x {config.evenings} Abende x {config.rounds} Runden "
+                f"für {len(users)} Spieler in {time.perf_counter() - start:.2f} s ({workers} Prozesse).")
+
+    results = []
+    for name, data in rows.items():
+        table = np.asarray(data, dtype=np.float64)
+        results.append(SimulationResult(name, len(data), dict(zip(METRIC_NAMES, table.mean(axis=0).tolist())),
+                                        dict(zip(METRIC_NAMES, table.std(axis=0).tolist()))))
+    return results
+
+def results_to_dict(config: SimulationConfig, players: int, results: Sequence[SimulationResult]) -> dict:
+    return {"config": asdict(config), "players": players, "results": [asdict(r) for r in results]}
+#endregion SIMULATION
@@ -0,0 +1,102 @@
+#region IMPORTS
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+import mmap
+import os
+import struct
+from uuid import UUID
+
+from werwolf.log import get_logger
+from werwolf.models import User
+from werwolf.storage import DB_FILE, atomic_write
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("storage")
+
+#region SNAPSHOT
+# Binärer Schnappschuss des Kaders für einen schnellen Start (liegt neben data.json / data.db):
+#   Kopf     MAGIC, Formatversion, Anzahl, Stempel der Datenbank (mtime_ns, Größe), Länge Namensblock
+#   Records  feste Breite: UUID (16 Bytes), last_played (µs seit 1970, NEVER = nie), Spiele, Flags
+#   Namen    UTF-8, Vor- und Nachname aller Records in derselben Reihenfolge, durch NUL getrennt
+#            (wird am Stück dekodiert und gesplittet, statt 2x pro Spieler)
+# Der Stempel bindet den Schnappschuss an den Stand von data.db; passt er nicht, wird er ignoriert.
+SNAPSHOT_FILE: str = "roster.bin"
+MAGIC: bytes = b"WWRS"
+FORMAT_VERSION: int = 1
+HEADER = struct.Struct("<4sHxxIqqI")
+RECORD = struct.Struct("<16sqIB")
+NEVER: int = -(2 ** 63)
+FLAG_BLACKLISTED: int = 1
+EPOCH: datetime = datetime(1970, 1, 1)
+MICROSECOND: timedelta = timedelta(microseconds=1)
+
+def to_micros(dt: datetime | None) -> int:
+    # Zeitpunkte mit Zeitzone (Import, Sync) werden wie alle anderen als naive Ortszeit abgelegt
+    if dt is None: return NEVER
+    if dt.tzinfo is not None: dt = dt.astimezone().replace(tzinfo=None)
+    return (dt - EPOCH) // MICROSECOND
+
+def from_micros(us: int) -> datetime | None:
+    return EPOCH + timedelta(0, 0, us) if us != NEVER else None
+
+def db_stamp(db_path: str = DB_FILE) -> tuple[int, int] | None:
+    # (mtime_ns, Größe) der Datenbank; None, solange noch Änderungen im WAL stehen oder sie fehlt
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    try:
+        if os.path.getsize(db_path + "-wal") > 0: return None
+    except FileNotFoundError:
+        pass
+    return stat.st_mtime_ns, stat.st_size
+
+def write_snapshot(path: str, users: Iterable[User], stamp: tuple[int, int]) -> int:
+    records, names = bytearray(), []
+    for u in users:
+        records += RECORD.pack(u.id.bytes, to_micros(u.last_played), u.total_games, FLAG_BLACKLISTED if u.is_blacklisted else 0)
+        names += (u.first_name.replace("\0", ""), u.last_name.replace("\0", ""))
+    count = len(names) // 2
+    names = "\0".join(names).encode()
+
+    atomic_write(path, HEADER.pack(MAGIC, FORMAT_VERSION, count, stamp[0], stamp[1], len(names)) + records + names)
+    return count
+
+def _parse(data, stamp: tuple[int, int]) -> list[User] | None:
+    if len(data) < HEADER.size: raise ValueError("Schnappschuss ist zu kurz.")
+    magic, version, count, mtime, size, names_len = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION: raise ValueError(f"Unbekanntes Schnappschuss-Format ({magic!r}, v{version}).")
+    if (mtime, size) != stamp: return None
+    names_at = HEADER.size + count * RECORD.size
+    if len(data) != names_at + names_len: raise ValueError("Schnappschuss ist unvollständig.")
+
+    names = bytes(data[names_at:]).decode().split("\0") if count else []
+    if len(names) != 2 * count: raise ValueError("Namensblock passt nicht zur Anzahl Spieler.")
+    users = [
+        User(UUID(bytes=uid), names[2 * i], names[2 * i + 1], from_micros(played), games, bool(flags & FLAG_BLACKLISTED))
+        for i, (uid, played, games, flags) in enumerate(RECORD.iter_unpack(data[HEADER.size:names_at]))
+    ]
+    return users
+
+def read_snapshot(path: str = SNAPSHOT_FILE, db_path: str = DB_FILE) -> list[User] | None:
+    # Kader aus dem Schnappschuss, oder None wenn keiner da ist, er nicht zum Stand von db_path passt
+    # oder beschädigt ist; dann lädt der Aufrufer aus der Datenbank
+    stamp = db_stamp(db_path)
+    if stamp is None or not os.path.exists(path): return None
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            data = f.read() # leere Datei oder Dateisystem ohne mmap
+        try:
+            with memoryview(data) as view:
+                users = _parse(view, stamp)
+        except (ValueError, struct.error) as e:
+            logger.warning(f"Schnappschuss {path} unbrauchbar, lade aus der Datenbank: {e}")
+            return None
+        finally:
+            if isinstance(data, mmap.mmap): data.close()
+    if users is None: logger.info(f"Schnappschuss {path} passt nicht zu {db_path}, lade aus der Datenbank.")
+    return users
+#endregion SNAPSHOT
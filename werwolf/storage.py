@@ -0,0 +1,261 @@
+#region IMPORTS
+from collections.abc import Iterable
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import logging
+import os
+import sqlite3
+from uuid import UUID
+
+from werwolf.history import DrawHistory, HistoryEntry, name_resolver
+from werwolf.log import get_logger
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("storage")
+
+#region GLOBALS
+DATA_FILE: str = "data.json"
+DB_FILE: str = "data.db"
+#endregion GLOBALS
+
+#region STORAGE
+def user_to_dict(u: User) -> dict:
+    return {
+        "id": str(u.id), "first_name": u.first_name, "last_name": u.last_name,
+        "last_played": u.last_played.isoformat() if u.last_played else None,
+        "total_games": u.total_games, "is_blacklisted": u.is_blacklisted
+    }
+
+def user_from_dict(ud: dict) -> User:
+    return User(
+        id=UUID(ud["id"]),
+        first_name=ud["first_name"],
+        last_name=ud["last_name"],
+        last_played=datetime.fromisoformat(ud["last_played"]) if ud.get("last_played") else None,
+        total_games=ud.get("total_games", 0),
+        is_blacklisted=ud.get("is_blacklisted", False)
+    )
+
+def read_json_data(path: str) -> tuple[list[User], list[dict]]:
+    # Versteht beide Formate: alte Liste von Usern und {"users": [...], "history": [...]}
+    with open(path, "r") as f:
+        content = json.load(f)
+    if isinstance(content, list):
+        logger.debug("Altes Datenformat (Liste) erkannt.")
+        return [user_from_dict(ud) for ud in content], []
+    history = content.get("history", [])
+    logger.debug(f"Neues Datenformat erkannt. {len(history)} Historien-Einträge.")
+    return [user_from_dict(ud) for ud in content.get("users", [])], history
+
+def _fsync_dir(path: str) -> None:
+    # Macht das Umbenennen selbst dauerhaft; unter Windows lassen sich Verzeichnisse nicht öffnen
+    if os.name != "posix": return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def atomic_write(path: str, data: bytes, generations: int = 0) -> None:
+    # Erst komplett nach path.tmp schreiben und auf die Platte bringen, dann per os.replace tauschen:
+    # path enthält danach den alten oder den neuen Stand, nie einen halb geschriebenen.
+    # Mit generations > 0 wandern ältere Stände nach path.1 (neuester) bis path.<generations>.
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    for i in range(generations, 0, -1):
+        older = f"{path}.{i - 1}" if i > 1 else path
+        if os.path.exists(older): os.replace(older, f"{path}.{i}")
+    os.replace(tmp, path)
+    _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+def write_json_data(path: str, users: Iterable[User], history: list[dict]) -> None:
+    atomic_write(path, json.dumps({"users": [user_to_dict(u) for u in users], "history": history}, indent=4).encode())
+
+class SqliteStorage:
+    # Jede Änderung wird sofort als kleine Transaktion geschrieben (WAL-Modus),
+    # statt beim Beenden die komplette data.json neu zu schreiben.
+    SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS users (
+            id             TEXT PRIMARY KEY,
+            first_name     TEXT NOT NULL,
+            last_name      TEXT NOT NULL,
+            last_played    TEXT,
+            total_games    INTEGER NOT NULL DEFAULT 0,
+            is_blacklisted INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_users_name ON users (first_name COLLATE NOCASE, last_name COLLATE NOCASE);
+        CREATE TABLE IF NOT EXISTS history (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp  TEXT NOT NULL,
+            players    TEXT NOT NULL,
+            player_ids TEXT,
+            tables     TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    UPSERT_USER: str = """
+        INSERT INTO users (id, first_name, last_name, last_played, total_games, is_blacklisted)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            first_name = excluded.first_name, last_name = excluded.last_name,
+            last_played = excluded.last_played, total_games = excluded.total_games,
+            is_blacklisted = excluded.is_blacklisted
+    """
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(self.SCHEMA)
+        self._upgrade_schema()
+        logger.debug(f"SQLite-Datenbank geöffnet: {path}")
+
+    def _upgrade_schema(self) -> None:
+        # Datenbanken von vor der UUID-Historie: Spalte ergänzen und IDs über die Namen nachtragen
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(history)")}
+        with self.conn:
+            if "player_ids" not in columns:
+                self.conn.execute("ALTER TABLE history ADD COLUMN player_ids TEXT")
+            if "tables" not in columns:
+                self.conn.execute("ALTER TABLE history ADD COLUMN tables TEXT")
+            # Früherer Index Spieler -> Runden; DrawHistory führt ihn im Speicher, die Tabelle wird nicht mehr gelesen
+            self.conn.execute("DROP TABLE IF EXISTS history_players")
+            pending = self.conn.execute("SELECT id, timestamp, players FROM history WHERE player_ids IS NULL ORDER BY id").fetchall()
+            if pending:
+                resolve = name_resolver(PlayerRegistry(self.load_users()))
+                for history_id, ts, players in pending:
+                    entry = HistoryEntry.from_dict({"timestamp": ts, "players": json.loads(players)}, resolve)
+                    self._write_history_ids(history_id, entry)
+                logger.info(f"Historie aktualisiert: {len(pending)} Einträge mit Spieler-IDs versehen.")
+            self._unique_history()
+
+    def _unique_history(self) -> None:
+        # Dieselbe Runde kann mehrfach ankommen (Oberfläche und Sync-Server auf derselben data.db, Sync-Deltas):
+        # ein Eintrag ist durch Zeitpunkt und Spieler-IDs eindeutig, _insert_history ignoriert Wiederholungen.
+        # Ältere Datenbanken können schon doppelte Zeilen enthalten, die vor dem Index entfernt werden.
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_history_unique'").fetchone():
+            return
+        duplicates = [row[0] for row in self.conn.execute(
+            "SELECT id FROM history WHERE id NOT IN (SELECT MIN(id) FROM history GROUP BY timestamp, player_ids)")]
+        self.conn.executemany("DELETE FROM history WHERE id = ?", [(i,) for i in duplicates])
+        self.conn.execute("CREATE UNIQUE INDEX idx_history_unique ON history (timestamp, player_ids)")
+        if duplicates: logger.warning(f"Historie bereinigt: {len(duplicates)} doppelte Einträge entfernt.")
+
+    def _write_history_ids(self, history_id: int, entry: HistoryEntry) -> None:
+        self.conn.execute("UPDATE history SET player_ids = ? WHERE id = ?",
+                          (json.dumps(entry.to_dict()["player_ids"]), history_id))
+
+    def _insert_history(self, entry: HistoryEntry) -> None:
+        data = entry.to_dict()
+        tables = json.dumps(data["tables"]) if "tables" in data else None
+        cursor = self.conn.execute("INSERT OR IGNORE INTO history (timestamp, players, player_ids, tables) VALUES (?, ?, ?, ?)",
+                                   (data["timestamp"], json.dumps(data["players"]), json.dumps(data["player_ids"]), tables))
+        if not cursor.rowcount:
+            logger.debug("Runde vom %s steht schon in der Historie.", data["timestamp"])
+
+    @staticmethod
+    def _user_row(u: User) -> tuple:
+        return (str(u.id), u.first_name, u.last_name, u.last_played.isoformat() if u.last_played else None,
+                u.total_games, int(u.is_blacklisted))
+
+    @contextmanager
+    def _transaction(self, action: str):
+        # Schreibfehler sollen die UI nicht abschießen, aber laut geloggt werden
+        try:
+            with self.conn:
+                yield self.conn
+        except sqlite3.Error as e:
+            logger.critical(f"FEHLER BEIM SPEICHERN ({action}): {e}", exc_info=True)
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def user_rows(self) -> sqlite3.Cursor:
+        # Rohe Zeilen (id, first_name, last_name, last_played, total_games, is_blacklisted), z.B. für PlayerColumns
+        return self.conn.execute("SELECT id, first_name, last_name, last_played, total_games, is_blacklisted FROM users")
+
+    def load_users(self) -> list[User]:
+        return [
+            User(id=UUID(r[0]), first_name=r[1], last_name=r[2],
+                 last_played=datetime.fromisoformat(r[3]) if r[3] else None,
+                 total_games=r[4], is_blacklisted=bool(r[5]))
+            for r in self.user_rows()
+        ]
+
+    def history_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    @staticmethod
+    def _history_row(ts: str, players: str, ids: str, tables: str | None) -> HistoryEntry:
+        return HistoryEntry.from_dict({"timestamp": ts, "players": json.loads(players), "player_ids": json.loads(ids),
+                                       "tables": json.loads(tables) if tables else None})
+
+    def load_history(self) -> list[HistoryEntry]:
+        return [
+            self._history_row(*row)
+            for row in self.conn.execute("SELECT timestamp, players, player_ids, tables FROM history ORDER BY id")
+        ]
+
+    def load(self) -> tuple[list[User], list[HistoryEntry]]:
+        return self.load_users(), self.load_history()
+
+    def migrate_from_json(self, path: str = DATA_FILE) -> bool:
+        # Einmalige Übernahme einer bestehenden data.json (beide Formate)
+        if self.get_meta("migrated_from") is not None: return False
+        if not os.path.exists(path): return False
+
+        users, history = read_json_data(path)
+        resolve = name_resolver(PlayerRegistry(users))
+        with self.conn:
+            self.conn.executemany(self.UPSERT_USER, [self._user_row(u) for u in users])
+            for e in history: self._insert_history(HistoryEntry.from_dict(e, resolve))
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (os.path.abspath(path),))
+        logger.info(f"Migration aus {path} abgeschlossen: {len(users)} Spieler, {len(history)} Historien-Einträge.")
+        return True
+
+    def save_user(self, user: User) -> None:
+        with self._transaction("User") as conn:
+            conn.execute(self.UPSERT_USER, self._user_row(user))
+
+    def save_users(self, users: Iterable[User]) -> None:
+        with self._transaction("User-Batch") as conn:
+            conn.executemany(self.UPSERT_USER, [self._user_row(u) for u in users])
+
+    def delete_user(self, user_id: UUID) -> None:
+        with self._transaction("Löschen") as conn:
+            conn.execute("DELETE FROM users WHERE id = ?", (str(user_id),))
+
+    def record_draw(self, winners: Iterable[User], entry: HistoryEntry) -> None:
+        # Gewinner und Historien-Eintrag landen gemeinsam in einer Transaktion
+        with self._transaction("Auslosung") as conn:
+            conn.executemany(self.UPSERT_USER, [self._user_row(u) for u in winners])
+            self._insert_history(entry)
+
+    def close(self) -> None:
+        try:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Schließen der Datenbank: {e}")
+
+def load_state(db_path: str = DB_FILE, json_path: str = DATA_FILE) -> tuple[SqliteStorage, list[User], DrawHistory]:
+    # Öffnet die Datenbank, übernimmt beim ersten Start eine vorhandene data.json und lädt alles
+    storage = SqliteStorage(db_path)
+    if storage.migrate_from_json(json_path):
+        logger.info(f"{json_path} wurde nach {db_path} übernommen.")
+    users, history = storage.load()
+    return storage, users, DrawHistory(history)
+#endregion STORAGE
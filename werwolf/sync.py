@@ -0,0 +1,423 @@
+#region IMPORTS
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import replace
+import json
+import logging
+import queue
+import threading
+from uuid import UUID, uuid4
+
+from werwolf.history import DrawHistory, HistoryEntry
+from werwolf.log import get_logger
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+from werwolf.storage import SqliteStorage, user_from_dict, user_to_dict
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("sync")
+
+#region PROTOCOL
+# Zeilenbasiertes JSON über TCP. Client -> Server: "hello" (bekannte Version) und "push" (gebündelte
+# Änderungen mit der Version, auf der sie beruhen). Server -> Client: "snapshot", "deltas" (fortlaufend
+# versioniert, an alle Clients) und "reject" (abgelehnte Änderungen samt aktuellem Serverstand).
+SYNC_ENV: str = "WERWOLF_SYNC" # "host:port" -> MainApp verbindet sich beim Start
+SYNC_PORT: int = 8765
+DELTA_LOG_SIZE: int = 1000 # so viele Versionen kann ein Client nach kurzer Trennung nachholen
+BATCH_DELAY: float = 0.05 # Sekunden, in denen lokale Änderungen zu einem Push gesammelt werden
+RECONNECT_DELAY: float = 2.0
+
+Change = dict
+
+def _encode(message: dict) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+def parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not host: return port or "127.0.0.1", SYNC_PORT
+    return host, int(port)
+
+def presence_change(user_id: UUID, on: bool) -> Change:
+    return {"op": "present", "id": str(user_id), "on": on}
+
+def pause_change(user_id: UUID, on: bool) -> Change:
+    return {"op": "pause", "id": str(user_id), "on": on}
+
+def blacklist_change(user_id: UUID, on: bool) -> Change:
+    return {"op": "blacklist", "id": str(user_id), "on": on}
+
+def user_change(user: User) -> Change:
+    return {"op": "user", "user": user_to_dict(user)}
+
+def delete_change(user_id: UUID) -> Change:
+    return {"op": "delete", "id": str(user_id)}
+
+def draw_change(entry: HistoryEntry) -> Change:
+    return {"op": "draw", "entry": entry.to_dict()}
+
+def clear_change() -> Change:
+    return {"op": "clear"}
+
+def _target(change: Change) -> str | None:
+    if change["op"] == "user": return change["user"]["id"]
+    return change.get("id")
+
+def conflict_key(change: Change) -> tuple[str, str] | None:
+    # Worauf sich eine Änderung bezieht; Auslosungen und "Alle leeren" werden nie abgelehnt
+    op = change["op"]
+    if op in ("present", "pause"): return op, change["id"]
+    if op in ("blacklist", "user", "delete"): return "user", _target(change)
+    return None
+
+def coalesce(changes: Iterable[Change]) -> list[Change]:
+    # Pro Operation und Spieler gilt im Batch nur die letzte Änderung (an/aus/an -> an). Was der Server
+    # nebenbei ändert (_leave), geht dabei verloren; Clients schicken solche Folgen daher ausdrücklich mit
+    merged: dict[tuple, Change] = {}
+    for i, change in enumerate(changes):
+        target = _target(change)
+        key = (change["op"], target) if target is not None else (change["op"], i)
+        merged.pop(key, None)
+        merged[key] = change
+    return list(merged.values())
+#endregion PROTOCOL
+
+#region SERVER
+class SyncServer:
+    # Hält den maßgeblichen Stand: Spieler (über den Storage persistiert), Anwesenheit und Pausen
+    # (nur für die laufende Sitzung). Jeder angenommene Push erhöht self.version; pro Schlüssel
+    # wird gemerkt, in welcher Version und von wem er zuletzt geändert wurde. Hat ein anderer Client
+    # den Schlüssel nach der Version geändert, auf der ein Push beruht, gewinnt der Server.
+    def __init__(self, registry: PlayerRegistry, history: DrawHistory, storage: SqliteStorage | None = None):
+        self.registry = registry
+        self.history = history
+        self.storage = storage
+        self.present: set[UUID] = set()
+        self.paused: set[UUID] = set()
+        self.epoch: str = uuid4().hex # neu bei jedem Serverstart, alte Versionsnummern gelten dann nicht mehr
+        self.version: int = 0
+        self._log: deque[tuple[int, list[Change], str | None]] = deque(maxlen=DELTA_LOG_SIZE) # (Version, Änderungen, Client)
+        self._key_versions: dict[tuple[str, str], tuple[int, str | None]] = {}
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = SYNC_PORT) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Sync-Server lauscht auf {host}:{port} ({len(self.registry)} Spieler).")
+        return port
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is None: return
+        self._server.close()
+        for writer in list(self._clients): writer.close()
+        await self._server.wait_closed()
+
+    def snapshot(self) -> dict:
+        return {"type": "snapshot", "epoch": self.epoch, "version": self.version,
+                "users": [user_to_dict(u) for u in self.registry],
+                "present": [str(uid) for uid in self.present], "paused": [str(uid) for uid in self.paused]}
+
+    def catch_up(self, epoch: str | None, since: int, client: str | None = None) -> dict:
+        # Fehlende Versionen aus dem Log nachliefern, sonst kompletter Stand. Die nachgelieferten Batches können
+        # von verschiedenen Clients stammen, daher gibt es kein gemeinsames "origin": eigene Auslosungen des
+        # anfragenden Clients stehen schon in seiner Historie und werden hier weggelassen.
+        if epoch != self.epoch or since > self.version: return self.snapshot()
+        if since < self.version and (not self._log or self._log[0][0] > since + 1): return self.snapshot()
+        changes = [c for version, batch, origin in self._log if version > since for c in batch
+                   if not (c["op"] == "history" and client is not None and origin == client)]
+        return {"type": "deltas", "epoch": self.epoch, "base": since, "version": self.version, "changes": changes, "origin": None}
+
+    def _current(self, change: Change) -> list[Change]:
+        # Aktueller Serverstand für den Schlüssel einer abgelehnten Änderung
+        kind, target = conflict_key(change)
+        user_id = UUID(target)
+        if kind == "present": return [presence_change(user_id, user_id in self.present)]
+        if kind == "pause": return [pause_change(user_id, user_id in self.paused)]
+        user = self.registry.get(user_id)
+        return [user_change(user)] if user else [delete_change(user_id)]
+
+    def _leave(self, user_id: UUID) -> list[Change]:
+        out = []
+        if user_id in self.present: out.append(presence_change(user_id, False))
+        if user_id in self.paused: out.append(pause_change(user_id, False))
+        self.present.discard(user_id)
+        self.paused.discard(user_id)
+        return out
+
+    def _save(self, user: User) -> list[Change]:
+        if user.id in self.registry: self.registry.update(user)
+        else: self.registry.add(user)
+        if self.storage is not None: self.storage.save_user(user)
+        return [user_change(user)]
+
+    def _apply(self, change: Change) -> list[Change]:
+        # Client-Änderung auf den Serverstand anwenden; liefert die normalisierten Änderungen
+        # (absolute Werte, damit Clients sie beliebig oft anwenden können)
+        op = change["op"]
+        if op == "clear":
+            out = [presence_change(uid, False) for uid in self.present] + [pause_change(uid, False) for uid in self.paused]
+            self.present.clear()
+            self.paused.clear()
+            return out
+        if op == "draw":
+            entry = HistoryEntry.from_dict(change["entry"])
+            winners = [replace(u, last_played=entry.timestamp, total_games=u.total_games + 1)
+                       for u in (self.registry.get(uid) for uid in entry.player_ids if uid is not None) if u is not None]
+            for user in winners: self.registry.update(user)
+            self.history.append(entry)
+            if self.storage is not None: self.storage.record_draw(winners, entry)
+            return [user_change(u) for u in winners] + [{"op": "history", "entry": change["entry"]}]
+        if op == "user": return self._save(user_from_dict(change["user"]))
+
+        user_id = UUID(change["id"])
+        user = self.registry.get(user_id)
+        if op == "delete":
+            if user is None: return []
+            self.registry.remove(user_id)
+            if self.storage is not None: self.storage.delete_user(user_id)
+            return self._leave(user_id) + [delete_change(user_id)]
+        if user is None: return []
+        if op == "blacklist":
+            out = self._save(replace(user, is_blacklisted=change["on"]))
+            return out + (self._leave(user_id) if change["on"] else [])
+        if op == "present":
+            if not change["on"]: return self._leave(user_id)
+            self.present.add(user_id)
+            return [change]
+        if op == "pause":
+            if change["on"]: self.paused.add(user_id)
+            else: self.paused.discard(user_id)
+            return [change]
+        logger.warning(f"Unbekannte Sync-Operation: {op}")
+        return []
+
+    def _conflicts(self, key: tuple[str, str] | None, base: int, client: str | None) -> bool:
+        if key is None or key not in self._key_versions: return False
+        version, writer = self._key_versions[key]
+        return version > base and writer != client
+
+    def apply(self, base: int, changes: Iterable[Change], client: str | None = None) -> tuple[list[Change], list[Change]]:
+        # (angenommene Änderungen als neue Version, Korrekturen für abgelehnte)
+        accepted, fixups = [], []
+        for change in changes:
+            key = conflict_key(change)
+            if change["op"] in ("present", "pause", "blacklist") and UUID(change["id"]) not in self.registry:
+                # Nur lokal bekannter Spieler (siehe apply_message): beim Client als abwesend zurücksetzen
+                logger.warning(f"{change['op']} für unbekannten Spieler {change['id']} abgelehnt.")
+                fixups.append(presence_change(UUID(change["id"]), False))
+                continue
+            if change["op"] == "pause" and change["on"] and UUID(change["id"]) not in self.present:
+                # Pausieren nur für Anwesende (wie im Kontextmenü), sonst wäre paused nicht mehr Teil von present
+                logger.info(f"Pause für abwesenden Spieler {change['id']} abgelehnt.")
+                fixups.extend(self._current(change))
+                continue
+            if change["op"] == "present" and change["on"] and self.registry.get(UUID(change["id"])).is_blacklisted:
+                # Gesperrte sind nie anwesend; der Client bekommt den Serverstand zurück
+                logger.info(f"Anwesenheit für gesperrten Spieler {change['id']} abgelehnt.")
+                fixups.extend(self._current(change))
+                continue
+            if self._conflicts(key, base, client):
+                logger.info(f"Konflikt bei {key[0]} {key[1]}: Änderung auf Basis v{base} abgelehnt.")
+                fixups.extend(self._current(change))
+                continue
+            accepted.extend(self._apply(change))
+        if accepted:
+            self.version += 1
+            for change in accepted:
+                key = conflict_key(change)
+                if key is not None: self._key_versions[key] = (self.version, client)
+            self._log.append((self.version, accepted, client))
+        return accepted, fixups
+
+    def _broadcast(self, message: dict) -> None:
+        data = _encode(message)
+        for writer in self._clients: writer.write(data)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        client = None
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                if message["type"] == "hello":
+                    client = message.get("client")
+                    writer.write(_encode(self.catch_up(message.get("epoch"), message.get("version", 0), client)))
+                    if writer not in self._clients: logger.info(f"Client {client} verbunden ({peer}).")
+                    self._clients.add(writer)
+                elif message["type"] == "push" and writer in self._clients:
+                    version = self.version
+                    accepted, fixups = self.apply(message["base"], message["changes"], client)
+                    if fixups: writer.write(_encode({"type": "reject", "changes": fixups}))
+                    if accepted:
+                        self._broadcast({"type": "deltas", "epoch": self.epoch, "base": version, "version": self.version,
+                                         "changes": accepted, "origin": client})
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError, KeyError, ValueError) as e:
+            logger.warning(f"Verbindung zu {peer} abgebrochen: {e}")
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+            logger.info(f"Client {client} getrennt ({peer}).")
+
+def serve(registry: PlayerRegistry, history: DrawHistory, storage: SqliteStorage | None,
+          host: str = "127.0.0.1", port: int = SYNC_PORT) -> None:
+    async def run() -> None:
+        server = SyncServer(registry, history, storage)
+        await server.start(host, port)
+        await server.serve_forever()
+    asyncio.run(run())
+#endregion SERVER
+
+#region CLIENT
+class SyncClient:
+    # Eigene asyncio-Schleife im Hintergrund-Thread. Eingehende Nachrichten landen in inbox und werden
+    # von der Oberfläche per after() abgeholt (apply_message); lokale Änderungen gehen über send()
+    # und werden BATCH_DELAY lang gesammelt. Ohne Verbindung bleiben sie liegen und gehen nach dem
+    # Wiederverbinden raus.
+    def __init__(self, host: str, port: int = SYNC_PORT):
+        self.host = host
+        self.port = port
+        self.client_id: str = uuid4().hex
+        self.inbox: queue.SimpleQueue[dict] = queue.SimpleQueue()
+        # Zuletzt angewendeter Serverstand; wird vom UI-Thread in apply_message gesetzt
+        self.epoch: str | None = None
+        self.version: int = 0
+        self._pending: list[Change] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._loop = asyncio.new_event_loop()
+        self._task: asyncio.Task | None = None
+        self._thread = threading.Thread(target=self._run, name="SyncClient", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._thread.is_alive(): return
+        self._loop.call_soon_threadsafe(lambda: self._task and self._task.cancel())
+        self._thread.join(timeout=2)
+
+    def send(self, *changes: Change) -> None:
+        self._loop.call_soon_threadsafe(self._queue, changes)
+
+    def resync(self) -> None:
+        self._loop.call_soon_threadsafe(self._hello)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._main())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _main(self) -> None:
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                self._hello()
+                self.inbox.put({"type": "status", "connected": True})
+                self._schedule_flush()
+                while line := await reader.readline():
+                    self.inbox.put(json.loads(line))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.debug(f"Sync-Verbindung zu {self.host}:{self.port} fehlgeschlagen: {e}")
+            finally:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                    self.inbox.put({"type": "status", "connected": False})
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _hello(self) -> None:
+        if self._writer is None: return
+        self._writer.write(_encode({"type": "hello", "client": self.client_id, "epoch": self.epoch, "version": self.version}))
+
+    def _queue(self, changes: Iterable[Change]) -> None:
+        self._pending.extend(changes)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is None and self._pending and self._writer is not None:
+            self._flush_handle = self._loop.call_later(BATCH_DELAY, self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        if self._writer is None or not self._pending: return
+        batch, self._pending = coalesce(self._pending), []
+        self._writer.write(_encode({"type": "push", "base": self.version, "changes": batch}))
+        logger.debug(f"Sync: {len(batch)} Änderungen auf Basis v{self.version} gesendet.")
+
+def apply_message(client: SyncClient, message: dict, registry: PlayerRegistry, present: set[UUID], paused: set[UUID],
+                  history: DrawHistory, storage: SqliteStorage | None = None) -> tuple[set[UUID], bool]:
+    # Im UI-Thread: Servernachricht auf den lokalen Stand anwenden. Liefert (geänderte IDs, Komplett-Neuaufbau?)
+    kind = message["type"]
+    if kind == "snapshot":
+        # Wird in den lokalen Kader eingearbeitet, gelöscht wird dabei nichts: ein frisch gestarteter Server
+        # mit leerem Kader darf den lokalen Bestand nicht leeren. Nur lokal bekannte Spieler bleiben lokal.
+        users = [user_from_dict(ud) for ud in message["users"]]
+        known = {u.id for u in users}
+        if storage is not None: storage.save_users(users)
+        for user in users:
+            if user.id in registry: registry.update(user)
+            else: registry.add(user)
+        local_only = len(registry) - len(known)
+        if local_only:
+            logger.warning(f"Sync: {local_only} lokale Spieler sind dem Server unbekannt und bleiben nur lokal erhalten.")
+        present.clear()
+        present.update(uid for uid in map(UUID, message["present"]) if uid in registry)
+        paused.clear()
+        paused.update(uid for uid in map(UUID, message["paused"]) if uid in present)
+        client.epoch, client.version = message["epoch"], message["version"]
+        logger.info(f"Sync: Stand v{client.version} übernommen ({len(users)} Spieler, {len(present)} anwesend).")
+        return set(), True
+    if kind == "deltas" and (message["epoch"] != client.epoch or message["base"] != client.version):
+        # Lücke in der Versionsfolge: Stand neu anfordern statt falsch weiterzuzählen
+        logger.warning(f"Sync: v{message['base']} erwartet v{client.version}, fordere Stand neu an.")
+        client.resync()
+        return set(), False
+    if kind not in ("deltas", "reject"): return set(), False
+
+    dirty: set[UUID] = set()
+    for change in message["changes"]:
+        op = change["op"]
+        if op == "history":
+            # Eigene Auslosungen stehen schon in der lokalen Historie
+            if message.get("origin") == client.client_id: continue
+            entry = HistoryEntry.from_dict(change["entry"])
+            history.append(entry)
+            if storage is not None: storage.record_draw([], entry)
+            continue
+        if op == "user":
+            user = user_from_dict(change["user"])
+            if user.id in registry: registry.update(user)
+            else: registry.add(user)
+            if storage is not None: storage.save_user(user)
+            dirty.add(user.id)
+            continue
+
+        user_id = UUID(change["id"])
+        dirty.add(user_id)
+        if op == "delete":
+            if user_id in registry: registry.remove(user_id)
+            if storage is not None: storage.delete_user(user_id)
+            present.discard(user_id)
+            paused.discard(user_id)
+        elif op == "present":
+            if change["on"]: present.add(user_id)
+            else:
+                present.discard(user_id)
+                paused.discard(user_id)
+        elif op == "pause":
+            if change["on"] and user_id in present: paused.add(user_id)
+            else: paused.discard(user_id)
+    if kind == "deltas": client.version = message["version"]
+    return dirty, False
+#endregion CLIENT
@@ -0,0 +1,135 @@
+#region IMPORTS
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import combinations
+import logging
+import os
+import random
+import time
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from werwolf.draw import DaysFn, WeightedSampler, record_draw
+from werwolf.history import DrawHistory
+from werwolf.log import get_logger
+from werwolf.models import User
+from werwolf.registry import PlayerRegistry
+
+if TYPE_CHECKING:
+    from werwolf.storage import SqliteStorage
+#endregion IMPORTS
+
+logger: logging.Logger = get_logger("draw")
+
+#region TOURNAMENT
+PARALLEL_MIN_PLAYERS: int = 120 # darunter ist der Prozess-Overhead größer als die Suche selbst
+SEARCH_STEPS: int = 5000 # Tauschversuche pro Neustart
+
+Assignment = tuple[int, int, list[int]] # (Konflikte, Seed, Tisch pro Spieler)
+
+def table_sizes(players: int, table_count: int) -> list[int]:
+    # Spieler gleichmäßig verteilen, Tische unterscheiden sich um höchstens einen Platz; leere Tische entfallen
+    base, extra = divmod(players, table_count)
+    return [size for size in (base + (t < extra) for t in range(table_count)) if size]
+
+def co_player_pairs(history: DrawHistory, ids: Sequence[UUID]) -> list[tuple[int, int]]:
+    # Paare (als Positionen in ids), die in der letzten Runde am selben Tisch saßen
+    last = history.last()
+    if last is None: return []
+    position = {uid: i for i, uid in enumerate(ids)}
+    pairs: set[tuple[int, int]] = set()
+    for group_ids, _ in last.groups():
+        seated = sorted(position[uid] for uid in group_ids if uid in position)
+        pairs.update(combinations(seated, 2))
+    return sorted(pairs)
+
+def _search(sizes: Sequence[int], pairs: Sequence[tuple[int, int]], n: int, seed: int, steps: int) -> Assignment:
+    # Zufällige Startverteilung, dann Spieler paarweise tauschen, solange es nicht schlechter wird
+    rng = random.Random(seed)
+    assignment = [t for t, size in enumerate(sizes) for _ in range(size)]
+    rng.shuffle(assignment)
+    neighbours: list[set[int]] = [set() for _ in range(n)]
+    for a, b in pairs:
+        neighbours[a].add(b)
+        neighbours[b].add(a)
+
+    def clashes(player: int, table: int) -> int:
+        return sum(1 for other in neighbours[player] if assignment[other] == table)
+
+    cost = sum(1 for a, b in pairs if assignment[a] == assignment[b])
+    constrained = [p for p in range(n) if neighbours[p]]
+    for _ in range(steps):
+        if cost == 0: break
+        p, q = rng.choice(constrained), rng.randrange(n)
+        a, b = assignment[p], assignment[q]
+        if a == b: continue
+        delta = clashes(p, b) + clashes(q, a) - clashes(p, a) - clashes(q, b) - 2 * (q in neighbours[p])
+        if delta <= 0:
+            assignment[p], assignment[q] = b, a
+            cost += delta
+    return cost, seed, assignment
+
+def _search_many(sizes: Sequence[int], pairs: Sequence[tuple[int, int]], n: int, seeds: Sequence[int], steps: int) -> Assignment:
+    # Läuft im Worker-Prozess: mehrere Neustarts, bestes Ergebnis zurück
+    return min(_search(sizes, pairs, n, seed, steps) for seed in seeds)
+
+class TablePlanner:
+    # Sucht eine Tischverteilung mit möglichst wenigen Wiederholungs-Paaren. Die Neustarts der
+    # lokalen Suche werden ab PARALLEL_MIN_PLAYERS auf einen Prozess-Pool verteilt; der Pool wird
+    # erst beim ersten großen Turnier gestartet und bleibt danach bis close() bestehen.
+    def __init__(self, workers: int | None = None, restarts: int = 16, seed: int | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.restarts = restarts
+        self.rng = random.Random(seed)
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def assign(self, sizes: Sequence[int], pairs: Sequence[tuple[int, int]], n: int) -> list[int]:
+        start = time.perf_counter()
+        seeds = [self.rng.randrange(2 ** 32) for _ in range(self.restarts if pairs else 1)]
+        if not pairs or n < PARALLEL_MIN_PLAYERS or self.workers == 1:
+            best = _search_many(sizes, pairs, n, seeds, SEARCH_STEPS)
+        else:
+            pool = self._pool()
+            futures = [pool.submit(_search_many, sizes, pairs, n, seeds[w::self.workers], SEARCH_STEPS)
+                       for w in range(min(self.workers, len(seeds)))]
+            best = min(f.result() for f in futures)
+        logger.debug("Tischverteilung für %d Spieler: %d Wiederholungs-Paare von %d, %d Neustarts in %.1f ms.",
+                     n, best[0], len(pairs), len(seeds), (time.perf_counter() - start) * 1000)
+        return best[2]
+
+def perform_tournament(registry: PlayerRegistry, candidates: Sequence[User], table_count: int, table_size: int,
+                       sampler: WeightedSampler, history: DrawHistory, planner: TablePlanner,
+                       storage: "SqliteStorage | None" = None, now: datetime | None = None,
+                       days: DaysFn | None = None) -> list[list[User]]:
+    # Mehrere Tische auf einmal: Plätze wie bei perform_draw gewichtet vergeben, dann die Gezogenen so
+    # auf die Tische verteilen, dass möglichst niemand wieder mit seinen Mitspielern der letzten Runde sitzt.
+    if table_count < 1 or table_size < 1: raise ValueError("Tischanzahl und Tischgröße müssen mindestens 1 sein.")
+    now = now or datetime.now()
+    seats = min(table_count * table_size, len(candidates))
+    seated = sampler.sample(candidates, seats, weights=sampler.weigh(candidates, now, days))
+    sizes = table_sizes(len(seated), table_count)
+    assignment = planner.assign(sizes, co_player_pairs(history, [u.id for u in seated]), len(seated))
+
+    tables: list[list[User]] = [[] for _ in sizes]
+    for user, table in zip(seated, assignment): tables[table].append(user)
+    tables = [registry.ordered(u.id for u in table) for table in tables]
+
+    updated = record_draw(registry, [u for table in tables for u in table], history, storage, now, tuple(sizes))
+    result, start = [], 0
+    for i, size in enumerate(sizes, 1):
+        result.append(updated[start:start + size])
+        start += size
+        logger.info("Tisch %d: %s", i, [f"{u.first_name} {u.last_name}" for u in result[-1]])
+    return result
+#endregion TOURNAMENT